@@ -14,9 +14,38 @@ class Settings(BaseSettings):
     
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
+    REDIS_PASSWORD: str = ""
+    REDIS_DB: int = 0
+    
+    STORAGE_BACKEND: str = "memory"
     
     JWT_SECRET: str = ""
     
+    BACKEND_API_URL: str = "http://localhost:8080"
+    MARKET_REFRESH_INTERVAL: float = 60.0
+    
+    ADMISSION_LIMIT_SCALE: float = 1.0
+    
+    JOB_WORKERS: int = 4
+    JOB_QUEUE_SIZE: int = 100
+    JOB_RESULT_TTL: int = 3600
+    JOB_TIMEOUT: float = 300.0
+    JOB_CALLBACK_HOSTS: str = ""
+    JOB_INSTANCE_ID: str = ""
+    
+    SUMMARY_MAP_CONCURRENCY: int = 4
+    SUMMARY_CHUNK_TTL: int = 7 * 24 * 3600
+    ROLLING_SUMMARY_TTL: int = 30 * 24 * 3600
+    
+    CHAT_CACHE_CAPACITY: int = 20000
+    CHAT_CACHE_THRESHOLD: float = 0.85
+    CHAT_CACHE_TTL: float = 600.0
+    
+    FEEDBACK_VARIANTS: int = 5
+    FEEDBACK_VARIANT_TTL: int = 7 * 24 * 3600
+    FEEDBACK_REFRESH_INTERVAL: float = 3600.0
+    FEEDBACK_CONCURRENCY: int = 2
+    
     class Config:
         env_file = os.path.join(os.path.dirname(__file__), "..", "..", ".env")
         env_file_encoding = "utf-8"
@@ -1,10 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from datetime import datetime
 import logging
 
-from app.routers import ai
+from app.routers import ai, jobs
 from app.config import settings
+from app.services.admission import AdmissionMiddleware, admission_controller
+from app.services.feedback_cache import feedback_pregenerator
+from app.services.jobs import job_manager
+from app.services.market_catalog import market_catalog
 
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -18,6 +23,8 @@ app = FastAPI(
     version="1.0.0"
 )
 
+app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -27,6 +34,19 @@ app.add_middleware(
 )
 
 app.include_router(ai.router)
+app.include_router(jobs.router)
+
+@app.on_event("startup")
+async def start_background_tasks():
+    await job_manager.start()
+    await market_catalog.start()
+    await feedback_pregenerator.start()
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    await feedback_pregenerator.stop()
+    await market_catalog.stop()
+    await job_manager.stop()
 
 @app.get("/health")
 async def health_check():
@@ -36,6 +56,18 @@ async def health_check():
         "timestamp": datetime.utcnow()
     }
 
+@app.get("/ready")
+async def readiness_check():
+    saturated = admission_controller.saturated()
+    return JSONResponse(
+        status_code=503 if saturated else 200,
+        content={
+            "status": "unready" if saturated else "ready",
+            "service": "ai-service",
+            "saturated": saturated
+        }
+    )
+
 @app.get("/")
 async def root():
     return {
@@ -1,7 +1,18 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
-from typing import List, Optional
-from app.services.llm_client import llm_client
+from typing import List, Literal, Optional
+from app.services.admission import admission_controller
+from app.services.deadline import deadline_stats, run_with_deadline
+from app.services.feedback_cache import feedback_bucket, feedback_pregenerator
+from app.services.jobs import job_manager
+from app.services.market_catalog import market_catalog
+from app.services.market_index import market_index
+from app.services.market_search import MAX_SEARCH_LIMIT, market_search
+from app.services.preprocess import preprocess_stats
+from app.services.prompt_budget import prompt_stats
+from app.services.rolling_summary import rolling_summarizer
+from app.services.semantic_cache import cache_partition, chat_cache
+from app.services.llm_client import intent_matcher, llm_client
 
 router = APIRouter(prefix="/api/v1/ai", tags=["AI"])
 
@@ -17,6 +28,12 @@ class ChatResponse(BaseModel):
 class GenerateTopicsRequest(BaseModel):
     discussions: List[str]
 
+class SummarizeRequest(BaseModel):
+    discussions: List[str]
+    mode: Literal["auto", "recent", "map_reduce"] = "auto"
+    chat_id: Optional[str] = None
+    reset: bool = False
+
 class EmotionalFeedbackRequest(BaseModel):
     user_address: str
     total_bets: int
@@ -27,64 +44,155 @@ class EmotionalFeedbackRequest(BaseModel):
 class IntentRequest(BaseModel):
     message: str
 
+class SearchRequest(BaseModel):
+    query: str
+    limit: int = 5
+    statuses: Optional[List[int]] = None
+
 class IntentResponse(BaseModel):
     success: bool
     data: dict
 
 @router.get("/hot-events")
-async def get_hot_events():
+async def get_hot_events(http_request: Request):
     try:
-        result = await llm_client.analyze_hot_events()
+        result = await run_with_deadline(http_request, llm_client.analyze_hot_events())
         return {"success": True, "data": result}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/generate-topics")
-async def generate_topics(request: GenerateTopicsRequest):
+async def generate_topics(request: GenerateTopicsRequest, http_request: Request):
     try:
-        topics = await llm_client.generate_market_topics(request.discussions)
+        topics = await run_with_deadline(
+            http_request,
+            llm_client.generate_market_topics(request.discussions)
+        )
         return {"success": True, "data": topics}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/chat")
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, http_request: Request):
     try:
-        result = await llm_client.chat(
+        question = None
+        if request.messages and request.messages[-1].get("role") == "user":
+            question = request.messages[-1].get("content") or ""
+            partition = cache_partition(request.messages, request.temperature, request.max_tokens)
+            cached = chat_cache.get(partition, question)
+            if cached is not None:
+                return {"success": True, "data": {"content": cached, "cached": True}}
+        
+        result = await run_with_deadline(http_request, llm_client.chat(
             request.messages,
             request.temperature,
             request.max_tokens
-        )
+        ))
+        if question is not None and result:
+            chat_cache.put(partition, question, result)
         return {"success": True, "data": {"content": result}}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/emotional-feedback")
-async def emotional_feedback(request: EmotionalFeedbackRequest):
+async def emotional_feedback(request: EmotionalFeedbackRequest, http_request: Request):
     try:
-        feedback = await llm_client.generate_emotional_feedback(
-            request.user_address,
+        bucket = feedback_bucket(
             request.total_bets,
             request.win_bets,
             request.total_pnl,
             request.recent_results
         )
+        cached = await feedback_pregenerator.pick(bucket)
+        if cached is not None:
+            return {"success": True, "data": {"feedback": cached, "bucket": bucket, "cached": True}}
+        
+        feedback = await run_with_deadline(http_request, llm_client.generate_emotional_feedback(
+            request.user_address,
+            request.total_bets,
+            request.win_bets,
+            request.total_pnl,
+            request.recent_results
+        ))
         return {"success": True, "data": {"feedback": feedback}}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/summarize")
-async def summarize_discussions(request: GenerateTopicsRequest):
+async def summarize_discussions(request: SummarizeRequest, http_request: Request):
     try:
-        summary = await llm_client.summarize_discussions(request.discussions)
+        if request.chat_id:
+            if request.reset:
+                await rolling_summarizer.reset(request.chat_id)
+            state = await run_with_deadline(
+                http_request,
+                rolling_summarizer.update(request.chat_id, request.discussions)
+            )
+            return {"success": True, "data": state}
+        
+        summary = await run_with_deadline(
+            http_request,
+            llm_client.summarize_discussions(request.discussions, request.mode)
+        )
         return {"success": True, "data": {"summary": summary}}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/intent", response_model=IntentResponse)
-async def recognize_intent(request: IntentRequest):
+async def recognize_intent(request: IntentRequest, http_request: Request):
     try:
-        result = await llm_client.recognize_intent(request.message)
+        result = await run_with_deadline(
+            http_request,
+            llm_client.recognize_intent(request.message)
+        )
         return {"success": True, "data": result}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/search")
+async def search_markets(request: SearchRequest):
+    try:
+        results = market_search.search(
+            request.query,
+            limit=min(max(request.limit, 1), MAX_SEARCH_LIMIT),
+            statuses=request.statuses
+        )
+        return {"success": True, "data": {"query": request.query, "list": results}}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/stats")
+async def get_stats():
+    return {
+        "success": True,
+        "data": {
+            "deadline": deadline_stats.snapshot(),
+            "admission": admission_controller.snapshot(),
+            "jobs": job_manager.snapshot(),
+            "prompts": prompt_stats.snapshot(),
+            "preprocess": preprocess_stats.snapshot(),
+            "summary_chunks": {
+                "cache_hits": llm_client.chunk_cache_hits,
+                "cache_misses": llm_client.chunk_cache_misses
+            },
+            "rolling_summaries": rolling_summarizer.snapshot(),
+            "market_catalog": market_catalog.snapshot(),
+            "market_index": market_index.snapshot(),
+            "market_search": market_search.snapshot(),
+            "chat_cache": chat_cache.snapshot(),
+            "feedback_variants": feedback_pregenerator.snapshot(),
+            "intent_matcher": intent_matcher.snapshot()
+        }
+    }
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+from app.services.jobs import CallbackNotAllowed, JobQueueFull, job_manager
+
+router = APIRouter(prefix="/api/v1/ai/jobs", tags=["Jobs"])
+
+class SubmitJobRequest(BaseModel):
+    type: Literal["summarize", "generate-topics"]
+    discussions: List[str]
+    mode: Literal["auto", "recent", "map_reduce"] = "auto"
+    chat_id: Optional[str] = None
+    callback_url: Optional[str] = None
+
+@router.post("", status_code=202)
+async def submit_job(request: SubmitJobRequest):
+    try:
+        job = await job_manager.submit(
+            request.type,
+            {
+                "discussions": request.discussions,
+                "mode": request.mode,
+                "chat_id": request.chat_id
+            },
+            request.callback_url
+        )
+        return {"success": True, "data": {"job_id": job["job_id"], "status": job["status"]}}
+    except CallbackNotAllowed as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobQueueFull:
+        raise HTTPException(
+            status_code=429,
+            detail="Job queue is full, please retry later",
+            headers={"Retry-After": "5"}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return {"success": True, "data": job}
@@ -0,0 +1,137 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.config import settings
+from app.services.deadline import request_deadline
+
+ENDPOINT_LIMITS = {
+    "/api/v1/ai/intent": (16, 32),
+    "/api/v1/ai/search": (16, 32),
+    "/api/v1/ai/chat": (8, 16),
+    "/api/v1/ai/emotional-feedback": (8, 16),
+    "/api/v1/ai/summarize": (4, 8),
+    "/api/v1/ai/generate-topics": (4, 8),
+    "/api/v1/ai/hot-events": (2, 4),
+}
+
+LATENCY_SMOOTHING = 0.2
+
+class Overloaded(HTTPException):
+    def __init__(self, retry_after: int):
+        super().__init__(
+            status_code=429,
+            detail="Service is overloaded, please retry later",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+class AdmissionLimiter:
+    def __init__(self, name: str, max_concurrency: int, max_queue: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.avg_latency = 1.0
+
+    @property
+    def saturated(self) -> bool:
+        return self.active >= self.max_concurrency and self.waiting >= self.max_queue
+
+    def retry_after(self) -> int:
+        backlog = (self.waiting + 1) / self.max_concurrency
+        return max(1, math.ceil(self.avg_latency * backlog))
+
+    @asynccontextmanager
+    async def slot(self, max_wait: Optional[float] = None):
+        if self.saturated:
+            self.rejected += 1
+            raise Overloaded(self.retry_after())
+
+        self.waiting += 1
+        try:
+            async with asyncio.timeout(max_wait):
+                await self._semaphore.acquire()
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise Overloaded(self.retry_after())
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        self.admitted += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self.avg_latency += LATENCY_SMOOTHING * (elapsed - self.avg_latency)
+            self.active -= 1
+            self._semaphore.release()
+
+    def snapshot(self) -> Dict:
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_latency": round(self.avg_latency, 3),
+            "saturated": self.saturated
+        }
+
+class AdmissionController:
+    def __init__(self, limits: Dict[str, tuple], scale: float = 1.0):
+        self.limiters = {
+            path: AdmissionLimiter(
+                path,
+                max(1, int(concurrency * scale)),
+                max(0, int(queue * scale))
+            )
+            for path, (concurrency, queue) in limits.items()
+        }
+
+    def get(self, path: str) -> Optional[AdmissionLimiter]:
+        return self.limiters.get(path)
+
+    def saturated(self) -> List[str]:
+        return [path for path, limiter in self.limiters.items() if limiter.saturated]
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {path: limiter.snapshot() for path, limiter in self.limiters.items()}
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp, controller: "AdmissionController"):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        limiter = self.controller.get(scope["path"]) if scope["type"] == "http" else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        max_wait = max(0.0, request_deadline(Request(scope)) - time.monotonic())
+        try:
+            async with limiter.slot(max_wait):
+                await self.app(scope, receive, send)
+        except Overloaded as e:
+            response = JSONResponse(
+                {"detail": e.detail},
+                status_code=e.status_code,
+                headers=e.headers
+            )
+            await response(scope, receive, send)
+
+admission_controller = AdmissionController(ENDPOINT_LIMITS, settings.ADMISSION_LIMIT_SCALE)
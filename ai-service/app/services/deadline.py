@@ -0,0 +1,101 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, Optional
+from fastapi import HTTPException, Request
+
+DEADLINE_HEADER = "X-Request-Timeout"
+MAX_BUDGET = 60.0
+DISCONNECT_POLL_INTERVAL = 0.25
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+class DeadlineExceeded(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=504, detail="Request deadline exceeded")
+
+class ClientDisconnected(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=499, detail="Client disconnected")
+
+class DeadlineStats:
+    def __init__(self):
+        self.completed = 0
+        self.cancelled = 0
+        self.expired = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "expired": self.expired
+        }
+
+deadline_stats = DeadlineStats()
+
+def remaining() -> Optional[float]:
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+def upstream_timeout(default: float) -> float:
+    budget = remaining()
+    if budget is None:
+        return default
+    if budget <= 0:
+        raise DeadlineExceeded()
+    return min(default, budget)
+
+def request_budget(request: Request) -> float:
+    raw = request.headers.get(DEADLINE_HEADER)
+    try:
+        budget = float(raw) if raw else MAX_BUDGET
+    except ValueError:
+        budget = MAX_BUDGET
+    return max(0.0, min(budget, MAX_BUDGET))
+
+def request_deadline(request: Request) -> float:
+    deadline = getattr(request.state, "deadline", None)
+    if deadline is None:
+        deadline = time.monotonic() + request_budget(request)
+        request.state.deadline = deadline
+    return deadline
+
+async def _wait_for_disconnect(request: Request):
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+async def run_with_deadline(request: Request, work: Awaitable[Any]) -> Any:
+    deadline = request_deadline(request)
+    budget = max(0.0, deadline - time.monotonic())
+    token = _deadline.set(deadline)
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+
+    try:
+        done, _ = await asyncio.wait(
+            {task, watcher},
+            timeout=budget,
+            return_when=asyncio.FIRST_COMPLETED
+        )
+
+        if task in done:
+            try:
+                result = task.result()
+            except DeadlineExceeded:
+                deadline_stats.expired += 1
+                raise
+            deadline_stats.completed += 1
+            return result
+
+        if watcher in done:
+            deadline_stats.cancelled += 1
+            raise ClientDisconnected()
+
+        deadline_stats.expired += 1
+        raise DeadlineExceeded()
+    finally:
+        watcher.cancel()
+        task.cancel()
+        _deadline.reset(token)
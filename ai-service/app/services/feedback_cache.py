@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import random
+from typing import Dict, List, Optional, Sequence, Set
+from app.config import settings
+from app.services.llm_client import llm_client
+from app.services.storage import store
+
+logger = logging.getLogger(__name__)
+
+PNL_UNIT = 10 ** 18
+LARGE_PNL = 100 * PNL_UNIT
+STREAK_LENGTH = 3
+
+WIN_RATE_BANDS = ((30, "0-30"), (45, "30-45"), (55, "45-55"), (70, "55-70"), (101, "70-100"))
+PNL_BANDS = ("loss_large", "loss", "even", "gain", "gain_large")
+STREAKS = ("win_streak", "loss_streak", "mixed")
+
+WIN_MARKERS = ("win", "won", "赢", "胜", "✅")
+LOSS_MARKERS = ("lose", "loss", "lost", "输", "负", "❌")
+
+WIN_RATE_LABELS = {
+    "new": "还没有下注记录的新用户",
+    "0-30": "胜率低于30%",
+    "30-45": "胜率在30%-45%之间",
+    "45-55": "胜率在45%-55%之间",
+    "55-70": "胜率在55%-70%之间",
+    "70-100": "胜率高于70%",
+}
+PNL_LABELS = {
+    "loss_large": "累计亏损较大",
+    "loss": "小幅亏损",
+    "even": "基本持平",
+    "gain": "小幅盈利",
+    "gain_large": "累计盈利可观",
+}
+STREAK_LABELS = {
+    "win_streak": "最近连胜",
+    "loss_streak": "最近连败",
+    "mixed": "最近有赢有输",
+}
+
+def win_rate_band(total_bets: int, win_bets: int) -> str:
+    if total_bets <= 0:
+        return "new"
+    win_rate = win_bets / total_bets * 100
+    for upper, band in WIN_RATE_BANDS:
+        if win_rate < upper:
+            return band
+    return WIN_RATE_BANDS[-1][1]
+
+def pnl_band(total_pnl: int) -> str:
+    if total_pnl <= -LARGE_PNL:
+        return "loss_large"
+    if total_pnl >= LARGE_PNL:
+        return "gain_large"
+    if abs(total_pnl) < PNL_UNIT:
+        return "even"
+    return "gain" if total_pnl > 0 else "loss"
+
+def _outcome(result: str) -> Optional[bool]:
+    lowered = result.lower()
+    if any(marker in lowered for marker in LOSS_MARKERS):
+        return False
+    if any(marker in lowered for marker in WIN_MARKERS):
+        return True
+    return None
+
+def streak_band(recent_results: Sequence[str]) -> str:
+    outcomes = [_outcome(result) for result in recent_results[-STREAK_LENGTH:]]
+    if len(outcomes) == STREAK_LENGTH and all(outcome is True for outcome in outcomes):
+        return "win_streak"
+    if len(outcomes) == STREAK_LENGTH and all(outcome is False for outcome in outcomes):
+        return "loss_streak"
+    return "mixed"
+
+def feedback_bucket(total_bets: int, win_bets: int, total_pnl: int, recent_results: Sequence[str]) -> str:
+    band = win_rate_band(total_bets, win_bets)
+    if band == "new":
+        return "new|even|mixed"
+    return f"{band}|{pnl_band(total_pnl)}|{streak_band(recent_results)}"
+
+def all_buckets() -> List[str]:
+    return ["new|even|mixed"] + [
+        f"{band}|{pnl}|{streak}"
+        for _, band in WIN_RATE_BANDS
+        for pnl in PNL_BANDS
+        for streak in STREAKS
+    ]
+
+def describe_bucket(bucket: str) -> str:
+    band, pnl, streak = bucket.split("|")
+    if band == "new":
+        return WIN_RATE_LABELS[band]
+    return f"{WIN_RATE_LABELS[band]}，{PNL_LABELS[pnl]}，{STREAK_LABELS[streak]}"
+
+class FeedbackPregenerator:
+    def __init__(self, variants: int, ttl: float, refresh_interval: float, concurrency: int):
+        self.variants = variants
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.concurrency = concurrency
+        self._pending: Set[str] = set()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.failed = 0
+
+    def _key(self, bucket: str) -> str:
+        return f"feedback-variants:{bucket}"
+
+    async def pick(self, bucket: str) -> Optional[str]:
+        variants = await store.get(self._key(bucket))
+        if variants:
+            self.hits += 1
+            return random.choice(variants)
+        self.misses += 1
+        self._pending.add(bucket)
+        self._wakeup.set()
+        return None
+
+    async def generate(self, bucket: str) -> bool:
+        try:
+            variants = await llm_client.generate_feedback_variants(describe_bucket(bucket), self.variants)
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Feedback pregeneration for {bucket} failed: {e}")
+            return False
+        if not variants:
+            self.failed += 1
+            return False
+        await store.set(self._key(bucket), variants, self.ttl)
+        self.generated += 1
+        return True
+
+    async def run_once(self, buckets: Optional[Sequence[str]] = None):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fill(bucket: str):
+            async with semaphore:
+                if await store.get(self._key(bucket)) is None:
+                    await self.generate(bucket)
+
+        await asyncio.gather(*(fill(bucket) for bucket in (buckets or all_buckets())))
+
+    async def _run(self):
+        while True:
+            if llm_client.configured:
+                pending = list(self._pending)
+                self._pending.clear()
+                try:
+                    await self.run_once(pending or None)
+                except Exception as e:
+                    logger.error(f"Feedback pregeneration failed: {e}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "buckets": len(all_buckets()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "pending": len(self._pending),
+            "generated": self.generated,
+            "failed": self.failed
+        }
+
+feedback_pregenerator = FeedbackPregenerator(
+    variants=settings.FEEDBACK_VARIANTS,
+    ttl=settings.FEEDBACK_VARIANT_TTL,
+    refresh_interval=settings.FEEDBACK_REFRESH_INTERVAL,
+    concurrency=settings.FEEDBACK_CONCURRENCY
+)
@@ -0,0 +1,182 @@
+import re
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+from pypinyin import lazy_pinyin
+
+MAX_FUZZY_CHARS = 16
+FUZZY_CONFIDENCE = 0.8
+HOMOPHONE_PENALTY = 0.05
+EDIT_PENALTY = 0.1
+MAX_EDITS = {True: 1, False: 2}
+
+Symbols = Tuple[str, ...]
+
+_RUN_RE = re.compile(
+    "([\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\U00020000-\U0002fa1f]+)|([a-z0-9]+)"
+)
+
+@lru_cache(maxsize=16384)
+def syllable(char: str) -> str:
+    return lazy_pinyin(char)[0]
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower()
+
+def edit_budget(length: int, wide: bool) -> int:
+    if wide:
+        return 0 if length <= 3 else 1
+    if length <= 3:
+        return 0
+    return 1 if length <= 6 else 2
+
+def deletes(symbols: Symbols, distance: int) -> Set[Symbols]:
+    results = {symbols}
+    frontier = {symbols}
+    for _ in range(distance):
+        frontier = {item[:i] + item[i + 1:] for item in frontier for i in range(len(item))}
+        results |= frontier
+    return results
+
+def edit_distance(a: Symbols, b: Symbols, limit: int) -> int:
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    while a and b and a[0] == b[0]:
+        a, b = a[1:], b[1:]
+    while a and b and a[-1] == b[-1]:
+        a, b = a[:-1], b[:-1]
+    if not a or not b:
+        return min(len(a) + len(b), limit + 1)
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+class KeywordMatch:
+    __slots__ = ("command", "keyword", "distance", "confidence", "coverage")
+
+    def __init__(self, command: str, keyword: str, distance: int, confidence: float, coverage: float):
+        self.command = command
+        self.keyword = keyword
+        self.distance = distance
+        self.confidence = confidence
+        self.coverage = coverage
+
+class _Keyword:
+    __slots__ = ("command", "keyword", "text", "symbols", "budget", "order")
+
+    def __init__(self, command: str, keyword: str, text: str, symbols: Symbols, budget: int, order: int):
+        self.command = command
+        self.keyword = keyword
+        self.text = text
+        self.symbols = symbols
+        self.budget = budget
+        self.order = order
+
+def _symbols(run: str, wide: bool) -> Symbols:
+    return tuple(syllable(char) for char in run) if wide else tuple(run)
+
+class FuzzyKeywordMatcher:
+    def __init__(self, keywords: Dict[str, List[str]]):
+        self._deletes: Dict[Tuple[bool, Symbols], List[_Keyword]] = {}
+        self._window_lengths: Set[int] = set()
+        self._syllables: Set[str] = set()
+        self.lookups = 0
+        self.matches = 0
+        self.lookup_seconds = 0.0
+
+        for order, (command, words) in enumerate(keywords.items()):
+            for word in words:
+                runs = _RUN_RE.findall(normalize(word))
+                if len(runs) != 1:
+                    continue
+                wide = bool(runs[0][0])
+                text = runs[0][0] or runs[0][1]
+                if len(text) < 2:
+                    continue
+                symbols = _symbols(text, wide)
+                budget = edit_budget(len(symbols), wide)
+                entry = _Keyword(command, word, text, symbols, budget, order)
+                for key in deletes(symbols, budget):
+                    self._deletes.setdefault((wide, key), []).append(entry)
+                if wide:
+                    self._syllables.update(symbols)
+                    self._window_lengths.update(range(len(text) - budget, len(text) + budget + 1))
+
+    def _windows(self, run: str, wide: bool):
+        if not wide:
+            yield run, _symbols(run, False), deletes(tuple(run), MAX_EDITS[False] if len(run) > 2 else 0)
+            return
+        symbols = _symbols(run, True)
+        unknown = [0]
+        for symbol in symbols:
+            unknown.append(unknown[-1] + (symbol not in self._syllables))
+        for length in self._window_lengths:
+            for start in range(len(run) - length + 1):
+                end = start + length
+                misses = unknown[end] - unknown[start]
+                window = symbols[start:end]
+                if misses == 0:
+                    keys = deletes(window, MAX_EDITS[True] if length > 2 else 0)
+                elif misses == 1 and length > 2:
+                    keys = {tuple(symbol for symbol in window if symbol in self._syllables)}
+                else:
+                    continue
+                yield run[start:end], window, keys
+
+    def match(self, text: str) -> Optional[KeywordMatch]:
+        started = time.perf_counter()
+        runs = _RUN_RE.findall(normalize(text)[:MAX_FUZZY_CHARS])
+        total = sum(len(wide or word) for wide, word in runs)
+
+        best: Optional[Tuple] = None
+        for wide_run, word in runs:
+            wide = bool(wide_run)
+            for chars, symbols, keys in self._windows(wide_run or word, wide):
+                seen: Set[int] = set()
+                for key in keys:
+                    for entry in self._deletes.get((wide, key), ()):
+                        if id(entry) in seen:
+                            continue
+                        seen.add(id(entry))
+                        distance = edit_distance(symbols, entry.symbols, entry.budget)
+                        if distance > entry.budget:
+                            continue
+                        confidence = FUZZY_CONFIDENCE - EDIT_PENALTY * distance
+                        if distance == 0 and chars != entry.text:
+                            confidence -= HOMOPHONE_PENALTY
+                        rank = (confidence, len(entry.symbols), -entry.order)
+                        if best is None or rank > best[0]:
+                            best = (rank, entry, distance, confidence, len(chars))
+
+        self.lookups += 1
+        self.lookup_seconds += time.perf_counter() - started
+        if best is None:
+            return None
+        self.matches += 1
+        _, entry, distance, confidence, length = best
+        return KeywordMatch(
+            entry.command,
+            entry.keyword,
+            distance,
+            round(confidence, 2),
+            round(length / total, 2)
+        )
+
+    def snapshot(self) -> Dict:
+        return {
+            "keys": len(self._deletes),
+            "lookups": self.lookups,
+            "matches": self.matches,
+            "avg_lookup_us": round(self.lookup_seconds / max(1, self.lookups) * 1_000_000, 1)
+        }
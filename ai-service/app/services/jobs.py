@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+import httpx
+from app.config import settings
+from app.services.llm_client import llm_client
+from app.services.rolling_summary import rolling_summarizer
+from app.services.storage import store
+
+logger = logging.getLogger(__name__)
+
+CALLBACK_TIMEOUT = 10.0
+PENDING_KEY = "jobs:pending:{owner}"
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+class JobQueueFull(Exception):
+    pass
+
+class CallbackNotAllowed(ValueError):
+    pass
+
+def callback_allowed(url: str, hosts: set) -> bool:
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return False
+    if parts.scheme not in ("http", "https") or not parts.hostname or parts.username or parts.password:
+        return False
+    host = parts.hostname.lower()
+    return host in hosts or (port is not None and f"{host}:{port}" in hosts)
+
+async def _summarize(payload: Dict) -> Dict:
+    if payload.get("chat_id"):
+        return await rolling_summarizer.update(payload["chat_id"], payload["discussions"])
+    summary = await llm_client.summarize_discussions(
+        payload["discussions"],
+        payload.get("mode", "auto")
+    )
+    return {"summary": summary}
+
+async def _generate_topics(payload: Dict) -> List[Dict]:
+    return await llm_client.generate_market_topics(payload["discussions"])
+
+JOB_HANDLERS: Dict[str, Callable[[Dict], Awaitable[Any]]] = {
+    "summarize": _summarize,
+    "generate-topics": _generate_topics,
+}
+
+class JobManager:
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        result_ttl: float,
+        job_timeout: float,
+        callback_hosts: set,
+        owner: str
+    ):
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self.job_timeout = job_timeout
+        self.callback_hosts = callback_hosts
+        self.owner = owner
+        self._pending_key = PENDING_KEY.format(owner=owner)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._tasks: List[asyncio.Task] = []
+        self._pending_lock = asyncio.Lock()
+        self.restored = 0
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _key(self, job_id: str) -> str:
+        return f"job:{job_id}"
+
+    def _payload_key(self, job_id: str) -> str:
+        return f"job-payload:{job_id}"
+
+    async def _track(self, job_id: str, pending: bool):
+        async with self._pending_lock:
+            job_ids = await store.get(self._pending_key) or []
+            if pending:
+                job_ids.append(job_id)
+            elif job_id in job_ids:
+                job_ids.remove(job_id)
+            else:
+                return
+            await store.set(self._pending_key, job_ids, self.result_ttl)
+
+    async def _discard(self, job_id: str):
+        await self._track(job_id, False)
+        await store.delete(self._payload_key(job_id))
+
+    async def _restore(self):
+        for job_id in list(await store.get(self._pending_key) or []):
+            job = await store.get(self._key(job_id))
+            payload = await store.get(self._payload_key(job_id))
+            if (
+                job is None or payload is None or job.get("owner") != self.owner
+                or job["status"] not in (JOB_QUEUED, JOB_RUNNING)
+            ):
+                await self._discard(job_id)
+                continue
+            try:
+                self._queue.put_nowait((job, payload))
+            except asyncio.QueueFull:
+                await self._save(job, status=JOB_FAILED, error="job queue full on restart")
+                await self._discard(job_id)
+                self.failed += 1
+                continue
+            await self._save(job, status=JOB_QUEUED)
+            self.restored += 1
+        if self.restored:
+            logger.info(f"Re-enqueued {self.restored} pending jobs")
+
+    async def start(self):
+        for index in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(index)))
+        await self._restore()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def submit(self, job_type: str, payload: Dict, callback_url: Optional[str] = None) -> Dict:
+        if job_type not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job type: {job_type}")
+        if callback_url and not callback_allowed(callback_url, self.callback_hosts):
+            raise CallbackNotAllowed("callback_url host is not allowed")
+        if self._queue.full():
+            self.rejected += 1
+            raise JobQueueFull()
+
+        now = time.time()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "type": job_type,
+            "status": JOB_QUEUED,
+            "result": None,
+            "error": None,
+            "callback_url": callback_url,
+            "owner": self.owner,
+            "created_at": now,
+            "updated_at": now
+        }
+        await store.set(self._payload_key(job["job_id"]), payload, self.result_ttl)
+        await store.set(self._key(job["job_id"]), job, self.result_ttl)
+        await self._track(job["job_id"], True)
+        try:
+            self._queue.put_nowait((job, payload))
+        except asyncio.QueueFull:
+            await store.delete(self._key(job["job_id"]))
+            await self._discard(job["job_id"])
+            self.rejected += 1
+            raise JobQueueFull()
+        self.submitted += 1
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        return await store.get(self._key(job_id))
+
+    async def _save(self, job: Dict, **changes):
+        job.update(changes, updated_at=time.time())
+        await store.set(self._key(job["job_id"]), job, self.result_ttl)
+
+    async def _worker(self, index: int):
+        while True:
+            job, payload = await self._queue.get()
+            try:
+                await self._run(job, payload)
+            except Exception as e:
+                logger.error(f"Job worker {index} failed on {job['job_id']}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Dict, payload: Dict):
+        await self._save(job, status=JOB_RUNNING)
+        try:
+            result = await asyncio.wait_for(
+                JOB_HANDLERS[job["type"]](payload),
+                timeout=self.job_timeout
+            )
+            await self._save(job, status=JOB_SUCCEEDED, result=result)
+            self.succeeded += 1
+        except Exception as e:
+            await self._save(job, status=JOB_FAILED, error=str(e) or type(e).__name__)
+            self.failed += 1
+        await self._discard(job["job_id"])
+
+        if job.get("callback_url") and callback_allowed(job["callback_url"], self.callback_hosts):
+            await self._send_callback(job)
+
+    async def _send_callback(self, job: Dict):
+        try:
+            async with httpx.AsyncClient(timeout=CALLBACK_TIMEOUT) as client:
+                response = await client.post(job["callback_url"], json=job, follow_redirects=False)
+                response.raise_for_status()
+        except Exception as e:
+            logger.warning(f"Job callback for {job['job_id']} failed: {e}")
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize(),
+            "restored": self.restored,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rejected": self.rejected
+        }
+
+job_manager = JobManager(
+    workers=settings.JOB_WORKERS,
+    queue_size=settings.JOB_QUEUE_SIZE,
+    result_ttl=settings.JOB_RESULT_TTL,
+    job_timeout=settings.JOB_TIMEOUT,
+    callback_hosts={host.strip().lower() for host in settings.JOB_CALLBACK_HOSTS.split(",") if host.strip()},
+    owner=settings.JOB_INSTANCE_ID or socket.gethostname()
+)
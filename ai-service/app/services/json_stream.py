@@ -0,0 +1,94 @@
+import json
+from typing import Any, Dict, Optional
+
+_WHITESPACE = " \t\r\n"
+
+def extract_json(text: str, opening: str = "[") -> Optional[Any]:
+    decoder = json.JSONDecoder()
+    start = text.find(opening)
+    while start != -1:
+        try:
+            value, _ = decoder.raw_decode(text, start)
+            return value
+        except json.JSONDecodeError:
+            start = text.find(opening, start + 1)
+    return None
+
+class IncrementalJSONParser:
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos: Optional[int] = None
+        self.values: Dict[str, Any] = {}
+        self.complete = False
+
+    @property
+    def started(self) -> bool:
+        return self._pos is not None
+
+    @property
+    def text(self) -> str:
+        return self._buffer
+
+    def feed(self, chunk: str) -> Dict[str, Any]:
+        self._buffer += chunk
+        self._advance()
+        return self.values
+
+    def has(self, *keys: str) -> bool:
+        return all(key in self.values for key in keys)
+
+    def _skip_whitespace(self, index: int) -> int:
+        while index < len(self._buffer) and self._buffer[index] in _WHITESPACE:
+            index += 1
+        return index
+
+    def _advance(self):
+        if self._pos is None:
+            start = self._buffer.find("{")
+            if start < 0:
+                return
+            self._pos = start + 1
+
+        buffer = self._buffer
+        while not self.complete:
+            index = self._skip_whitespace(self._pos)
+            if index >= len(buffer):
+                return
+
+            char = buffer[index]
+            if char == ",":
+                self._pos = index + 1
+                continue
+            if char == "}":
+                self.complete = True
+                return
+            if char != '"':
+                raise json.JSONDecodeError("Expecting property name", buffer, index)
+
+            try:
+                key, index = self._decoder.raw_decode(buffer, index)
+            except json.JSONDecodeError:
+                return
+
+            index = self._skip_whitespace(index)
+            if index >= len(buffer):
+                return
+            if buffer[index] != ":":
+                raise json.JSONDecodeError("Expecting ':' delimiter", buffer, index)
+
+            index = self._skip_whitespace(index + 1)
+            if index >= len(buffer):
+                return
+
+            try:
+                value, end = self._decoder.raw_decode(buffer, index)
+            except json.JSONDecodeError:
+                return
+
+            delimiter = self._skip_whitespace(end)
+            if delimiter >= len(buffer) or buffer[delimiter] not in ",}":
+                return
+
+            self.values[key] = value
+            self._pos = end
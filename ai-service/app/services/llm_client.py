@@ -1,8 +1,24 @@
+import asyncio
+import hashlib
 import httpx
 import json
 import logging
-from typing import List, Dict, Optional
+from contextlib import aclosing
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from app.config import settings
+from app.services.deadline import upstream_timeout
+from app.services.fuzzy_intent import FuzzyKeywordMatcher, KeywordMatch
+from app.services.json_stream import IncrementalJSONParser, extract_json
+from app.services.market_index import market_index
+from app.services.preprocess import (
+    collapse_duplicates, drop_noise, preprocess_messages, preprocess_stats
+)
+from app.services.prompt_budget import (
+    MESSAGE_OVERHEAD_TOKENS, PROMPT_BUDGETS, PromptBlock, assemble_newest_first,
+    chunk_by_tokens, count_message_tokens, estimate_tokens, fit_messages, prompt_stats,
+    truncate_to_tokens
+)
+from app.services.storage import store
 
 logger = logging.getLogger(__name__)
 
@@ -24,23 +40,52 @@ INTENT_KEYWORDS = {
     "hot": ["热点", "今日热点", "热门", "hot"],
 }
 
+intent_matcher = FuzzyKeywordMatcher(INTENT_KEYWORDS)
+
+FUZZY_SHORTCUT_COVERAGE = 0.6
+
+UPSTREAM_TIMEOUT = 60.0
+
+INTENT_EARLY_EXIT_KEYS = ("has_intent", "command", "commands", "confidence")
+MAX_INTENT_COMMANDS = 4
+INTENT_MESSAGE_TOKENS = 200
+
+SUMMARY_CHUNK_MAX_TOKENS = 400
+SUMMARY_CHUNK_OVERHEAD = 100
+
 class LLMClient:
     def __init__(self):
         self.api_url = settings.AI_API_URL
         self.api_key = settings.AI_API_KEY
         self.model = settings.AI_MODEL
+        self.chunk_cache_hits = 0
+        self.chunk_cache_misses = 0
+    
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key) and not self.api_key.startswith("your_")
+    
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+    
+    def _fit_prompt(self, messages: List[Dict[str, str]], endpoint: str) -> List[Dict[str, str]]:
+        messages = fit_messages(messages, PROMPT_BUDGETS.get(endpoint, PROMPT_BUDGETS["chat"]))
+        prompt_tokens = count_message_tokens(messages)
+        prompt_stats.record(endpoint, prompt_tokens)
+        logger.debug(f"Prompt for {endpoint}: {prompt_tokens} tokens")
+        return messages
     
     async def chat(
         self, 
         messages: List[Dict[str, str]], 
         temperature: float = 0.7,
-        max_tokens: int = 2000
+        max_tokens: int = 2000,
+        endpoint: str = "chat"
     ) -> str:
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
+        messages = self._fit_prompt(messages, endpoint)
         payload = {
             "model": self.model,
             "messages": messages,
@@ -48,16 +93,61 @@ class LLMClient:
             "max_tokens": max_tokens
         }
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with httpx.AsyncClient(timeout=upstream_timeout(UPSTREAM_TIMEOUT)) as client:
             response = await client.post(
                 self.api_url,
-                headers=headers,
+                headers=self._headers(),
                 json=payload
             )
             response.raise_for_status()
             data = response.json()
             return data["choices"][0]["message"]["content"]
     
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        endpoint: str = "chat"
+    ) -> AsyncIterator[str]:
+        messages = self._fit_prompt(messages, endpoint)
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True
+        }
+        
+        async with httpx.AsyncClient(timeout=upstream_timeout(UPSTREAM_TIMEOUT)) as client:
+            async with client.stream(
+                "POST",
+                self.api_url,
+                headers=self._headers(),
+                json=payload
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    
+                    choices = json.loads(data).get("choices") or []
+                    if not choices:
+                        continue
+                    content = (choices[0].get("delta") or {}).get("content")
+                    if content:
+                        yield content
+    
+    def _assemble(self, endpoint: str, items: List[str], template: str) -> PromptBlock:
+        overhead = estimate_tokens(template) + 2 * MESSAGE_OVERHEAD_TOKENS
+        budget = PROMPT_BUDGETS[endpoint] - overhead
+        block = assemble_newest_first(items, max(0, budget))
+        prompt_stats.record_block(endpoint, block)
+        return block
+    
     async def analyze_hot_events(self) -> Dict:
         messages = [
             {
@@ -74,7 +164,7 @@ class LLMClient:
             }
         ]
         
-        result = await self.chat(messages)
+        result = await self.chat(messages, endpoint="hot_events")
         return {
             "title": "今日热点",
             "summary": result[:200],
@@ -82,12 +172,7 @@ class LLMClient:
         }
     
     async def generate_market_topics(self, discussions: List[str]) -> List[Dict]:
-        discussion_text = "\n".join(discussions[-50:])
-        
-        messages = [
-            {
-                "role": "system",
-                "content": """你是一个预测市场议题生成专家。根据用户讨论内容，生成适合的预测市场议题。
+        system_prompt = """你是一个预测市场议题生成专家。根据用户讨论内容，生成适合的预测市场议题。
 输出格式要求（JSON数组）：
 [{
     "question": "问题标题",
@@ -95,28 +180,163 @@ class LLMClient:
     "category": "分类",
     "deadline_suggestion": "建议截止时间"
 }]"""
+        user_prompt = "根据以下讨论内容生成预测市场议题：\n\n{discussions}"
+        
+        discussions = preprocess_messages(discussions)
+        block = self._assemble(
+            "topics",
+            discussions,
+            system_prompt + user_prompt.format(discussions="")
+        )
+        
+        messages = [
+            {
+                "role": "system",
+                "content": system_prompt
             },
             {
                 "role": "user",
-                "content": f"根据以下讨论内容生成预测市场议题：\n\n{discussion_text}"
+                "content": user_prompt.format(discussions=block.text)
             }
         ]
         
-        result = await self.chat(messages)
-        return [{"question": "示例问题", "description": result, "category": "general"}]
+        result = await self.chat(messages, endpoint="topics")
+        return market_index.filter_topics(self._parse_topics(result))
     
-    async def summarize_discussions(self, messages: List[str]) -> str:
-        text = "\n".join(messages[-100:])
+    def _parse_topics(self, result: str) -> List[Dict]:
+        parsed = extract_json(result, "[")
+        if parsed is None:
+            parsed = extract_json(result, "{")
+        if isinstance(parsed, dict):
+            parsed = [parsed]
+        if not isinstance(parsed, list):
+            logger.warning(f"Could not parse market topics: {result[:200]}")
+            return []
         
-        prompt = f"""请总结以下群聊讨论内容，提取关键观点和讨论热点：
+        topics = []
+        for item in parsed:
+            if not isinstance(item, dict):
+                continue
+            question = str(item.get("question") or "").strip()
+            if not question:
+                continue
+            topics.append({
+                "question": question,
+                "description": str(item.get("description") or "").strip(),
+                "category": str(item.get("category") or "general").strip(),
+                "deadline_suggestion": str(item.get("deadline_suggestion") or "").strip()
+            })
+        return topics
+    
+    async def summarize_discussions(self, messages: List[str], mode: str = "auto") -> str:
+        template = """请总结以下群聊讨论内容，提取关键观点和讨论热点：
 
 {text}
 
 请用简洁的语言总结：1. 主要讨论话题 2. 不同观点 3. 讨论结论"""
+        
+        messages = drop_noise(messages)
+        recent = collapse_duplicates(messages)
+        overhead = estimate_tokens(template.format(text="")) + MESSAGE_OVERHEAD_TOKENS
+        block = assemble_newest_first(recent, PROMPT_BUDGETS["summarize"] - overhead)
+        
+        if mode == "map_reduce" or (mode == "auto" and block.dropped > 0):
+            chunks = self._chunk_history(messages)
+            if len(chunks) > 1:
+                return await self._summarize_map_reduce(chunks)
+        
+        preprocess_stats.record_collapse(len(messages), len(recent))
+        prompt_stats.record_block("summarize", block)
+        prompt = template.format(text=block.text)
 
-        result = await self.chat([{"role": "user", "content": prompt}])
+        result = await self.chat([{"role": "user", "content": prompt}], endpoint="summarize")
         return result
     
+    async def update_summary(self, previous_summary: str, messages: List[str]) -> str:
+        template = """以下是该群聊此前讨论的摘要：
+
+{summary}
+
+以下是此后的新消息：
+
+{text}
+
+请结合新消息更新摘要，保留仍然重要的旧内容，用简洁的语言总结：1. 主要讨论话题 2. 不同观点 3. 讨论结论"""
+        
+        messages = drop_noise(messages)
+        recent = collapse_duplicates(messages)
+        previous_summary = truncate_to_tokens(previous_summary, PROMPT_BUDGETS["summarize"] // 3)
+        overhead = estimate_tokens(template.format(summary=previous_summary, text="")) + MESSAGE_OVERHEAD_TOKENS
+        block = assemble_newest_first(recent, PROMPT_BUDGETS["summarize"] - overhead)
+        
+        if not recent:
+            return previous_summary
+        if block.dropped > 0:
+            text = await self._summarize_map_reduce(self._chunk_history(messages))
+        else:
+            preprocess_stats.record_collapse(len(messages), len(recent))
+            prompt_stats.record_block("summarize", block)
+            text = block.text
+        
+        prompt = template.format(summary=previous_summary, text=text)
+        return await self.chat([{"role": "user", "content": prompt}], endpoint="summarize")
+    
+    def _chunk_history(self, messages: List[str]) -> List[str]:
+        chunks = []
+        for chunk in chunk_by_tokens(messages, PROMPT_BUDGETS["summarize_chunk"] - SUMMARY_CHUNK_OVERHEAD):
+            items = collapse_duplicates(chunk.items, order_by_last=False)
+            preprocess_stats.record_collapse(len(chunk.items), len(items))
+            chunks.append("\n".join(items))
+        return chunks
+    
+    async def _summarize_map_reduce(self, chunks: List[str]) -> str:
+        map_template = """以下是一段群聊记录，请提炼这段讨论的主要话题、不同观点和结论，尽量简洁，保留关键事实和数字：
+
+{text}"""
+        merge_template = """以下是同一群聊按时间顺序排列的若干段摘要，请合并为一份更精炼的摘要，保留关键事实和数字：
+
+{text}"""
+        reduce_template = """以下是同一群聊按时间顺序排列的分段摘要，请基于它们总结整个讨论：
+
+{text}
+
+请用简洁的语言总结：1. 主要讨论话题 2. 不同观点 3. 讨论结论"""
+        
+        partials = await self._summarize_chunks(chunks, map_template)
+        
+        reduce_budget = PROMPT_BUDGETS["summarize"] - estimate_tokens(reduce_template.format(text="")) - MESSAGE_OVERHEAD_TOKENS
+        while len(partials) > 1 and sum(estimate_tokens(p) + 2 for p in partials) > reduce_budget:
+            merge_budget = PROMPT_BUDGETS["summarize_chunk"] - SUMMARY_CHUNK_OVERHEAD
+            groups = chunk_by_tokens(partials, merge_budget, max_item_tokens=merge_budget // 2, separator="\n\n")
+            partials = await self._summarize_chunks([group.text for group in groups], merge_template)
+        
+        prompt = reduce_template.format(text="\n\n".join(partials))
+        return await self.chat([{"role": "user", "content": prompt}], endpoint="summarize")
+    
+    async def _summarize_chunks(self, chunks: List[str], template: str) -> List[str]:
+        semaphore = asyncio.Semaphore(settings.SUMMARY_MAP_CONCURRENCY)
+        
+        async def summarize_chunk(text: str) -> str:
+            digest = hashlib.sha256(f"{self.model}\n{template}\n{text}".encode("utf-8")).hexdigest()
+            key = f"summary-chunk:{digest}"
+            cached = await store.get(key)
+            if cached is not None:
+                self.chunk_cache_hits += 1
+                return cached
+            
+            self.chunk_cache_misses += 1
+            async with semaphore:
+                summary = await self.chat(
+                    [{"role": "user", "content": template.format(text=text)}],
+                    temperature=0.3,
+                    max_tokens=SUMMARY_CHUNK_MAX_TOKENS,
+                    endpoint="summarize_chunk"
+                )
+            await store.set(key, summary, settings.SUMMARY_CHUNK_TTL)
+            return summary
+        
+        return list(await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks)))
+    
     async def generate_emotional_feedback(
         self, 
         user_address: str,
@@ -126,6 +346,13 @@ class LLMClient:
         recent_results: List[str]
     ) -> str:
         win_rate = (win_bets / total_bets * 100) if total_bets > 0 else 0
+        recent = assemble_newest_first(
+            recent_results,
+            PROMPT_BUDGETS["feedback"] // 4,
+            max_item_tokens=20,
+            separator=", "
+        )
+        prompt_stats.record_block("feedback", recent)
         
         messages = [
             {
@@ -140,36 +367,95 @@ class LLMClient:
 - 获胜次数：{win_bets}
 - 胜率：{win_rate:.1f}%
 - 累计盈亏：{total_pnl} USDC
-- 最近结果：{', '.join(recent_results)}
+- 最近结果：{recent.text}
 
 请给用户一些鼓励和建议。"""
             }
         ]
         
-        return await self.chat(messages)
+        return await self.chat(messages, endpoint="feedback")
+    
+    async def generate_feedback_variants(self, description: str, count: int) -> List[str]:
+        messages = [
+            {
+                "role": "system",
+                "content": f"""你是一个友好的预测市场助手，根据用户的战绩提供情绪价值反馈。
+要鼓励用户，给出建设性建议，保持积极正面的态度。
+请写出{count}条风格各异的反馈，每条不超过120字，不要提及具体数字。
+输出格式要求（JSON字符串数组）：["反馈1", "反馈2"]"""
+            },
+            {
+                "role": "user",
+                "content": f"用户画像：{description}\n\n请给这类用户一些鼓励和建议。"
+            }
+        ]
+        
+        result = await self.chat(messages, endpoint="feedback", temperature=0.9)
+        parsed = extract_json(result, "[")
+        if not isinstance(parsed, list):
+            logger.warning(f"Could not parse feedback variants: {result[:200]}")
+            return []
+        return [str(item).strip() for item in parsed if isinstance(item, str) and item.strip()][:count]
     
     async def recognize_intent(self, message: str) -> Dict:
-        if self.api_key and self.api_key != "your_ai_api_key" and not self.api_key.startswith("your_"):
+        commands, coverage = self._keyword_commands(message)
+        if commands and coverage >= FUZZY_SHORTCUT_COVERAGE:
+            return self._keyword_intent(commands, 0.8)
+        
+        match = intent_matcher.match(message)
+        if match is not None and match.coverage >= FUZZY_SHORTCUT_COVERAGE:
+            return self._keyword_intent([match.command], match.confidence)
+        
+        if self.configured:
             try:
                 return await self._recognize_intent_with_llm(message)
             except Exception as e:
                 logger.warning(f"LLM intent recognition failed, falling back to keywords: {e}")
         
-        return self._recognize_intent_with_keywords(message)
+        return self._recognize_intent_with_keywords(message, commands, match)
     
-    def _recognize_intent_with_keywords(self, message: str) -> Dict:
+    def _keyword_commands(self, message: str) -> Tuple[List[str], float]:
         message_lower = message.lower()
-        
+        spans = []
         for command, keywords in INTENT_KEYWORDS.items():
             for keyword in keywords:
-                if keyword.lower() in message_lower:
-                    return {
-                        "has_intent": True,
-                        "command": command,
-                        "args": [],
-                        "confidence": 0.8,
-                        "reply": None
-                    }
+                keyword = keyword.lower()
+                start = message_lower.find(keyword)
+                while start != -1:
+                    spans.append((start, start + len(keyword), command))
+                    start = message_lower.find(keyword, start + 1)
+        
+        taken = []
+        for start, end, command in sorted(spans, key=lambda span: span[0] - span[1]):
+            if all(end <= other[0] or start >= other[1] for other in taken):
+                taken.append((start, end, command))
+        
+        commands = list(dict.fromkeys(command for _, _, command in sorted(taken)))[:MAX_INTENT_COMMANDS]
+        total = len(message_lower.strip()) or 1
+        return commands, sum(end - start for start, end, _ in taken) / total
+    
+    def _keyword_intent(self, commands: List[str], confidence: float) -> Dict:
+        return {
+            "has_intent": True,
+            "command": commands[0],
+            "commands": [{"command": command, "args": []} for command in commands],
+            "args": [],
+            "confidence": confidence,
+            "reply": None
+        }
+    
+    def _recognize_intent_with_keywords(
+        self,
+        message: str,
+        commands: Optional[List[str]] = None,
+        match: Optional[KeywordMatch] = None
+    ) -> Dict:
+        if commands is None:
+            commands, _ = self._keyword_commands(message)
+        if commands:
+            return self._keyword_intent(commands, 0.8)
+        if match is not None:
+            return self._keyword_intent([match.command], match.confidence)
         
         return {
             "has_intent": False,
@@ -202,57 +488,85 @@ class LLMClient:
 - mybets: 查看下注记录 (触发词: 我的下注记录)
 - help: 帮助 (触发词: 怎么用、使用说明)
 
+一条消息可能包含多个操作（如"看看余额和我的下注"），此时按出现顺序全部列在 commands 中，command 为第一个。
+
 输出要求：必须严格输出JSON格式：
 {
     "has_intent": true或false,
     "command": "命令名或null",
     "args": [],
+    "commands": [{"command": "命令名", "args": []}],
     "confidence": 0.0到1.0,
     "reply": "无意图时的简短回复"
 }
 
 示例：
-"比特币会涨到10万吗" → {"has_intent": false, "command": null, "args": [], "confidence": 0.9, "reply": null}
-"我要登录" → {"has_intent": true, "command": "login", "args": [], "confidence": 0.95, "reply": null}
-"有什么市场" → {"has_intent": true, "command": "markets", "args": [], "confidence": 0.9, "reply": null}
-"你好" → {"has_intent": false, "command": null, "args": [], "confidence": 0.9, "reply": "你好！我是MindBet预测市场助手，有什么可以帮你的吗？"}"""
+"比特币会涨到10万吗" → {"has_intent": false, "command": null, "args": [], "commands": [], "confidence": 0.9, "reply": null}
+"我要登录" → {"has_intent": true, "command": "login", "args": [], "commands": [{"command": "login", "args": []}], "confidence": 0.95, "reply": null}
+"看看余额和我的下注" → {"has_intent": true, "command": "balance", "args": [], "commands": [{"command": "balance", "args": []}, {"command": "mybets", "args": []}], "confidence": 0.9, "reply": null}
+"你好" → {"has_intent": false, "command": null, "args": [], "commands": [], "confidence": 0.9, "reply": "你好！我是MindBet预测市场助手，有什么可以帮你的吗？"}"""
             },
             {
                 "role": "user",
-                "content": message
+                "content": truncate_to_tokens(message, INTENT_MESSAGE_TOKENS)
             }
         ]
         
-        result = await self.chat(messages, temperature=0.3)
+        parser = IncrementalJSONParser()
+        malformed = False
         
-        try:
-            json_match = result
-            if "```json" in result:
-                json_match = result.split("```json")[1].split("```")[0]
-            elif "```" in result:
-                json_match = result.split("```")[1].split("```")[0]
-            
-            parsed = json.loads(json_match.strip())
+        async with aclosing(self.chat_stream(messages, temperature=0.3, endpoint="intent")) as stream:
+            async for delta in stream:
+                try:
+                    parser.feed(delta)
+                except json.JSONDecodeError:
+                    malformed = True
+                    continue
+                if parser.complete or (parser.has(*INTENT_EARLY_EXIT_KEYS) and parser.values.get("has_intent")):
+                    break
+        
+        if malformed:
+            parser.values.clear()
+            result = extract_json(parser.text, "{")
+            if isinstance(result, dict):
+                parser.values.update(result)
+        
+        if not parser.values:
+            raise ValueError("empty intent response")
+        
+        parsed = dict(parser.values)
+        
+        if "has_intent" not in parsed:
+            parsed["has_intent"] = False
+        if "command" not in parsed:
+            parsed["command"] = None
+        if "args" not in parsed:
+            parsed["args"] = []
+        if "confidence" not in parsed:
+            parsed["confidence"] = 0.0
+        if "reply" not in parsed:
+            parsed["reply"] = None
+        parsed["commands"] = self._normalize_commands(parsed)
+        if parsed["commands"] and not parsed["command"]:
+            parsed["command"] = parsed["commands"][0]["command"]
             
-            if "has_intent" not in parsed:
-                parsed["has_intent"] = False
-            if "command" not in parsed:
-                parsed["command"] = None
-            if "args" not in parsed:
-                parsed["args"] = []
-            if "confidence" not in parsed:
-                parsed["confidence"] = 0.0
-            if "reply" not in parsed:
-                parsed["reply"] = None
-                
-            return parsed
-        except json.JSONDecodeError:
-            return {
-                "has_intent": False,
-                "command": None,
-                "args": [],
-                "confidence": 0.0,
-                "reply": "抱歉，我没理解您的意思。输入 /help 查看可用命令。"
-            }
+        return parsed
+    
+    def _normalize_commands(self, parsed: Dict) -> List[Dict]:
+        commands = []
+        items = parsed.get("commands")
+        if not isinstance(items, list) or not items:
+            items = [{"command": parsed["command"], "args": parsed["args"]}] if parsed["command"] else []
+        for item in items:
+            if isinstance(item, str):
+                item = {"command": item, "args": []}
+            if not isinstance(item, dict) or not item.get("command"):
+                continue
+            args = item.get("args")
+            commands.append({
+                "command": str(item["command"]).lstrip("/"),
+                "args": [str(arg) for arg in args] if isinstance(args, list) else []
+            })
+        return commands[:MAX_INTENT_COMMANDS]
 
 llm_client = LLMClient()
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+import httpx
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CATALOG_PAGE_SIZE = 200
+CATALOG_TIMEOUT = 10.0
+CATALOG_EPOCH = "1970-01-01T00:00:00Z"
+
+MarketListener = Callable[[Dict], None]
+
+class MarketCatalog:
+    def __init__(self, base_url: str, refresh_interval: float, page_size: int = CATALOG_PAGE_SIZE):
+        self.base_url = base_url.rstrip("/")
+        self.refresh_interval = refresh_interval
+        self.page_size = page_size
+        self.markets: Dict[str, Dict] = {}
+        self._listeners: List[MarketListener] = []
+        self._updated_after = CATALOG_EPOCH
+        self._after_id = 0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.last_refresh: Optional[float] = None
+
+    def subscribe(self, listener: MarketListener):
+        self._listeners.append(listener)
+        for market in self.markets.values():
+            listener(market)
+
+    def _apply(self, market: Dict):
+        content_hash = market.get("content_hash")
+        if not content_hash:
+            return
+        self.markets[content_hash] = market
+        for listener in self._listeners:
+            listener(market)
+
+    async def _fetch_page(self, client: httpx.AsyncClient) -> List[Dict]:
+        response = await client.get(
+            f"{self.base_url}/api/v1/markets",
+            params={
+                "page_size": self.page_size,
+                "updated_after": self._updated_after,
+                "after_id": self._after_id
+            }
+        )
+        response.raise_for_status()
+        return (response.json().get("data") or {}).get("list") or []
+
+    async def refresh(self) -> int:
+        async with self._lock:
+            changed = 0
+
+            async with httpx.AsyncClient(timeout=CATALOG_TIMEOUT) as client:
+                while True:
+                    items = await self._fetch_page(client)
+                    for market in items:
+                        self._apply(market)
+                    changed += len(items)
+                    if items:
+                        self._updated_after = items[-1]["updated_at"]
+                        self._after_id = items[-1]["id"]
+                    if len(items) < self.page_size:
+                        break
+
+            self.refreshes += 1
+            self.last_refresh = time.time()
+            return changed
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"Market catalog refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict:
+        return {
+            "markets": len(self.markets),
+            "cursor": [self._updated_after, self._after_id],
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "last_refresh": self.last_refresh
+        }
+
+market_catalog = MarketCatalog(
+    base_url=settings.BACKEND_API_URL,
+    refresh_interval=settings.MARKET_REFRESH_INTERVAL
+)
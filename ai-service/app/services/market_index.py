@@ -0,0 +1,126 @@
+import time
+from typing import Dict, Iterable, List, Optional, Set
+from app.services.market_catalog import market_catalog
+from app.services.minhash import LSHIndex, jaccard, ngrams
+from app.services.preprocess import normalize
+
+SHINGLE_SIZE = 2
+SIGNATURE_BINS = 16
+BAND_ROWS = 2
+TOPIC_DUPLICATE_THRESHOLD = 0.6
+LIVE_MARKET_STATUSES = {0, 1}
+
+def market_shingles(*parts: str) -> Set[str]:
+    return ngrams(normalize(" ".join(part for part in parts if part)), SHINGLE_SIZE)
+
+class MarketMatch:
+    __slots__ = ("content_hash", "title", "score")
+
+    def __init__(self, content_hash: str, title: str, score: float):
+        self.content_hash = content_hash
+        self.title = title
+        self.score = score
+
+    def to_dict(self) -> Dict:
+        return {"content_hash": self.content_hash, "title": self.title, "score": round(self.score, 3)}
+
+class _IndexedMarket:
+    __slots__ = ("title", "title_shingles", "shingles")
+
+    def __init__(self, title: str, title_shingles: Set[str], shingle_set: Set[str]):
+        self.title = title
+        self.title_shingles = title_shingles
+        self.shingles = shingle_set
+
+class MarketDuplicateIndex:
+    def __init__(self, bins: int = SIGNATURE_BINS, rows: int = BAND_ROWS):
+        self._markets: Dict[str, _IndexedMarket] = {}
+        self._titles = LSHIndex(bins, rows)
+        self._documents = LSHIndex(bins, rows)
+        self.queries = 0
+        self.duplicates = 0
+        self.query_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._markets)
+
+    def upsert(self, market: Dict):
+        content_hash = market.get("content_hash")
+        if not content_hash:
+            return
+        if market.get("status") not in LIVE_MARKET_STATUSES:
+            self.remove(content_hash)
+            return
+
+        title = market.get("title") or ""
+        title_shingles = market_shingles(title)
+        shingle_set = market_shingles(title, market.get("description") or "")
+        if shingle_set == title_shingles:
+            shingle_set = title_shingles
+        self._markets[content_hash] = _IndexedMarket(title, title_shingles, shingle_set)
+        self._titles.add(content_hash, title_shingles)
+        self._documents.add(content_hash, shingle_set)
+
+    def remove(self, content_hash: str):
+        if self._markets.pop(content_hash, None) is not None:
+            self._titles.remove(content_hash)
+            self._documents.remove(content_hash)
+
+    def query(self, title: str, description: str = "") -> Optional[MarketMatch]:
+        started = time.perf_counter()
+        title_shingles = market_shingles(title)
+        shingle_set = market_shingles(title, description) if description else title_shingles
+
+        best: Optional[MarketMatch] = None
+        best_score = 0.0
+        candidates = self._titles.candidates(title_shingles)
+        if shingle_set != title_shingles:
+            candidates |= self._documents.candidates(shingle_set)
+        for content_hash in candidates:
+            market = self._markets[content_hash]
+            score = jaccard(title_shingles, market.title_shingles)
+            if market.shingles is not market.title_shingles or shingle_set is not title_shingles:
+                score = max(score, jaccard(shingle_set, market.shingles))
+            if score > best_score:
+                best_score = score
+                best = MarketMatch(content_hash, market.title, score)
+
+        self.queries += 1
+        self.query_seconds += time.perf_counter() - started
+        return best
+
+    def filter_topics(
+        self,
+        topics: Iterable[Dict],
+        threshold: float = TOPIC_DUPLICATE_THRESHOLD
+    ) -> List[Dict]:
+        kept: List[Dict] = []
+        accepted: List[Set[str]] = []
+
+        for topic in topics:
+            match = self.query(topic["question"], topic.get("description", ""))
+            title_shingles = market_shingles(topic["question"])
+            if (match is not None and match.score >= threshold) or any(
+                jaccard(title_shingles, other) >= threshold for other in accepted
+            ):
+                self.duplicates += 1
+                continue
+
+            accepted.append(title_shingles)
+            kept.append({
+                **topic,
+                "similarity": round(match.score, 3) if match else 0.0,
+                "similar_market": match.to_dict() if match else None
+            })
+        return kept
+
+    def snapshot(self) -> Dict:
+        return {
+            "markets": len(self._markets),
+            "queries": self.queries,
+            "duplicates": self.duplicates,
+            "avg_query_us": round(self.query_seconds / max(1, self.queries) * 1_000_000, 1)
+        }
+
+market_index = MarketDuplicateIndex()
+market_catalog.subscribe(market_index.upsert)
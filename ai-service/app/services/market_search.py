@@ -0,0 +1,209 @@
+import heapq
+import math
+import re
+import time
+import unicodedata
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from app.services.market_catalog import market_catalog
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELD_WEIGHTS = {"title": 3, "category": 2, "description": 1}
+MAX_QUERY_TERMS = 32
+MAX_SEARCH_LIMIT = 50
+REWEIGHT_DRIFT = 0.1
+RESULT_FIELDS = (
+    "id", "content_hash", "title", "category", "deadline", "status",
+    "total_yes_pool", "total_no_pool"
+)
+
+_TOKEN_RE = re.compile(
+    "([\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\U00020000-\U0002fa1f]+)|([a-z0-9]+)"
+)
+
+def tokenize(text: str) -> List[str]:
+    tokens: List[str] = []
+    for wide, word in _TOKEN_RE.findall(unicodedata.normalize("NFKC", text).lower()):
+        if word:
+            tokens.append(word)
+        elif len(wide) == 1:
+            tokens.append(wide)
+        else:
+            tokens.extend(wide[i:i + 2] for i in range(len(wide) - 1))
+    return tokens
+
+class _Document:
+    __slots__ = ("market", "length", "terms")
+
+    def __init__(self, market: Dict, length: int, terms: Dict[str, int]):
+        self.market = market
+        self.length = length
+        self.terms = terms
+
+class MarketSearchIndex:
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._documents: Dict[str, _Document] = {}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._max_impact: Dict[str, float] = {}
+        self._statuses: Dict[str, Optional[int]] = {}
+        self._total_length = 0
+        self._weighted_length = 0.0
+        self.queries = 0
+        self.reweights = 0
+        self.scored = 0
+        self.query_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _terms(self, market: Dict) -> Dict[str, int]:
+        terms: Dict[str, int] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(str(market.get(field) or "")):
+                terms[token] = terms.get(token, 0) + weight
+        return terms
+
+    def _index(self, content_hash: str, document: _Document):
+        k1 = self.k1
+        norm = k1 * (1 - self.b + self.b * document.length / self._weighted_length)
+        postings = self._postings
+        max_impact = self._max_impact
+        for term, frequency in document.terms.items():
+            impact = frequency * (k1 + 1) / (frequency + norm)
+            bucket = postings.get(term)
+            if bucket is None:
+                bucket = postings[term] = {}
+            bucket[content_hash] = impact
+            if impact > max_impact.get(term, 0.0):
+                max_impact[term] = impact
+
+    def _reweight(self):
+        self._weighted_length = self._total_length / len(self._documents)
+        self._max_impact.clear()
+        for content_hash, document in self._documents.items():
+            self._index(content_hash, document)
+        self.reweights += 1
+
+    def _maybe_reweight(self):
+        count = len(self._documents)
+        if count and abs(self._total_length / count - self._weighted_length) > REWEIGHT_DRIFT * self._weighted_length:
+            self._reweight()
+
+    def upsert(self, market: Dict):
+        content_hash = market.get("content_hash")
+        if not content_hash:
+            return
+        self._remove(content_hash)
+
+        terms = self._terms(market)
+        document = _Document(
+            {field: market.get(field) for field in RESULT_FIELDS},
+            max(1, sum(terms.values())),
+            terms
+        )
+        self._documents[content_hash] = document
+        self._statuses[content_hash] = market.get("status")
+        self._total_length += document.length
+        if not self._weighted_length:
+            self._weighted_length = float(document.length)
+        self._index(content_hash, document)
+        self._maybe_reweight()
+
+    def remove(self, content_hash: str):
+        self._remove(content_hash)
+        self._maybe_reweight()
+
+    def _remove(self, content_hash: str):
+        document = self._documents.pop(content_hash, None)
+        if document is None:
+            return
+        del self._statuses[content_hash]
+        self._total_length -= document.length
+        for term in document.terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(content_hash, None)
+            if not postings:
+                del self._postings[term]
+                self._max_impact.pop(term, None)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        statuses: Optional[Sequence[int]] = None
+    ) -> List[Dict]:
+        started = time.perf_counter()
+        count = len(self._documents)
+        if not count or limit <= 0:
+            return []
+
+        weighted_terms = []
+        for term in list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]:
+            postings = self._postings.get(term)
+            if postings:
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                weighted_terms.append((idf * self._max_impact[term], idf, postings))
+        weighted_terms.sort(key=itemgetter(0), reverse=True)
+
+        tail_bounds = [0.0] * (len(weighted_terms) + 1)
+        for index in range(len(weighted_terms) - 1, -1, -1):
+            tail_bounds[index] = tail_bounds[index + 1] + weighted_terms[index][0]
+
+        allowed = set(statuses) if statuses is not None else None
+        document_statuses = self._statuses
+        top: List[Tuple[float, str]] = []
+        threshold = 0.0
+        visited: Set[str] = set()
+        for essential, (_, _, postings) in enumerate(weighted_terms):
+            if len(top) == limit and tail_bounds[essential] <= threshold:
+                break
+            for content_hash in postings:
+                if content_hash in visited:
+                    continue
+                visited.add(content_hash)
+                if allowed is not None and document_statuses[content_hash] not in allowed:
+                    continue
+
+                score = 0.0
+                for index in range(essential, len(weighted_terms)):
+                    _, idf, term_postings = weighted_terms[index]
+                    impact = term_postings.get(content_hash)
+                    if impact is not None:
+                        score += idf * impact
+                    if len(top) == limit and score + tail_bounds[index + 1] <= threshold:
+                        break
+                else:
+                    if len(top) < limit:
+                        heapq.heappush(top, (score, content_hash))
+                    elif score > threshold:
+                        heapq.heapreplace(top, (score, content_hash))
+                    if len(top) == limit:
+                        threshold = top[0][0]
+
+        ranked = sorted(top, key=itemgetter(0), reverse=True)
+
+        self.queries += 1
+        self.scored += len(visited)
+        self.query_seconds += time.perf_counter() - started
+        return [
+            {**self._documents[content_hash].market, "score": round(score, 4)}
+            for score, content_hash in ranked
+        ]
+
+    def snapshot(self) -> Dict:
+        return {
+            "markets": len(self._documents),
+            "terms": len(self._postings),
+            "queries": self.queries,
+            "reweights": self.reweights,
+            "avg_scored": round(self.scored / max(1, self.queries), 1),
+            "avg_query_ms": round(self.query_seconds / max(1, self.queries) * 1000, 3)
+        }
+
+market_search = MarketSearchIndex()
+market_catalog.subscribe(market_search.upsert)
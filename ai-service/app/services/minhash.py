@@ -0,0 +1,73 @@
+import zlib
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+EMPTY_BIN = 0xFFFFFFFF
+
+Band = Tuple[int, Tuple[int, ...]]
+
+def ngrams(text: str, size: int) -> Set[str]:
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+def signature(shingle_set: Iterable[str], bins: int) -> List[int]:
+    values = [EMPTY_BIN] * bins
+    for shingle in shingle_set:
+        value = zlib.crc32(shingle.encode("utf-8"))
+        index = value % bins
+        if value < values[index]:
+            values[index] = value
+    return values
+
+def bands(values: List[int], rows: int) -> List[Band]:
+    result = []
+    for start in range(0, len(values), rows):
+        band = tuple(values[start:start + rows])
+        if all(value == EMPTY_BIN for value in band):
+            continue
+        result.append((start, band))
+    return result
+
+def jaccard(left: Set[str], right: Set[str]) -> float:
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+class LSHIndex:
+    def __init__(self, bins: int, rows: int):
+        self.bins = bins
+        self.rows = rows
+        self._buckets: Dict[Band, Set[Hashable]] = {}
+        self._bands: Dict[Hashable, List[Band]] = {}
+
+    def __len__(self) -> int:
+        return len(self._bands)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._bands
+
+    def bands_for(self, shingle_set: Iterable[str]) -> List[Band]:
+        return bands(signature(shingle_set, self.bins), self.rows)
+
+    def add(self, key: Hashable, shingle_set: Iterable[str]):
+        self.remove(key)
+        key_bands = self.bands_for(shingle_set)
+        self._bands[key] = key_bands
+        for band in key_bands:
+            self._buckets.setdefault(band, set()).add(key)
+
+    def remove(self, key: Hashable):
+        for band in self._bands.pop(key, ()):
+            bucket = self._buckets.get(band)
+            if bucket is None:
+                continue
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band]
+
+    def candidates(self, shingle_set: Iterable[str]) -> Set[Hashable]:
+        found: Set[Hashable] = set()
+        for band in self.bands_for(shingle_set):
+            found.update(self._buckets.get(band, ()))
+        return found
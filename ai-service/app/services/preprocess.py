@@ -0,0 +1,140 @@
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Set
+from app.services.minhash import Band, bands, jaccard, ngrams, signature
+
+SHINGLE_SIZE = 3
+SIGNATURE_BINS = 16
+BAND_ROWS = 2
+DUPLICATE_THRESHOLD = 0.8
+MIN_INFORMATIVE_CHARS = 2
+
+_SPEAKER_RE = re.compile(r"^([^:：\n]{1,32})[:：]\s*(.*)$", re.S)
+_STICKER_RE = re.compile(r"^[\[【(（][^\]】)）]{1,12}[\]】)）]$")
+_LAUGHTER_RE = re.compile(r"^(?:[哈呵嘿嘻嘎hHaA]+|[lL][oO][lL]+|2333*|666+|w{2,}|[xX][dD]+)$")
+_NOISE_WORDS = {
+    "好", "好的", "嗯", "嗯嗯", "哦", "哦哦", "噢", "啊", "对", "对对", "对的", "是", "是的",
+    "ok", "okay", "收到", "在", "在吗", "+1", "1", "顶", "赞", "牛", "牛逼", "nb", "确实",
+    "可以", "行", "谢谢", "thx", "thanks", "早", "晚安", "?", "？",
+}
+_SIGNAL_CHARS = {"涨", "跌", "赢", "输", "买", "卖", "多", "空", "冲", "平", "稳", "崩", "赌", "押"}
+
+class PreprocessStats:
+    def __init__(self):
+        self.input = 0
+        self.noise = 0
+        self.commands = 0
+        self.collapsed = 0
+
+    def record_collapse(self, before: int, after: int):
+        self.collapsed += before - after
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "input": self.input,
+            "noise": self.noise,
+            "commands": self.commands,
+            "collapsed": self.collapsed,
+            "kept": self.input - self.noise - self.commands - self.collapsed
+        }
+
+preprocess_stats = PreprocessStats()
+
+def _body(message: str) -> str:
+    match = _SPEAKER_RE.match(message)
+    return match.group(2) if match else message
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).lower()
+    return "".join(
+        char for char in text
+        if not unicodedata.category(char).startswith(("P", "S", "Z", "C"))
+    )
+
+def is_command(message: str) -> bool:
+    return _body(message).lstrip().startswith("/")
+
+def is_low_information(message: str) -> bool:
+    body = _body(message).strip()
+    if _STICKER_RE.match(body):
+        return True
+    compact = normalize(body)
+    if len(compact) < MIN_INFORMATIVE_CHARS:
+        return compact not in _SIGNAL_CHARS
+    return compact in _NOISE_WORDS or bool(_LAUGHTER_RE.match(compact))
+
+def drop_noise(messages: Sequence[str]) -> List[str]:
+    kept = []
+    for message in messages:
+        if not message or not message.strip():
+            continue
+        preprocess_stats.input += 1
+        if is_command(message):
+            preprocess_stats.commands += 1
+        elif is_low_information(message):
+            preprocess_stats.noise += 1
+        else:
+            kept.append(message)
+    return kept
+
+def shingles(text: str) -> Set[str]:
+    compact = normalize(_body(text))
+    return ngrams(compact, SHINGLE_SIZE) or {compact}
+
+class _Cluster:
+    __slots__ = ("text", "shingles", "count", "first", "last")
+
+    def __init__(self, text: str, shingle_set: Set[str], index: int):
+        self.text = text
+        self.shingles = shingle_set
+        self.count = 1
+        self.first = index
+        self.last = index
+
+def collapse_duplicates(
+    messages: Sequence[str],
+    threshold: float = DUPLICATE_THRESHOLD,
+    order_by_last: bool = True
+) -> List[str]:
+    clusters: List[_Cluster] = []
+    buckets: Dict[Band, List[int]] = {}
+
+    for index, message in enumerate(messages):
+        shingle_set = shingles(message)
+        message_bands = bands(signature(shingle_set, SIGNATURE_BINS), BAND_ROWS)
+
+        match: Optional[_Cluster] = None
+        seen: Set[int] = set()
+        for band in message_bands:
+            for cluster_id in buckets.get(band, ()):
+                if cluster_id in seen:
+                    continue
+                seen.add(cluster_id)
+                if jaccard(shingle_set, clusters[cluster_id].shingles) >= threshold:
+                    match = clusters[cluster_id]
+                    break
+            if match is not None:
+                break
+
+        if match is not None:
+            match.count += 1
+            match.last = index
+            continue
+
+        cluster_id = len(clusters)
+        clusters.append(_Cluster(message, shingle_set, index))
+        for band in message_bands:
+            buckets.setdefault(band, []).append(cluster_id)
+
+    if order_by_last:
+        clusters.sort(key=lambda cluster: cluster.last)
+    return [
+        f"{cluster.text} (×{cluster.count})" if cluster.count > 1 else cluster.text
+        for cluster in clusters
+    ]
+
+def preprocess_messages(messages: Sequence[str]) -> List[str]:
+    kept = drop_noise(messages)
+    collapsed = collapse_duplicates(kept)
+    preprocess_stats.record_collapse(len(kept), len(collapsed))
+    return collapsed
@@ -0,0 +1,195 @@
+import math
+import re
+from typing import Dict, List, Optional, Sequence
+
+PROMPT_BUDGETS = {
+    "chat": 3000,
+    "intent": 1000,
+    "hot_events": 1000,
+    "topics": 4000,
+    "summarize": 6000,
+    "summarize_chunk": 3000,
+    "feedback": 1000,
+}
+
+MAX_ITEM_TOKENS = 300
+MESSAGE_OVERHEAD_TOKENS = 4
+ASCII_CHARS_PER_TOKEN = 4
+TRUNCATION_MARK = "…"
+
+_WIDE_CHAR_RE = re.compile(
+    "[\u2e80-\u303f\u3040-\u30ff\u3100-\u31ff\u3400-\u4dbf\u4e00-\u9fff"
+    "\uac00-\ud7af\uf900-\ufaff\ufe30-\ufe4f\uff00-\uffef\U00020000-\U0002fa1f]"
+)
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    wide = len(_WIDE_CHAR_RE.findall(text))
+    return wide + math.ceil((len(text) - wide) / ASCII_CHARS_PER_TOKEN)
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    budget = max(0, max_tokens - estimate_tokens(TRUNCATION_MARK))
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low] + TRUNCATION_MARK
+
+class PromptBlock:
+    __slots__ = ("text", "tokens", "included", "truncated", "dropped", "items")
+
+    def __init__(
+        self,
+        text: str,
+        tokens: int,
+        included: int,
+        truncated: int,
+        dropped: int,
+        items: Optional[List[str]] = None
+    ):
+        self.text = text
+        self.tokens = tokens
+        self.included = included
+        self.truncated = truncated
+        self.dropped = dropped
+        self.items = items
+
+def assemble_newest_first(
+    items: Sequence[str],
+    budget: int,
+    max_item_tokens: int = MAX_ITEM_TOKENS,
+    separator: str = "\n"
+) -> PromptBlock:
+    separator_tokens = estimate_tokens(separator)
+    selected: List[str] = []
+    used = 0
+    truncated = 0
+
+    for item in reversed(items):
+        item = item.strip()
+        if not item:
+            continue
+        item_tokens = estimate_tokens(item)
+        if item_tokens > max_item_tokens:
+            item = truncate_to_tokens(item, max_item_tokens)
+            item_tokens = estimate_tokens(item)
+            truncated += 1
+        cost = item_tokens + (separator_tokens if selected else 0)
+        if used + cost > budget:
+            break
+        selected.append(item)
+        used += cost
+
+    selected.reverse()
+    return PromptBlock(
+        text=separator.join(selected),
+        tokens=used,
+        included=len(selected),
+        truncated=truncated,
+        dropped=len(items) - len(selected)
+    )
+
+def chunk_by_tokens(
+    items: Sequence[str],
+    budget: int,
+    max_item_tokens: int = MAX_ITEM_TOKENS,
+    separator: str = "\n"
+) -> List[PromptBlock]:
+    separator_tokens = estimate_tokens(separator)
+    chunks: List[PromptBlock] = []
+    current: List[str] = []
+    used = 0
+    truncated = 0
+
+    for item in items:
+        item = item.strip()
+        if not item:
+            continue
+        item_tokens = estimate_tokens(item)
+        if item_tokens > max_item_tokens:
+            item = truncate_to_tokens(item, max_item_tokens)
+            item_tokens = estimate_tokens(item)
+            truncated += 1
+        cost = item_tokens + (separator_tokens if current else 0)
+        if current and used + cost > budget:
+            chunks.append(PromptBlock(separator.join(current), used, len(current), truncated, 0, current))
+            current, used, truncated = [], 0, 0
+            cost = item_tokens
+        current.append(item)
+        used += cost
+
+    if current:
+        chunks.append(PromptBlock(separator.join(current), used, len(current), truncated, 0, current))
+    return chunks
+
+def count_message_tokens(messages: Sequence[Dict[str, str]]) -> int:
+    return sum(
+        estimate_tokens(message.get("content") or "") + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
+
+def fit_messages(messages: List[Dict[str, str]], budget: int) -> List[Dict[str, str]]:
+    if count_message_tokens(messages) <= budget:
+        return messages
+
+    system = [message for message in messages if message.get("role") == "system"]
+    others = [message for message in messages if message.get("role") != "system"]
+    remaining = budget - count_message_tokens(system)
+
+    kept: List[Dict[str, str]] = []
+    for message in reversed(others):
+        cost = estimate_tokens(message.get("content") or "") + MESSAGE_OVERHEAD_TOKENS
+        if cost > remaining:
+            if not kept:
+                content = truncate_to_tokens(
+                    message.get("content") or "",
+                    max(0, remaining - MESSAGE_OVERHEAD_TOKENS)
+                )
+                kept.append({**message, "content": content})
+            break
+        kept.append(message)
+        remaining -= cost
+
+    kept.reverse()
+    return system + kept
+
+class PromptStats:
+    def __init__(self):
+        self._endpoints: Dict[str, Dict[str, int]] = {}
+
+    def _stats(self, endpoint: str) -> Dict[str, int]:
+        return self._endpoints.setdefault(endpoint, {
+            "requests": 0,
+            "total_tokens": 0,
+            "max_tokens": 0,
+            "truncated_items": 0,
+            "dropped_items": 0
+        })
+
+    def record(self, endpoint: str, tokens: int):
+        stats = self._stats(endpoint)
+        stats["requests"] += 1
+        stats["total_tokens"] += tokens
+        stats["max_tokens"] = max(stats["max_tokens"], tokens)
+
+    def record_block(self, endpoint: str, block: PromptBlock):
+        stats = self._stats(endpoint)
+        stats["truncated_items"] += block.truncated
+        stats["dropped_items"] += block.dropped
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        return {
+            endpoint: {
+                **stats,
+                "avg_tokens": stats["total_tokens"] // max(1, stats["requests"])
+            }
+            for endpoint, stats in self._endpoints.items()
+        }
+
+prompt_stats = PromptStats()
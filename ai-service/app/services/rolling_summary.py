@@ -0,0 +1,62 @@
+import asyncio
+import time
+import weakref
+from typing import Dict, List
+from app.config import settings
+from app.services.llm_client import llm_client
+from app.services.storage import store
+
+class RollingSummarizer:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self.updates = 0
+        self.unchanged = 0
+
+    def _key(self, chat_id: str) -> str:
+        return f"rolling-summary:{chat_id}"
+
+    def _lock(self, chat_id: str) -> asyncio.Lock:
+        lock = self._locks.get(chat_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[chat_id] = lock
+        return lock
+
+    async def get(self, chat_id: str) -> Dict:
+        state = await store.get(self._key(chat_id))
+        if state is None:
+            state = {"chat_id": chat_id, "summary": "", "message_count": 0, "updated_at": None}
+        return state
+
+    async def reset(self, chat_id: str):
+        await store.delete(self._key(chat_id))
+
+    async def update(self, chat_id: str, messages: List[str]) -> Dict:
+        messages = [message for message in messages if message.strip()]
+
+        async with self._lock(chat_id):
+            state = await self.get(chat_id)
+            if not messages:
+                self.unchanged += 1
+                return {**state, "new_messages": 0}
+
+            if state["summary"]:
+                summary = await llm_client.update_summary(state["summary"], messages)
+            else:
+                summary = await llm_client.summarize_discussions(messages)
+
+            state = {
+                "chat_id": chat_id,
+                "summary": summary,
+                "message_count": state["message_count"] + len(messages),
+                "updated_at": time.time()
+            }
+            await store.set(self._key(chat_id), state, self.ttl)
+            self.updates += 1
+            return {**state, "new_messages": len(messages)}
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"updates": self.updates, "unchanged": self.unchanged}
+
+rolling_summarizer = RollingSummarizer(settings.ROLLING_SUMMARY_TTL)
@@ -0,0 +1,171 @@
+import hashlib
+import re
+import time
+import unicodedata
+import zlib
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from app.config import settings
+from app.services.preprocess import normalize
+
+EMBEDDING_DIM = 128
+NGRAM_SIZES = (1, 2, 3)
+LATENCY_WINDOW = 1000
+
+TERM_ALIASES = {
+    "btc": "比特币",
+    "bitcoin": "比特币",
+    "eth": "以太坊",
+    "ethereum": "以太坊",
+    "trump": "特朗普",
+}
+FILLER_CHARS = set("吗呢吧啊呀嘛么了的得地会能要可是")
+POLARITY_BITS = {"up": 1, "down": 2, "win": 4, "lose": 8, "not": 16}
+POLARITY_TERMS = {
+    "up": ("涨", "升", "突破", "高于", "超过", "以上", "大于", "牛", "up", "above", "rise", "bull"),
+    "down": ("跌", "降", "低于", "以下", "小于", "崩", "熊", "down", "below", "fall", "bear"),
+    "win": ("赢", "胜", "夺冠", "晋级", "win", "beat"),
+    "lose": ("输", "败", "淘汰", "lose", "loss"),
+    "not": ("不", "没", "未", "别", "无", "非", "not", "no", "never"),
+}
+
+_WORD_RE = re.compile(r"[a-z]+")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_CHOICE_RE = re.compile(r"(.)[\u4e0d\u6ca1]\1")
+_POLARITY_WORDS = {term: label for label, terms in POLARITY_TERMS.items() for term in terms if term.isascii()}
+_POLARITY_RE = re.compile("|".join(
+    f"(?P<{label}>{'|'.join(sorted((term for term in terms if not term.isascii()), key=len, reverse=True))})"
+    for label, terms in POLARITY_TERMS.items()
+))
+_DIRECTION_WORDS = {term for term, label in _POLARITY_WORDS.items() if label != "not"}
+_DIRECTION_RE = re.compile("|".join(sorted(
+    (term for label, terms in POLARITY_TERMS.items() if label != "not" for term in terms if not term.isascii()),
+    key=len, reverse=True
+)))
+
+def canonicalize(text: str) -> str:
+    text = _WORD_RE.sub(
+        lambda match: "" if match.group() in _DIRECTION_WORDS else TERM_ALIASES.get(match.group(), match.group()),
+        unicodedata.normalize("NFKC", text).lower()
+    )
+    text = _DIRECTION_RE.sub("", _CHOICE_RE.sub(r"\1", text))
+    return "".join(char for char in normalize(text) if char not in FILLER_CHARS)
+
+def polarity(text: str) -> int:
+    text = unicodedata.normalize("NFKC", text).lower()
+    labels = {_POLARITY_WORDS[word] for word in _WORD_RE.findall(text) if word in _POLARITY_WORDS}
+    labels.update(match.lastgroup for match in _POLARITY_RE.finditer(_CHOICE_RE.sub(r"\1", text)))
+    return sum(POLARITY_BITS[label] for label in labels)
+
+def opposite(mask: int) -> int:
+    return ((mask & 5) << 1) | ((mask & 10) >> 1)
+
+def compatible(masks: np.ndarray, mask: int) -> np.ndarray:
+    return ((masks & opposite(mask)) == 0) & ((masks & 16) == (mask & 16))
+
+def embed(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    vector = np.zeros(dim, dtype=np.float32)
+    compact = canonicalize(text)
+    for size in NGRAM_SIZES:
+        for i in range(len(compact) - size + 1):
+            value = zlib.crc32(compact[i:i + size].encode("utf-8"))
+            vector[value % dim] += 1.0 if value & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector
+
+def cache_partition(messages: Sequence[Dict[str, str]], *params) -> int:
+    digest = hashlib.blake2b(digest_size=8)
+    for message in messages[:-1]:
+        content = _NUMBER_RE.sub("#", unicodedata.normalize("NFKC", message.get("content") or ""))
+        digest.update(f"{message.get('role')}\0{content}\0".encode("utf-8"))
+    numbers = _NUMBER_RE.findall(unicodedata.normalize("NFKC", messages[-1].get("content") or ""))
+    digest.update(repr((sorted(numbers), params)).encode("utf-8"))
+    return int.from_bytes(digest.digest(), "big", signed=True)
+
+class SemanticCache:
+    def __init__(self, capacity: int, threshold: float, ttl: float, dim: int = EMBEDDING_DIM):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl = ttl
+        self.dim = dim
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._partitions = np.zeros(capacity, dtype=np.int64)
+        self._polarities = np.zeros(capacity, dtype=np.int8)
+        self._expires = np.zeros(capacity, dtype=np.float64)
+        self._used = np.zeros(capacity, dtype=np.float64)
+        self._values: List[Optional[str]] = [None] * capacity
+        self._size = 0
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._expires[:self._size] > time.monotonic()))
+
+    def get(self, partition: int, text: str) -> Optional[str]:
+        started = time.perf_counter()
+        value = None
+        if self._size:
+            now = time.monotonic()
+            scores = self._vectors[:self._size] @ embed(text, self.dim)
+            scores[
+                (self._partitions[:self._size] != partition)
+                | (self._expires[:self._size] <= now)
+                | ~compatible(self._polarities[:self._size], polarity(text))
+            ] = -1.0
+            slot = int(np.argmax(scores))
+            if scores[slot] >= self.threshold:
+                self._used[slot] = now
+                value = self._values[slot]
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self._latencies.append(time.perf_counter() - started)
+        return value
+
+    def _free_slot(self, now: float) -> int:
+        if self._size < self.capacity:
+            self._size += 1
+            return self._size - 1
+        slot = int(np.argmin(np.where(self._expires <= now, -np.inf, self._used)))
+        if self._expires[slot] > now:
+            self.evictions += 1
+        return slot
+
+    def put(self, partition: int, text: str, value: str):
+        now = time.monotonic()
+        slot = self._free_slot(now)
+        self._vectors[slot] = embed(text, self.dim)
+        self._partitions[slot] = partition
+        self._polarities[slot] = polarity(text)
+        self._expires[slot] = now + self.ttl
+        self._used[slot] = now
+        self._values[slot] = value
+        self.inserts += 1
+
+    def snapshot(self) -> Dict:
+        lookups = self.hits + self.misses
+        latencies = sorted(self._latencies)
+        return {
+            "entries": len(self),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "inserts": self.inserts,
+            "evictions": self.evictions,
+            "p99_lookup_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 3) if latencies else 0.0
+        }
+
+chat_cache = SemanticCache(
+    capacity=settings.CHAT_CACHE_CAPACITY,
+    threshold=settings.CHAT_CACHE_THRESHOLD,
+    ttl=settings.CHAT_CACHE_TTL
+)
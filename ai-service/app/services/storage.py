@@ -0,0 +1,75 @@
+import json
+import time
+from typing import Any, Dict, Optional, Tuple
+from app.config import settings
+
+PURGE_INTERVAL = 60.0
+
+class MemoryStore:
+    def __init__(self):
+        self._data: Dict[str, Tuple[Optional[float], Any]] = {}
+        self._last_purge = time.monotonic()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        now = time.monotonic()
+        self._data[key] = (now + ttl if ttl else None, value)
+        if now - self._last_purge >= PURGE_INTERVAL:
+            self._purge(now)
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def _purge(self, now: float):
+        expired = [
+            key for key, (expires_at, _) in self._data.items()
+            if expires_at is not None and expires_at <= now
+        ]
+        for key in expired:
+            del self._data[key]
+        self._last_purge = now
+
+class RedisStore:
+    def __init__(self, client, prefix: str = "mindbet:ai:"):
+        self._client = client
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(self._prefix + key)
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        await self._client.set(
+            self._prefix + key,
+            json.dumps(value, ensure_ascii=False),
+            ex=max(1, int(ttl)) if ttl else None
+        )
+
+    async def delete(self, key: str):
+        await self._client.delete(self._prefix + key)
+
+def create_store():
+    if settings.STORAGE_BACKEND == "redis":
+        import redis.asyncio as redis
+
+        client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD or None,
+            db=settings.REDIS_DB
+        )
+        return RedisStore(client)
+    return MemoryStore()
+
+store = create_store()
@@ -0,0 +1,36 @@
+import random
+import time
+from app.services.market_search import MarketSearchIndex
+from tests.test_market_search import WORDS, exhaustive, make_market
+
+DOCUMENTS = 100000
+QUERIES = 500
+
+def main():
+    rng = random.Random(5)
+    index = MarketSearchIndex()
+    started = time.perf_counter()
+    for i in range(DOCUMENTS):
+        index.upsert(make_market(rng, i))
+    build = time.perf_counter() - started
+
+    queries = ["".join(rng.choices(WORDS, k=rng.randint(1, 4))) for _ in range(QUERIES)]
+    started = time.perf_counter()
+    for query in queries:
+        index.search(query, limit=10)
+    maxscore = time.perf_counter() - started
+
+    started = time.perf_counter()
+    mismatches = 0
+    for query in queries:
+        expected = exhaustive(index, query, 10)
+        if [result["score"] for result in index.search(query, limit=10)] != expected:
+            mismatches += 1
+    full = time.perf_counter() - started - maxscore
+
+    print(f"documents={len(index)} build={build:.1f}s reweights={index.reweights}")
+    print(f"maxscore={maxscore / QUERIES * 1000:.2f}ms/query exhaustive={full / QUERIES * 1000:.2f}ms/query mismatches={mismatches}")
+    print(index.snapshot())
+
+if __name__ == "__main__":
+    main()
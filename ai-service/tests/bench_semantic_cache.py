@@ -0,0 +1,37 @@
+import random
+import time
+from app.services.semantic_cache import SemanticCache, cache_partition
+
+ENTRIES = 50000
+LOOKUPS = 2000
+SUBJECTS = ["比特币", "以太坊", "特斯拉", "英伟达", "黄金", "原油", "湖人", "阿根廷", "美联储", "特朗普"]
+PREDICATES = ["今年能涨到{n}万吗", "下周会跌破{n}千吗", "会赢下第{n}场吗", "第{n}季度会降息吗", "市值能超过{n}万亿吗"]
+
+def question(rng: random.Random) -> str:
+    return rng.choice(SUBJECTS) + rng.choice(PREDICATES).format(n=rng.randint(1, 500))
+
+def main():
+    rng = random.Random(3)
+    cache = SemanticCache(capacity=ENTRIES, threshold=0.85, ttl=3600.0)
+    stored = []
+    started = time.perf_counter()
+    for index in range(ENTRIES):
+        text = question(rng)
+        cache.put(cache_partition([{"role": "user", "content": text}]), text, str(index))
+        stored.append(text)
+    insert_us = (time.perf_counter() - started) / ENTRIES * 1e6
+
+    latencies = []
+    for _ in range(LOOKUPS):
+        text = rng.choice(stored) + "？" if rng.random() < 0.3 else question(rng)
+        started = time.perf_counter()
+        cache.get(cache_partition([{"role": "user", "content": text}]), text)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+
+    print(f"entries={len(cache)} insert={insert_us:.1f}us")
+    print(f"lookup p50={latencies[len(latencies) // 2] * 1000:.2f}ms p99={latencies[int(len(latencies) * 0.99)] * 1000:.2f}ms")
+    print(cache.snapshot())
+
+if __name__ == "__main__":
+    main()
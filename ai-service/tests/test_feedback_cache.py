@@ -0,0 +1,64 @@
+import pytest
+from app.services.feedback_cache import (
+    PNL_UNIT,
+    all_buckets,
+    describe_bucket,
+    feedback_bucket,
+    pnl_band,
+    streak_band,
+    win_rate_band
+)
+
+@pytest.mark.parametrize("win_bets, band", [
+    (0, "0-30"),
+    (29, "0-30"),
+    (30, "30-45"),
+    (44, "30-45"),
+    (45, "45-55"),
+    (54, "45-55"),
+    (55, "55-70"),
+    (69, "55-70"),
+    (70, "70-100"),
+    (100, "70-100"),
+])
+def test_win_rate_band_edges(win_bets, band):
+    assert win_rate_band(100, win_bets) == band
+
+@pytest.mark.parametrize("total_pnl, band", [
+    (0, "even"),
+    (PNL_UNIT - 1, "even"),
+    (-(PNL_UNIT - 1), "even"),
+    (PNL_UNIT, "gain"),
+    (-PNL_UNIT, "loss"),
+    (100 * PNL_UNIT - 1, "gain"),
+    (-(100 * PNL_UNIT - 1), "loss"),
+    (100 * PNL_UNIT, "gain_large"),
+    (-100 * PNL_UNIT, "loss_large"),
+])
+def test_pnl_band_edges(total_pnl, band):
+    assert pnl_band(total_pnl) == band
+
+@pytest.mark.parametrize("recent, band", [
+    (["win", "win", "win"], "win_streak"),
+    (["lose", "lose", "lose"], "loss_streak"),
+    (["lose", "win", "win", "win"], "win_streak"),
+    (["win", "lose", "lose", "lose"], "loss_streak"),
+    (["win", "win", "lose"], "mixed"),
+    (["win", "win"], "mixed"),
+    ([], "mixed"),
+])
+def test_streak_band_on_bot_results(recent, band):
+    assert streak_band(recent) == band
+
+def test_new_user_bucket_ignores_other_stats():
+    assert feedback_bucket(0, 0, 0, []) == "new|even|mixed"
+    assert feedback_bucket(0, 0, -500 * PNL_UNIT, ["lose", "lose", "lose"]) == "new|even|mixed"
+
+def test_bucket_is_deterministic_and_enumerated():
+    bucket = feedback_bucket(20, 15, 150 * PNL_UNIT, ["lose", "win", "win", "win"])
+    assert bucket == "70-100|gain_large|win_streak"
+    assert bucket == feedback_bucket(20, 15, 150 * PNL_UNIT, ["lose", "win", "win", "win"])
+    assert bucket in all_buckets()
+    assert len(set(all_buckets())) == len(all_buckets())
+    for each in all_buckets():
+        assert describe_bucket(each)
@@ -0,0 +1,80 @@
+import math
+import random
+import pytest
+from app.services.market_search import MarketSearchIndex, tokenize
+
+WORDS = [
+    "比特币", "以太坊", "美联储", "降息", "世界杯", "冠军", "选举", "总统", "油价", "黄金",
+    "苹果", "特斯拉", "英伟达", "财报", "涨到", "跌破", "突破", "年底", "本周", "今年",
+    "bitcoin", "eth", "fed", "nba", "gpt", "openai", "spacex", "launch", "price", "rate",
+]
+CATEGORIES = ["crypto", "sports", "politics", "finance", "tech"]
+
+def make_market(rng: random.Random, index: int) -> dict:
+    common = rng.choices(WORDS[:6], k=rng.randint(1, 3))
+    rare = rng.choices(WORDS, k=rng.randint(1, 5))
+    return {
+        "id": index,
+        "content_hash": f"{index:064x}",
+        "title": "".join(common + rare[:2]),
+        "category": rng.choice(CATEGORIES),
+        "description": " ".join(rng.choices(WORDS, k=rng.randint(0, 12))),
+        "status": rng.choice([0, 0, 0, 1, 2, 3]),
+    }
+
+def exhaustive(index: MarketSearchIndex, query: str, limit: int, statuses=None):
+    count = len(index)
+    scores = {}
+    for term in list(dict.fromkeys(tokenize(query)))[:32]:
+        postings = index._postings.get(term)
+        if not postings:
+            continue
+        idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+        for content_hash, impact in postings.items():
+            if statuses is None or index._statuses[content_hash] in statuses:
+                scores[content_hash] = scores.get(content_hash, 0.0) + idf * impact
+    return sorted((round(score, 4) for score in scores.values()), reverse=True)[:limit]
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = random.Random(7)
+    index = MarketSearchIndex()
+    for i in range(3000):
+        index.upsert(make_market(rng, i))
+    for i in range(0, 3000, 11):
+        index.remove(f"{i:064x}")
+    return index
+
+def test_matches_exhaustive_bm25(corpus):
+    rng = random.Random(11)
+    for _ in range(300):
+        query = "".join(rng.choices(WORDS, k=rng.randint(1, 4)))
+        limit = rng.choice([1, 5, 10, 50])
+        statuses = rng.choice([None, [0], [1, 2]])
+        results = corpus.search(query, limit=limit, statuses=statuses)
+        assert [result["score"] for result in results] == exhaustive(corpus, query, limit, statuses)
+        if statuses is not None:
+            assert all(result["status"] in statuses for result in results)
+
+def test_prunes_documents_for_common_terms(corpus):
+    query = "比特币以太坊美联储spacex"
+    matched = set()
+    for term in tokenize(query):
+        matched.update(corpus._postings.get(term, {}))
+    before = corpus.scored
+    corpus.search(query, limit=5)
+    assert corpus.scored - before < len(matched)
+
+def test_empty_and_unknown_queries(corpus):
+    assert corpus.search("", limit=5) == []
+    assert corpus.search("zzzzqqq", limit=5) == []
+    assert MarketSearchIndex().search("比特币") == []
+
+def test_reweight_happens_on_update_not_search():
+    index = MarketSearchIndex()
+    index.upsert({"content_hash": "a", "title": "比特币", "status": 0})
+    index.upsert({"content_hash": "b", "title": "比特币年底能涨到十万美元吗", "description": "加密 市场 " * 20, "status": 0})
+    reweights = index.reweights
+    assert reweights > 0
+    index.search("比特币")
+    assert index.reweights == reweights
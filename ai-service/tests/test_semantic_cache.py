@@ -0,0 +1,58 @@
+import pytest
+from app.config import settings
+from app.services.semantic_cache import POLARITY_BITS, SemanticCache, cache_partition, polarity
+
+SAME_MEANING = [
+    ("比特币今年能涨到10万美元吗", "比特币今年能涨到10万美元吗？"),
+    ("btc今年能涨到10万美元吗", "比特币今年能涨到10万美元吗"),
+    ("比特币能不能涨到10万美元", "比特币能涨到10万美元吗"),
+    ("以太坊会不会跌破2000", "以太坊会跌破2000吗"),
+    ("阿根廷会赢下决赛吗", "阿根廷能赢下决赛吗"),
+    ("Trump 会赢得大选吗", "特朗普会赢得大选吗"),
+    ("美联储下个月会降息吗", "美联储下个月会降息吗?"),
+    ("比特币会到10万吗", "比特币能涨到10万吗"),
+]
+
+DIFFERENT_MEANING = [
+    ("阿根廷会赢下决赛吗", "阿根廷会输掉决赛吗"),
+    ("湖人今晚会赢吗", "湖人今晚会输吗"),
+    ("比特币能不能涨到10万美元", "比特币能不能跌到10万美元"),
+    ("比特币今年会涨吗", "比特币今年会跌吗"),
+    ("比特币今年会涨吗", "比特币今年不会涨吗"),
+    ("油价会高于80美元吗", "油价会低于80美元吗"),
+    ("特朗普能赢得大选吗", "特朗普不能赢得大选吗"),
+    ("英伟达财报后会上涨吗", "英伟达财报后会下跌吗"),
+    ("比特币能涨到10万美元吗", "比特币能涨到20万美元吗"),
+    ("will btc rise above 100000", "will btc fall below 100000"),
+]
+
+def lookup(stored: str, asked: str):
+    cache = SemanticCache(capacity=16, threshold=settings.CHAT_CACHE_THRESHOLD, ttl=60.0)
+    cache.put(cache_partition([{"role": "user", "content": stored}], 0.7, None), stored, "answer")
+    return cache.get(cache_partition([{"role": "user", "content": asked}], 0.7, None), asked)
+
+@pytest.mark.parametrize("stored,asked", SAME_MEANING)
+def test_paraphrases_hit(stored, asked):
+    assert lookup(stored, asked) == "answer"
+    assert lookup(asked, stored) == "answer"
+
+@pytest.mark.parametrize("stored,asked", DIFFERENT_MEANING)
+def test_opposite_questions_miss(stored, asked):
+    assert lookup(stored, asked) is None
+    assert lookup(asked, stored) is None
+
+def test_choice_questions_are_not_negations():
+    assert polarity("比特币能不能涨") == polarity("比特币能涨吗") == POLARITY_BITS["up"]
+    assert polarity("会不会跌破") == POLARITY_BITS["down"]
+    assert polarity("比特币不会涨") == POLARITY_BITS["not"] | POLARITY_BITS["up"]
+
+def test_partition_separates_history_and_params():
+    question = {"role": "user", "content": "比特币会涨吗"}
+    assert cache_partition([question], 0.7, None) != cache_partition([question], 0.2, None)
+    assert cache_partition([{"role": "system", "content": "a"}, question]) != cache_partition([question])
+
+def test_partition_ignores_live_numbers_in_context():
+    question = {"role": "user", "content": "比特币今年会涨吗"}
+    before = {"role": "system", "content": "- 比特币年底破10万 | YES 62% / NO 38% | 奖池 3.10 MON | 截止 12-31"}
+    after = {"role": "system", "content": "- 比特币年底破10万 | YES 64% / NO 36% | 奖池 3.52 MON | 截止 12-31"}
+    assert cache_partition([before, question], 0.7) == cache_partition([after, question], 0.7)
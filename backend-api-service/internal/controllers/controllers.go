@@ -3,6 +3,7 @@ package controllers
 import (
 	"net/http"
 	"strconv"
+	"time"
 
 	"mindbet-backend/internal/models"
 	"mindbet-backend/internal/services"
@@ -24,8 +25,19 @@ func GetMarketList(c *gin.Context) {
 	pageSize, _ := strconv.Atoi(c.DefaultQuery("page_size", "12"))
 	status := c.Query("status")
 	category := c.Query("category")
+	afterID, _ := strconv.ParseUint(c.DefaultQuery("after_id", "0"), 10, 64)
+
+	var updatedAfter *time.Time
+	if raw := c.Query("updated_after"); raw != "" {
+		parsed, err := time.Parse(time.RFC3339Nano, raw)
+		if err != nil {
+			c.JSON(http.StatusBadRequest, gin.H{"error": "invalid updated_after"})
+			return
+		}
+		updatedAfter = &parsed
+	}
 
-	markets, total, err := services.GetMarketList(page, pageSize, status, category)
+	markets, total, err := services.GetMarketList(page, pageSize, status, category, updatedAfter, afterID)
 	if err != nil {
 		c.JSON(http.StatusInternalServerError, gin.H{"error": err.Error()})
 		return
@@ -176,7 +188,23 @@ func PrepareClaim(c *gin.Context) {
 }
 
 func GetUserBets(c *gin.Context) {
-	c.JSON(http.StatusOK, gin.H{"success": true, "data": []interface{}{}})
+	contentHash := c.Param("id")
+	userAddress := c.Query("user_address")
+	if userAddress == "" {
+		c.JSON(http.StatusBadRequest, gin.H{"error": "user_address is required"})
+		return
+	}
+
+	result, err := services.GetUserBets(contentHash, userAddress)
+	if err != nil {
+		c.JSON(http.StatusInternalServerError, gin.H{"error": err.Error()})
+		return
+	}
+
+	c.JSON(http.StatusOK, gin.H{
+		"success": true,
+		"data":    result,
+	})
 }
 
 func GetUserProfile(c *gin.Context) {
@@ -4,6 +4,7 @@ import (
 	"net/http"
 	"strconv"
 
+	"mindbet-backend/internal/models"
 	"mindbet-backend/internal/services"
 
 	"github.com/gin-gonic/gin"
@@ -164,7 +165,17 @@ func GetResolvedMarkets(c *gin.Context) {
 	page, _ := strconv.Atoi(c.DefaultQuery("page", "1"))
 	pageSize, _ := strconv.Atoi(c.DefaultQuery("page_size", "10"))
 
-	markets, total, err := services.GetResolvedMarkets(page, pageSize)
+	status := models.MarketStatusResolved
+	switch c.DefaultQuery("status", "resolved") {
+	case "resolved":
+	case "cancelled":
+		status = models.MarketStatusCancelled
+	default:
+		c.JSON(http.StatusBadRequest, gin.H{"success": false, "error": "无效的 status"})
+		return
+	}
+
+	markets, total, err := services.GetResolvedMarkets(page, pageSize, status)
 	if err != nil {
 		c.JSON(http.StatusInternalServerError, gin.H{"success": false, "error": err.Error()})
 		return
@@ -181,6 +192,60 @@ func GetResolvedMarkets(c *gin.Context) {
 	})
 }
 
+func GetMarketRecipients(c *gin.Context) {
+	contentHash := c.Query("content_hash")
+	if contentHash == "" {
+		c.JSON(http.StatusBadRequest, gin.H{"success": false, "error": "缺少 content_hash 参数"})
+		return
+	}
+
+	page, _ := strconv.Atoi(c.DefaultQuery("page", "1"))
+	pageSize, _ := strconv.Atoi(c.DefaultQuery("page_size", "100"))
+
+	recipients, total, err := services.GetMarketRecipients(contentHash, page, pageSize)
+	if err != nil {
+		c.JSON(http.StatusInternalServerError, gin.H{"success": false, "error": err.Error()})
+		return
+	}
+
+	c.JSON(http.StatusOK, gin.H{
+		"success": true,
+		"data": gin.H{
+			"list":  recipients,
+			"total": total,
+			"page":  page,
+			"page_size": pageSize,
+		},
+	})
+}
+
+func ListTelegramUsers(c *gin.Context) {
+	afterID, err := strconv.ParseUint(c.DefaultQuery("after_id", "0"), 10, 64)
+	if err != nil {
+		c.JSON(http.StatusBadRequest, gin.H{"success": false, "error": "无效的 after_id"})
+		return
+	}
+
+	limit, _ := strconv.Atoi(c.DefaultQuery("limit", "100"))
+	if limit <= 0 || limit > 1000 {
+		limit = 100
+	}
+
+	users, total, err := services.ListTelegramUsers(afterID, limit)
+	if err != nil {
+		c.JSON(http.StatusInternalServerError, gin.H{"success": false, "error": err.Error()})
+		return
+	}
+
+	c.JSON(http.StatusOK, gin.H{
+		"success": true,
+		"data": gin.H{
+			"list":  users,
+			"total": total,
+		},
+	})
+}
+
 func GetWalletBalance(c *gin.Context) {
 	telegramIDStr := c.Query("telegram_id")
 	if telegramIDStr == "" {
@@ -7,7 +7,7 @@ import (
 	"mindbet-backend/internal/models"
 )
 
-func GetMarketList(page, pageSize int, status, category string) ([]models.Market, int64, error) {
+func GetMarketList(page, pageSize int, status, category string, updatedAfter *time.Time, afterID uint64) ([]models.Market, int64, error) {
 	var markets []models.Market
 	var total int64
 
@@ -20,12 +20,19 @@ func GetMarketList(page, pageSize int, status, category string) ([]models.Market
 		query = query.Where("category = ?", category)
 	}
 
+	order := "created_at DESC"
+	offset := (page - 1) * pageSize
+	if updatedAfter != nil {
+		query = query.Where("(updated_at > ? OR (updated_at = ? AND id > ?))", *updatedAfter, *updatedAfter, afterID)
+		order = "updated_at ASC, id ASC"
+		offset = 0
+	}
+
 	if err := query.Count(&total).Error; err != nil {
 		return nil, 0, err
 	}
 
-	offset := (page - 1) * pageSize
-	if err := query.Order("created_at DESC").Offset(offset).Limit(pageSize).Find(&markets).Error; err != nil {
+	if err := query.Order(order).Offset(offset).Limit(pageSize).Find(&markets).Error; err != nil {
 		return nil, 0, err
 	}
 
@@ -147,13 +154,21 @@ func GetUserBets(contentHash string, userAddress string) (map[string]interface{}
 		return nil, err
 	}
 
-	var totalAmount uint64
+	var totalAmount, yesAmount, noAmount uint64
+	var yesCount, noCount int
 	var betType *bool
 	for _, tx := range txs {
 		totalAmount += tx.Amount
 		if tx.Outcome != nil {
 			b := *tx.Outcome == 1
 			betType = &b
+			if b {
+				yesAmount += tx.Amount
+				yesCount++
+			} else {
+				noAmount += tx.Amount
+				noCount++
+			}
 		}
 	}
 
@@ -162,6 +177,10 @@ func GetUserBets(contentHash string, userAddress string) (map[string]interface{}
 		"user_address": userAddress,
 		"total_amount": totalAmount,
 		"bet_count":    len(txs),
+		"yes_amount":   yesAmount,
+		"yes_count":    yesCount,
+		"no_amount":    noAmount,
+		"no_count":     noCount,
 	}
 
 	if betType != nil {
@@ -347,9 +366,10 @@ func UpdateMarketStatus(contentHash string, status models.MarketStatus, result m
 	}
 
 	if status == models.MarketStatusResolved {
-		now := time.Now().Unix()
 		updates["result"] = result
-		updates["resolved_at"] = now
+	}
+	if status == models.MarketStatusResolved || status == models.MarketStatusCancelled {
+		updates["resolved_at"] = time.Now().Unix()
 	}
 
 	return models.DB.Model(&models.Market{}).
@@ -91,21 +91,21 @@ func GetRefundableMarkets(walletAddress string) ([]models.Market, error) {
 	return markets, err
 }
 
-func GetResolvedMarkets(page, pageSize int) ([]models.Market, int64, error) {
+func GetResolvedMarkets(page, pageSize int, status models.MarketStatus) ([]models.Market, int64, error) {
 	var markets []models.Market
 	var total int64
 
 	offset := (page - 1) * pageSize
 
 	err := models.DB.Model(&models.Market{}).
-		Where("status = ?", models.MarketStatusResolved).
+		Where("status = ?", status).
 		Count(&total).Error
 	if err != nil {
 		return nil, 0, err
 	}
 
-	err = models.DB.Where("status = ?", models.MarketStatusResolved).
-		Order("resolved_at DESC").
+	err = models.DB.Where("status = ?", status).
+		Order("resolved_at DESC, id DESC").
 		Limit(pageSize).
 		Offset(offset).
 		Find(&markets).Error
@@ -113,6 +113,68 @@ func GetResolvedMarkets(page, pageSize int) ([]models.Market, int64, error) {
 	return markets, total, err
 }
 
+type MarketRecipient struct {
+	TelegramID    int64  `json:"telegram_id"`
+	WalletAddress string `json:"wallet_address"`
+	Role          int8   `json:"role"`
+	BetOutcome    *int8  `json:"bet_outcome"`
+	BetAmount     uint64 `json:"bet_amount"`
+	DepositAmount uint64 `json:"deposit_amount"`
+}
+
+func GetMarketRecipients(contentHash string, page, pageSize int) ([]MarketRecipient, int64, error) {
+	var recipients []MarketRecipient
+	var total int64
+
+	offset := (page - 1) * pageSize
+
+	query := models.DB.Table("user_positions up").
+		Joins("INNER JOIN markets m ON m.content_hash = up.content_hash").
+		Joins("INNER JOIN telegram_users tu ON tu.wallet_address = up.user_address").
+		Where("up.content_hash = ?", contentHash).
+		Where(
+			models.DB.Where("m.status = ? AND up.role = ? AND up.bet_outcome = m.result AND up.has_claimed = ?",
+				models.MarketStatusResolved, models.PositionRoleBettor, false).
+				Or("m.status = ? AND up.has_refunded = ?", models.MarketStatusCancelled, false),
+		)
+
+	if err := query.Count(&total).Error; err != nil {
+		return nil, 0, err
+	}
+
+	err := query.
+		Select("tu.telegram_id, tu.wallet_address, up.role, up.bet_outcome, up.bet_amount, up.deposit_amount").
+		Order("up.id ASC").
+		Limit(pageSize).
+		Offset(offset).
+		Scan(&recipients).Error
+
+	return recipients, total, err
+}
+
+type TelegramRecipient struct {
+	ID         uint64 `json:"id"`
+	TelegramID int64  `json:"telegram_id"`
+}
+
+func ListTelegramUsers(afterID uint64, limit int) ([]TelegramRecipient, int64, error) {
+	var users []TelegramRecipient
+	var total int64
+
+	if err := models.DB.Model(&models.TelegramUser{}).Count(&total).Error; err != nil {
+		return nil, 0, err
+	}
+
+	err := models.DB.Model(&models.TelegramUser{}).
+		Select("id, telegram_id").
+		Where("id > ?", afterID).
+		Order("id ASC").
+		Limit(limit).
+		Scan(&users).Error
+
+	return users, total, err
+}
+
 func GetWalletBalance(walletAddress string) (string, error) {
 	balance, err := GetBalance(walletAddress)
 	if err != nil {
@@ -38,6 +38,8 @@ func SetupRoutes(r *gin.Engine) {
 			admin.POST("/markets/:id/cancel", controllers.CancelMarket)
 			admin.GET("/stats", controllers.GetStats)
 			admin.GET("/markets/pending", controllers.GetPendingMarkets)
+			admin.GET("/telegram/users", controllers.ListTelegramUsers)
+			admin.GET("/telegram/recipients", controllers.GetMarketRecipients)
 		}
 		telegram := api.Group("/telegram")
 		{
@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import os
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Set, Tuple
+from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+from bot.config import settings
+from bot.market_catalog import market_catalog
+from bot.sender import sender
+from bot.storage import load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+MARKET_ACTIVE = 0
+STORE_VERSION = 1
+MAX_NOTICE_ALERTS = 10
+
+ABOVE = "above"
+BELOW = "below"
+
+AlertKey = Tuple[str, str, float]
+Trigger = Tuple[float, int]
+
+def yes_odds(market: Dict) -> float:
+    yes_pool = int(market.get("total_yes_pool") or 0)
+    no_pool = int(market.get("total_no_pool") or 0)
+    total = yes_pool + no_pool
+    return yes_pool * 100 / total if total else 50.0
+
+def render_alerts(fired: List[Tuple[Dict, str, float, float]]) -> Tuple[str, InlineKeyboardMarkup]:
+    message = "📈 **赔率提醒**\n\n"
+    keyboard = []
+
+    for market, direction, threshold, odds in fired[:MAX_NOTICE_ALERTS]:
+        full_hash = market.get("content_hash", "")
+        content_hash = full_hash[:10]
+        arrow = "升至" if direction == ABOVE else "降至"
+        message += f"{'🟢' if direction == ABOVE else '🔴'} #{content_hash} {market.get('title', 'N/A')[:30]}\n"
+        message += f"   YES 概率{arrow} {odds:.1f}% (阈值 {threshold:g}%)\n\n"
+        keyboard.append([InlineKeyboardButton(f"#{content_hash}", callback_data=f"market_{full_hash}")])
+
+    if len(fired) > MAX_NOTICE_ALERTS:
+        message += f"…另有 {len(fired) - MAX_NOTICE_ALERTS} 条提醒已触发\n"
+
+    return message, InlineKeyboardMarkup(keyboard)
+
+class OddsAlertIndex:
+    def __init__(self, path: str, flush_delay: float, save_interval: float, max_per_user: int):
+        self.path = path
+        self.flush_delay = flush_delay
+        self.save_interval = save_interval
+        self.max_per_user = max_per_user
+        self._triggers: Dict[str, Dict[str, List[Trigger]]] = {}
+        self._by_user: Dict[int, Set[AlertKey]] = {}
+        self._pending: Dict[int, List[Tuple[Dict, str, float, float]]] = {}
+        self._dirty = False
+        self._saved_at = 0.0
+        self._wakeup = asyncio.Event()
+        self._bot: Optional[Bot] = None
+        self._task: Optional[asyncio.Task] = None
+        self.evaluations = 0
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._by_user.values())
+
+    def _insert(self, telegram_id: int, key: AlertKey):
+        content_hash, direction, threshold = key
+        triggers = self._triggers.setdefault(content_hash, {ABOVE: [], BELOW: []})
+        insort(triggers[direction], (threshold, telegram_id))
+        self._by_user.setdefault(telegram_id, set()).add(key)
+        self._dirty = True
+
+    def _forget(self, telegram_id: int, key: AlertKey):
+        keys = self._by_user.get(telegram_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[telegram_id]
+        self._dirty = True
+
+    def add(self, telegram_id: int, market: Dict, threshold: float) -> Optional[str]:
+        content_hash = market.get("content_hash")
+        if not content_hash or market.get("status") != MARKET_ACTIVE or not 0 < threshold < 100:
+            return None
+        odds = yes_odds(market)
+        if threshold == odds:
+            return None
+        direction = ABOVE if threshold > odds else BELOW
+        key = (content_hash, direction, float(threshold))
+        user_alerts = self._by_user.get(telegram_id, set())
+        if key in user_alerts:
+            return direction
+        if len(user_alerts) >= self.max_per_user:
+            return None
+        self._insert(telegram_id, key)
+        return direction
+
+    def remove(self, telegram_id: int, content_hash: str) -> int:
+        removed = 0
+        for key in [key for key in self._by_user.get(telegram_id, ()) if key[0] == content_hash]:
+            _, direction, threshold = key
+            triggers = self._triggers[content_hash][direction]
+            index = bisect_left(triggers, (threshold, telegram_id))
+            if index < len(triggers) and triggers[index] == (threshold, telegram_id):
+                del triggers[index]
+            self._forget(telegram_id, key)
+            removed += 1
+        triggers = self._triggers.get(content_hash)
+        if triggers is not None and not triggers[ABOVE] and not triggers[BELOW]:
+            del self._triggers[content_hash]
+        return removed
+
+    def alerts_for(self, telegram_id: int) -> List[AlertKey]:
+        return sorted(self._by_user.get(telegram_id, ()))
+
+    def _drop_market(self, content_hash: str):
+        triggers = self._triggers.pop(content_hash, None)
+        if triggers is None:
+            return
+        for direction, entries in triggers.items():
+            for threshold, telegram_id in entries:
+                self._forget(telegram_id, (content_hash, direction, threshold))
+
+    def _crossed(self, triggers: Dict[str, List[Trigger]], old: float, new: float) -> List[Tuple[str, Trigger]]:
+        if new > old:
+            entries = triggers[ABOVE]
+            lo = bisect_right(entries, (old, float("inf")))
+            hi = bisect_right(entries, (new, float("inf")))
+            direction = ABOVE
+        else:
+            entries = triggers[BELOW]
+            lo = bisect_left(entries, (new, float("-inf")))
+            hi = bisect_left(entries, (old, float("-inf")))
+            direction = BELOW
+        fired = entries[lo:hi]
+        del entries[lo:hi]
+        return [(direction, trigger) for trigger in fired]
+
+    def on_market(self, market: Dict, previous: Optional[Dict] = None):
+        content_hash = market.get("content_hash")
+        triggers = self._triggers.get(content_hash)
+        if triggers is None:
+            return
+        if market.get("status") != MARKET_ACTIVE:
+            self._drop_market(content_hash)
+            return
+        if previous is None:
+            return
+        old, new = yes_odds(previous), yes_odds(market)
+        if old == new:
+            return
+
+        self.evaluations += 1
+        for direction, (threshold, telegram_id) in self._crossed(triggers, old, new):
+            self._forget(telegram_id, (content_hash, direction, threshold))
+            self._pending.setdefault(telegram_id, []).append((market, direction, threshold, new))
+            self.fired += 1
+        if not triggers[ABOVE] and not triggers[BELOW]:
+            del self._triggers[content_hash]
+        if self._pending:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        pending, self._pending = self._pending, {}
+        for telegram_id, fired in pending.items():
+            message, reply_markup = render_alerts(fired)
+            sender.submit(
+                telegram_id,
+                lambda telegram_id=telegram_id, message=message, reply_markup=reply_markup: self._bot.send_message(
+                    telegram_id, message, parse_mode="Markdown", reply_markup=reply_markup
+                )
+            )
+        return len(pending)
+
+    def load(self) -> int:
+        data = load_json(self.path)
+        if not isinstance(data, dict) or data.get("version") != STORE_VERSION:
+            return 0
+        loaded = 0
+        for telegram_id, content_hash, direction, threshold in data.get("alerts", []):
+            if direction in (ABOVE, BELOW):
+                self._insert(int(telegram_id), (content_hash, direction, float(threshold)))
+                loaded += 1
+        self._dirty = False
+        return loaded
+
+    async def save(self):
+        payload = {
+            "version": STORE_VERSION,
+            "alerts": [[telegram_id, *key] for telegram_id, keys in self._by_user.items() for key in keys]
+        }
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        if not await save_json(self.path, payload):
+            self._dirty = True
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.save_interval)
+                await asyncio.sleep(self.flush_delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                self.flush()
+                if self._dirty and time.monotonic() - self._saved_at >= self.save_interval:
+                    await self.save()
+            except Exception as e:
+                logger.warning(f"Odds alert flush failed: {e}")
+
+    async def start(self, bot: Bot):
+        self._bot = bot
+        if self._task is None:
+            loaded = self.load()
+            if loaded:
+                logger.info(f"Loaded {loaded} odds alerts from {self.path}")
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._dirty:
+            await self.save()
+
+    def snapshot(self) -> Dict:
+        return {
+            "alerts": len(self),
+            "markets": len(self._triggers),
+            "users": len(self._by_user),
+            "evaluations": self.evaluations,
+            "fired": self.fired,
+            "pending": len(self._pending)
+        }
+
+odds_alerts = OddsAlertIndex(
+    path=os.path.join(settings.DATA_DIR, "alerts.json"),
+    flush_delay=settings.ALERT_FLUSH_DELAY,
+    save_interval=settings.ALERT_SAVE_INTERVAL,
+    max_per_user=settings.ALERT_MAX_PER_USER
+)
+market_catalog.subscribe(odds_alerts.on_market)
@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Dict, Optional
+from telegram import Bot
+from telegram.error import BadRequest, Forbidden, RetryAfter, TelegramError
+from bot.clients import backend_client
+from bot.config import settings
+from bot.sender import TokenBucket, sender
+from bot.storage import load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+MAX_SEND_ATTEMPTS = 5
+BACKEND_RETRY_DELAY = 30.0
+
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_CANCELLED = "cancelled"
+STATUS_FAILED = "failed"
+
+STATUS_LABELS = {
+    STATUS_RUNNING: "运行中",
+    STATUS_DONE: "已完成",
+    STATUS_CANCELLED: "已取消",
+    STATUS_FAILED: "已失败",
+}
+
+def _duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours} 小时 {minutes} 分钟"
+    return f"{minutes} 分 {seconds} 秒" if minutes else f"{seconds} 秒"
+
+def progress(job: Dict) -> Dict:
+    elapsed = job.get("elapsed", 0.0)
+    throughput = job["processed"] / elapsed if elapsed > 0 else 0.0
+    remaining = max(0, job.get("total", 0) - job["processed"])
+    eta = remaining / throughput if throughput > 0 else None
+    return {
+        "status": job["status"],
+        "processed": job["processed"],
+        "total": job.get("total", 0),
+        "sent": job["sent"],
+        "blocked": job["blocked"],
+        "failed": job["failed"],
+        "retried": job["retried"],
+        "throughput": round(throughput, 2),
+        "eta": round(eta, 1) if eta is not None else None
+    }
+
+def render_progress(job: Dict) -> str:
+    stats = progress(job)
+    total = stats["total"] or stats["processed"]
+    percent = stats["processed"] * 100 / total if total else 100.0
+    message = f"📣 **广播进度** `{job['id']}`\n\n"
+    message += f"状态: {STATUS_LABELS.get(stats['status'], stats['status'])}\n"
+    message += f"进度: {stats['processed']}/{total} ({percent:.1f}%)\n"
+    message += f"✅ 成功 {stats['sent']} | 🚫 已屏蔽 {stats['blocked']} | ❌ 失败 {stats['failed']} | 🔁 限流重试 {stats['retried']}\n"
+    message += f"速率: {stats['throughput']:.1f} 条/秒\n"
+    if stats["status"] == STATUS_RUNNING and stats["eta"] is not None:
+        message += f"预计剩余: {_duration(stats['eta'])}\n"
+    if stats["status"] == STATUS_FAILED and job.get("error"):
+        message += f"错误: {job['error'][:200]}\n"
+    return message
+
+class BroadcastEngine:
+    def __init__(self, path: str, page_size: int, concurrency: int, progress_interval: float, bucket: TokenBucket):
+        self.path = path
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.progress_interval = progress_interval
+        self.bucket = bucket
+        self.job: Optional[Dict] = None
+        self._bot: Optional[Bot] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.job is not None and self.job["status"] == STATUS_RUNNING
+
+    async def begin(self, text: str, admin_chat_id: int) -> Optional[Dict]:
+        if self.running:
+            return None
+        await self._halt()
+        self.job = {
+            "id": uuid.uuid4().hex[:8],
+            "text": text,
+            "admin_chat_id": admin_chat_id,
+            "status": STATUS_RUNNING,
+            "cursor": 0,
+            "total": 0,
+            "processed": 0,
+            "sent": 0,
+            "blocked": 0,
+            "failed": 0,
+            "retried": 0,
+            "elapsed": 0.0,
+            "created_at": time.time(),
+            "progress_message_id": None
+        }
+        await self.save()
+        self._launch()
+        return self.job
+
+    async def cancel(self) -> bool:
+        if not self.running:
+            return False
+        self.job["status"] = STATUS_CANCELLED
+        await self.save()
+        return True
+
+    async def _deliver(self, telegram_id: int) -> str:
+        for _ in range(MAX_SEND_ATTEMPTS):
+            await self.bucket.acquire()
+            try:
+                await self._bot.send_message(telegram_id, self.job["text"])
+                return "sent"
+            except RetryAfter as e:
+                self.job["retried"] += 1
+                self.bucket.pause(float(e.retry_after))
+            except Forbidden:
+                return "blocked"
+            except BadRequest as e:
+                if "chat not found" in str(e).lower():
+                    return "blocked"
+                logger.warning(f"Broadcast to {telegram_id} failed: {e}")
+                return "failed"
+            except TelegramError as e:
+                logger.warning(f"Broadcast to {telegram_id} failed: {e}")
+                return "failed"
+        return "failed"
+
+    async def _report(self):
+        job = self.job
+        message = render_progress(job)
+        try:
+            if job.get("progress_message_id"):
+                await self._bot.edit_message_text(
+                    message,
+                    chat_id=job["admin_chat_id"],
+                    message_id=job["progress_message_id"],
+                    parse_mode="Markdown"
+                )
+            else:
+                sent = await self._bot.send_message(job["admin_chat_id"], message, parse_mode="Markdown")
+                job["progress_message_id"] = sent.message_id
+        except TelegramError as e:
+            if "not modified" not in str(e):
+                logger.warning(f"Broadcast progress report failed: {e}")
+
+    async def _execute(self):
+        job = self.job
+        started = time.monotonic()
+        base_elapsed = job["elapsed"]
+        reported = 0.0
+        await self._report()
+
+        while job["status"] == STATUS_RUNNING:
+            try:
+                result = await backend_client.list_telegram_users(after_id=job["cursor"], limit=self.page_size)
+            except Exception as e:
+                logger.warning(f"Broadcast recipient page after {job['cursor']} failed: {e}")
+                await asyncio.sleep(BACKEND_RETRY_DELAY)
+                continue
+
+            data = result.get("data") or {}
+            users = data.get("list") or []
+            job["total"] = max(data.get("total", 0), job["processed"] + len(users))
+            if not users:
+                job["status"] = STATUS_DONE
+                job["finished_at"] = time.time()
+                break
+
+            for start in range(0, len(users), self.concurrency):
+                chunk = users[start:start + self.concurrency]
+                outcomes = await asyncio.gather(*(self._deliver(user["telegram_id"]) for user in chunk))
+                for outcome in outcomes:
+                    job[outcome] += 1
+                job["processed"] += len(chunk)
+                job["cursor"] = chunk[-1]["id"]
+                job["elapsed"] = base_elapsed + time.monotonic() - started
+                await self.save()
+                if job["status"] != STATUS_RUNNING:
+                    break
+                if time.monotonic() - reported >= self.progress_interval:
+                    reported = time.monotonic()
+                    await self._report()
+
+        job["elapsed"] = base_elapsed + time.monotonic() - started
+        await self.save()
+        await self._report()
+
+    async def _guarded(self):
+        try:
+            await self._execute()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Broadcast {self.job['id']} stopped: {e}")
+            self.job["status"] = STATUS_FAILED
+            self.job["error"] = str(e) or type(e).__name__
+            await self.save()
+            await self._report()
+        finally:
+            self._task = None
+
+    def _launch(self):
+        if self._task is None and self._bot is not None:
+            self._task = asyncio.create_task(self._guarded())
+
+    def load(self) -> Optional[Dict]:
+        data = load_json(self.path)
+        if not isinstance(data, dict) or data.get("version") != STORE_VERSION:
+            return None
+        self.job = data.get("job")
+        return self.job
+
+    async def save(self):
+        if self.job is not None:
+            await save_json(self.path, {"version": STORE_VERSION, "job": dict(self.job)})
+
+    async def start(self, bot: Bot):
+        self._bot = bot
+        if self.job is None and self.load() is not None and self.running:
+            logger.info(f"Resuming broadcast {self.job['id']} after user id {self.job['cursor']}")
+        if self.running:
+            self._launch()
+
+    async def _halt(self):
+        task = self._task
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def stop(self):
+        await self._halt()
+        await self.save()
+
+    def snapshot(self) -> Dict:
+        if self.job is None:
+            return {"status": None}
+        return {"id": self.job["id"], **progress(self.job)}
+
+broadcast_engine = BroadcastEngine(
+    path=os.path.join(settings.DATA_DIR, "broadcast.json"),
+    page_size=settings.BROADCAST_PAGE_SIZE,
+    concurrency=settings.BROADCAST_CONCURRENCY,
+    progress_interval=settings.BROADCAST_PROGRESS_INTERVAL,
+    bucket=sender.bucket
+)
@@ -1,11 +1,50 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import time
 import httpx
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Optional, Dict, Any
 from bot.config import settings
 
+AI_DEADLINE_HEADER = "X-Request-Timeout"
+AI_DEFAULT_TIMEOUT = 5.0
+AI_INTENT_TIMEOUT = 30.0
+AI_BATCH_TIMEOUT = 60.0
+BINDING_CACHE_TTL = 60.0
+BINDING_CACHE_SIZE = 10000
+ADMIN_TOKEN_TTL = 300
+
+_shared_bindings: ContextVar[Optional[Dict[int, asyncio.Task]]] = ContextVar("shared_bindings", default=None)
+
+def deadline_headers(timeout: float) -> Dict[str, str]:
+    return {AI_DEADLINE_HEADER: f"{timeout:g}"}
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def sign_token(secret: str, ttl: int = ADMIN_TOKEN_TTL) -> str:
+    header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+    payload = _b64url(json.dumps({"sub": "telegram-bot", "exp": int(time.time()) + ttl}, separators=(",", ":")).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64url(signature)}"
+
+@contextmanager
+def shared_bindings():
+    token = _shared_bindings.set({})
+    try:
+        yield
+    finally:
+        _shared_bindings.reset(token)
+
 class BackendClient:
     def __init__(self):
         self.base_url = settings.BACKEND_API_URL
         self.jwt_secret = settings.JWT_SECRET
+        self._bindings: Dict[int, tuple] = {}
     
     async def get_markets(
         self, 
@@ -49,6 +88,15 @@ class BackendClient:
             response.raise_for_status()
             return response.json()
     
+    async def get_market_position(self, content_hash: str, address: str) -> Dict[str, Any]:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(
+                f"{self.base_url}/api/v1/markets/{content_hash}/bets",
+                params={"user_address": address}
+            )
+            response.raise_for_status()
+            return response.json()
+    
     async def get_user_bets(
         self, 
         address: str, 
@@ -70,6 +118,7 @@ class BackendClient:
         signature: str,
         username: str = ""
     ) -> Dict[str, Any]:
+        self.forget_binding(telegram_id)
         async with httpx.AsyncClient() as client:
             response = await client.post(
                 f"{self.base_url}/api/v1/telegram/bind",
@@ -86,6 +135,21 @@ class BackendClient:
     async def get_binding(
         self,
         telegram_id: int
+    ) -> Dict[str, Any]:
+        cached = self._bindings.get(telegram_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        bindings = _shared_bindings.get()
+        if bindings is None:
+            return await self._fetch_binding(telegram_id)
+        task = bindings.get(telegram_id)
+        if task is None:
+            task = bindings[telegram_id] = asyncio.create_task(self._fetch_binding(telegram_id))
+        return await asyncio.shield(task)
+    
+    async def _fetch_binding(
+        self,
+        telegram_id: int
     ) -> Dict[str, Any]:
         async with httpx.AsyncClient() as client:
             response = await client.get(
@@ -93,12 +157,24 @@ class BackendClient:
                 params={"telegram_id": telegram_id}
             )
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+        if result.get("success"):
+            now = time.monotonic()
+            if len(self._bindings) >= BINDING_CACHE_SIZE:
+                self._bindings = {key: value for key, value in self._bindings.items() if value[0] > now}
+                while len(self._bindings) >= BINDING_CACHE_SIZE:
+                    self._bindings.pop(next(iter(self._bindings)))
+            self._bindings[telegram_id] = (now + BINDING_CACHE_TTL, result)
+        return result
+    
+    def forget_binding(self, telegram_id: int):
+        self._bindings.pop(telegram_id, None)
     
     async def unbind_wallet(
         self,
         telegram_id: int
     ) -> Dict[str, Any]:
+        self.forget_binding(telegram_id)
         async with httpx.AsyncClient() as client:
             response = await client.delete(
                 f"{self.base_url}/api/v1/telegram/binding",
@@ -134,12 +210,46 @@ class BackendClient:
     async def get_resolved_markets(
         self,
         page: int = 1,
-        page_size: int = 10
+        page_size: int = 10,
+        status: Optional[str] = None
     ) -> Dict[str, Any]:
+        params = {"page": page, "page_size": page_size}
+        if status:
+            params["status"] = status
+        
         async with httpx.AsyncClient() as client:
             response = await client.get(
                 f"{self.base_url}/api/v1/telegram/resolved",
-                params={"page": page, "page_size": page_size}
+                params=params
+            )
+            response.raise_for_status()
+            return response.json()
+    
+    async def get_market_recipients(
+        self,
+        content_hash: str,
+        page: int = 1,
+        page_size: int = 100
+    ) -> Dict[str, Any]:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(
+                f"{self.base_url}/api/v1/admin/telegram/recipients",
+                params={"content_hash": content_hash, "page": page, "page_size": page_size},
+                headers={"Authorization": f"Bearer {sign_token(self.jwt_secret)}"}
+            )
+            response.raise_for_status()
+            return response.json()
+    
+    async def list_telegram_users(
+        self,
+        after_id: int = 0,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(
+                f"{self.base_url}/api/v1/admin/telegram/users",
+                params={"after_id": after_id, "limit": limit},
+                headers={"Authorization": f"Bearer {sign_token(self.jwt_secret)}"}
             )
             response.raise_for_status()
             return response.json()
@@ -162,9 +272,10 @@ class AIClient:
         self.base_url = settings.AI_SERVICE_URL
     
     async def get_hot_events(self) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(timeout=AI_DEFAULT_TIMEOUT) as client:
             response = await client.get(
-                f"{self.base_url}/api/v1/ai/hot-events"
+                f"{self.base_url}/api/v1/ai/hot-events",
+                headers=deadline_headers(AI_DEFAULT_TIMEOUT)
             )
             response.raise_for_status()
             return response.json()
@@ -177,9 +288,10 @@ class AIClient:
         total_pnl: int,
         recent_results: list
     ) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(timeout=AI_DEFAULT_TIMEOUT) as client:
             response = await client.post(
                 f"{self.base_url}/api/v1/ai/emotional-feedback",
+                headers=deadline_headers(AI_DEFAULT_TIMEOUT),
                 json={
                     "user_address": user_address,
                     "total_bets": total_bets,
@@ -191,10 +303,58 @@ class AIClient:
             response.raise_for_status()
             return response.json()
     
+    async def summarize(
+        self,
+        discussions: list,
+        chat_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        payload = {"discussions": discussions}
+        if chat_id:
+            payload["chat_id"] = chat_id
+        
+        async with httpx.AsyncClient(timeout=AI_BATCH_TIMEOUT) as client:
+            response = await client.post(
+                f"{self.base_url}/api/v1/ai/summarize",
+                headers=deadline_headers(AI_BATCH_TIMEOUT),
+                json=payload
+            )
+            response.raise_for_status()
+            return response.json()
+    
+    async def generate_topics(self, discussions: list) -> Dict[str, Any]:
+        async with httpx.AsyncClient(timeout=AI_BATCH_TIMEOUT) as client:
+            response = await client.post(
+                f"{self.base_url}/api/v1/ai/generate-topics",
+                headers=deadline_headers(AI_BATCH_TIMEOUT),
+                json={"discussions": discussions}
+            )
+            response.raise_for_status()
+            return response.json()
+    
+    async def search_markets(
+        self,
+        query: str,
+        limit: int = 5,
+        statuses: Optional[list] = None
+    ) -> Dict[str, Any]:
+        payload = {"query": query, "limit": limit}
+        if statuses is not None:
+            payload["statuses"] = statuses
+        
+        async with httpx.AsyncClient(timeout=AI_DEFAULT_TIMEOUT) as client:
+            response = await client.post(
+                f"{self.base_url}/api/v1/ai/search",
+                headers=deadline_headers(AI_DEFAULT_TIMEOUT),
+                json=payload
+            )
+            response.raise_for_status()
+            return response.json()
+    
     async def recognize_intent(self, message: str) -> Dict[str, Any]:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with httpx.AsyncClient(timeout=AI_INTENT_TIMEOUT) as client:
             response = await client.post(
                 f"{self.base_url}/api/v1/ai/intent",
+                headers=deadline_headers(AI_INTENT_TIMEOUT),
                 json={"message": message}
             )
             response.raise_for_status()
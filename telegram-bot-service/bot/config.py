@@ -11,6 +11,50 @@ class Settings(BaseSettings):
     
     JWT_SECRET: str = ""
     
+    MARKET_REFRESH_INTERVAL: float = 30.0
+    
+    SEND_RATE_PER_SECOND: float = 25.0
+    SEND_CHAT_INTERVAL: float = 1.0
+    SEND_GROUP_INTERVAL: float = 3.0
+    SEND_WORKERS: int = 4
+    
+    LIVE_CARD_DEBOUNCE: float = 5.0
+    LIVE_CARD_TTL: float = 6 * 3600.0
+    LIVE_CARD_MAX_MESSAGES: int = 5000
+    
+    RESOLUTION_WATCH_ENABLED: bool = True
+    RESOLUTION_WATCH_INTERVAL: float = 60.0
+    
+    DATA_DIR: str = os.path.join(os.path.dirname(__file__), "..", "data")
+    REMINDER_LEAD: float = 3600.0
+    REMINDER_TICK: float = 10.0
+    REMINDER_SAVE_INTERVAL: float = 30.0
+    REMINDER_MAX_PER_USER: int = 50
+    
+    ALERT_FLUSH_DELAY: float = 2.0
+    ALERT_SAVE_INTERVAL: float = 30.0
+    ALERT_MAX_PER_USER: int = 50
+    
+    DIGEST_INTERVAL: float = 3600.0
+    DIGEST_MIN_INTERVAL: float = 600.0
+    DIGEST_FLUSH_SIZE: int = 20
+    DIGEST_BUFFER_SIZE: int = 50
+    DIGEST_MAX_GROUPS: int = 1000
+    
+    ADMIN_TELEGRAM_IDS: str = ""
+    BROADCAST_PAGE_SIZE: int = 200
+    BROADCAST_CONCURRENCY: int = 5
+    BROADCAST_PROGRESS_INTERVAL: float = 30.0
+    
+    INGEST_ENABLED: bool = True
+    INGEST_BUFFER_SIZE: int = 200
+    INGEST_MAX_CHATS: int = 1000
+    INGEST_MAX_TOTAL_CHARS: int = 5_000_000
+    INGEST_MAX_MESSAGE_CHARS: int = 500
+    INGEST_FLUSH_INTERVAL: float = 300.0
+    INGEST_MIN_BATCH: int = 30
+    INGEST_MAX_DELAY: float = 3600.0
+    
     class Config:
         env_file = os.path.join(os.path.dirname(__file__), "..", ".env")
         env_file_encoding = "utf-8"
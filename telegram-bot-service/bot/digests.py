@@ -0,0 +1,238 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import Forbidden
+from bot.config import settings
+from bot.market_catalog import market_catalog
+from bot.sender import sender
+from bot.storage import load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+MARKET_ACTIVE = 0
+MARKET_RESOLVED = 2
+MARKET_CANCELLED = 3
+STORE_VERSION = 1
+SIZE_FLUSH_GAP = 60.0
+MAX_DIGEST_BUTTONS = 5
+
+EVENT_NEW = "new"
+EVENT_RESOLVED = "resolved"
+EVENT_CANCELLED = "cancelled"
+
+DIGEST_SECTIONS = (
+    (EVENT_NEW, "🆕 **新议题**"),
+    (EVENT_RESOLVED, "✅ **已结算**"),
+    (EVENT_CANCELLED, "🔴 **已取消**"),
+)
+
+def market_event(market: Dict, previous: Optional[Dict]) -> Optional[str]:
+    status = market.get("status")
+    if previous is None:
+        return EVENT_NEW if status == MARKET_ACTIVE else None
+    if status == previous.get("status"):
+        return None
+    if status == MARKET_RESOLVED:
+        return EVENT_RESOLVED
+    if status == MARKET_CANCELLED:
+        return EVENT_CANCELLED
+    return None
+
+def render_digest(events: List[Tuple[str, Dict]], dropped: int = 0) -> Tuple[str, Optional[InlineKeyboardMarkup]]:
+    message = "📰 **MindBet 动态汇总**\n"
+    keyboard = []
+
+    for kind, header in DIGEST_SECTIONS:
+        section = [market for event, market in events if event == kind]
+        if not section:
+            continue
+        message += f"\n{header} ({len(section)})\n"
+        for market in section:
+            full_hash = market.get("content_hash", "")
+            line = f"• #{full_hash[:10]} {market.get('title', 'N/A')[:30]}"
+            if kind == EVENT_RESOLVED:
+                line += " → YES ✅" if market.get("result") == 1 else " → NO ❌"
+            message += line + "\n"
+            if kind == EVENT_NEW and len(keyboard) < MAX_DIGEST_BUTTONS:
+                keyboard.append([InlineKeyboardButton(f"#{full_hash[:10]}", callback_data=f"market_{full_hash}")])
+
+    if dropped:
+        message += f"\n…另有 {dropped} 条动态未列出，使用 /markets 查看\n"
+
+    return message, InlineKeyboardMarkup(keyboard) if keyboard else None
+
+class DigestBuffer:
+    __slots__ = ("chat_id", "events", "dropped", "last_flush")
+
+    def __init__(self, chat_id: int):
+        self.chat_id = chat_id
+        self.events: "OrderedDict[str, Tuple[str, Dict]]" = OrderedDict()
+        self.dropped = 0
+        self.last_flush = time.monotonic()
+
+    def add(self, kind: str, market: Dict, capacity: int):
+        content_hash = market.get("content_hash")
+        if content_hash in self.events:
+            self.events[content_hash] = (kind, market)
+            return
+        self.events[content_hash] = (kind, market)
+        while len(self.events) > capacity:
+            self.events.popitem(last=False)
+            self.dropped += 1
+
+    def take(self) -> Tuple[List[Tuple[str, Dict]], int]:
+        events, dropped = list(self.events.values()), self.dropped
+        self.events.clear()
+        self.dropped = 0
+        self.last_flush = time.monotonic()
+        return events, dropped
+
+class GroupDigestFeed:
+    def __init__(
+        self,
+        path: str,
+        default_interval: float,
+        min_interval: float,
+        flush_size: int,
+        buffer_size: int,
+        max_groups: int
+    ):
+        self.path = path
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.flush_size = flush_size
+        self.buffer_size = buffer_size
+        self.max_groups = max_groups
+        self._intervals: Dict[int, float] = {}
+        self._buffers: Dict[int, DigestBuffer] = {}
+        self._wakeup = asyncio.Event()
+        self._bot: Optional[Bot] = None
+        self._task: Optional[asyncio.Task] = None
+        self.events = 0
+        self.digests = 0
+
+    def interval(self, chat_id: int) -> Optional[float]:
+        return self._intervals.get(chat_id)
+
+    async def subscribe(self, chat_id: int, interval: Optional[float] = None) -> Optional[float]:
+        if chat_id not in self._intervals and len(self._intervals) >= self.max_groups:
+            return None
+        interval = max(self.min_interval, interval or self.default_interval)
+        self._intervals[chat_id] = interval
+        self._buffers.setdefault(chat_id, DigestBuffer(chat_id))
+        await self.save()
+        return interval
+
+    async def unsubscribe(self, chat_id: int) -> bool:
+        self._buffers.pop(chat_id, None)
+        if self._intervals.pop(chat_id, None) is None:
+            return False
+        await self.save()
+        return True
+
+    def on_market(self, market: Dict, previous: Optional[Dict] = None):
+        if not self._buffers or (previous is None and market_catalog.refreshes == 0):
+            return
+        kind = market_event(market, previous)
+        if kind is None:
+            return
+        self.events += 1
+        for buffer in self._buffers.values():
+            buffer.add(kind, market, self.buffer_size)
+            if len(buffer.events) >= self.flush_size:
+                self._wakeup.set()
+
+    def _due(self, buffer: DigestBuffer, now: float) -> bool:
+        if not buffer.events:
+            return False
+        elapsed = now - buffer.last_flush
+        if elapsed >= self._intervals.get(buffer.chat_id, self.default_interval):
+            return True
+        return len(buffer.events) >= self.flush_size and elapsed >= SIZE_FLUSH_GAP
+
+    async def _send(self, chat_id: int, message: str, reply_markup: Optional[InlineKeyboardMarkup]):
+        try:
+            await self._bot.send_message(chat_id, message, parse_mode="Markdown", reply_markup=reply_markup)
+        except Forbidden:
+            logger.info(f"Digest chat {chat_id} is no longer reachable, unsubscribing")
+            await self.unsubscribe(chat_id)
+
+    def flush(self, now: float) -> int:
+        flushed = 0
+        for buffer in list(self._buffers.values()):
+            if not self._due(buffer, now):
+                continue
+            events, dropped = buffer.take()
+            message, reply_markup = render_digest(events, dropped)
+            sender.submit(
+                buffer.chat_id,
+                lambda chat_id=buffer.chat_id, message=message, reply_markup=reply_markup: self._send(
+                    chat_id, message, reply_markup
+                )
+            )
+            flushed += 1
+        self.digests += flushed
+        return flushed
+
+    def load(self) -> int:
+        data = load_json(self.path)
+        if not isinstance(data, dict) or data.get("version") != STORE_VERSION:
+            return 0
+        for chat_id, interval in data.get("groups", []):
+            self._intervals[int(chat_id)] = float(interval)
+            self._buffers[int(chat_id)] = DigestBuffer(int(chat_id))
+        return len(self._intervals)
+
+    async def save(self):
+        await save_json(self.path, {"version": STORE_VERSION, "groups": list(self._intervals.items())})
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                self.flush(time.monotonic())
+            except Exception as e:
+                logger.warning(f"Digest flush failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=SIZE_FLUSH_GAP)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self, bot: Bot):
+        self._bot = bot
+        if self._task is None:
+            loaded = self.load()
+            if loaded:
+                logger.info(f"Loaded {loaded} digest subscriptions from {self.path}")
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict:
+        return {
+            "groups": len(self._intervals),
+            "buffered": sum(len(buffer.events) for buffer in self._buffers.values()),
+            "events": self.events,
+            "digests": self.digests
+        }
+
+group_digests = GroupDigestFeed(
+    path=os.path.join(settings.DATA_DIR, "digests.json"),
+    default_interval=settings.DIGEST_INTERVAL,
+    min_interval=settings.DIGEST_MIN_INTERVAL,
+    flush_size=settings.DIGEST_FLUSH_SIZE,
+    buffer_size=settings.DIGEST_BUFFER_SIZE,
+    max_groups=settings.DIGEST_MAX_GROUPS
+)
+market_catalog.subscribe(group_digests.on_market)
@@ -0,0 +1,46 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+from bot.broadcast import broadcast_engine, render_progress
+from bot.config import settings
+
+ADMIN_IDS = {int(item) for item in settings.ADMIN_TELEGRAM_IDS.split(",") if item.strip()}
+
+def is_admin(update: Update) -> bool:
+    return update.effective_user is not None and update.effective_user.id in ADMIN_IDS
+
+async def broadcast(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not is_admin(update):
+        await update.message.reply_text("仅管理员可以使用该命令。")
+        return
+    
+    parts = (update.message.text or "").split(maxsplit=1)
+    text = parts[1].strip() if len(parts) > 1 else ""
+    
+    try:
+        if not text:
+            await update.message.reply_text("用法: /broadcast <公告内容> | /broadcast status | /broadcast cancel")
+            return
+        
+        if text == "status":
+            if broadcast_engine.job is None:
+                await update.message.reply_text("暂无广播任务。")
+                return
+            await update.message.reply_text(render_progress(broadcast_engine.job), parse_mode="Markdown")
+            return
+        
+        if text == "cancel":
+            if await broadcast_engine.cancel():
+                await update.message.reply_text("✅ 广播已取消。")
+            else:
+                await update.message.reply_text("当前没有进行中的广播。")
+            return
+        
+        job = await broadcast_engine.begin(text, update.effective_chat.id)
+        if job is None:
+            await update.message.reply_text("已有广播在进行中，请先等待完成或使用 /broadcast cancel 取消。")
+            return
+        
+        await update.message.reply_text(f"📣 广播任务 {job['id']} 已开始，进度将定时更新。")
+        
+    except Exception as e:
+        await update.message.reply_text(f"错误: {str(e)}")
@@ -1,7 +1,11 @@
+import asyncio
 import logging
-from telegram import Update
+from telegram import InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
-from bot.clients import ai_client
+from telegram.helpers import escape_markdown
+from bot.clients import ai_client, shared_bindings
+from bot.config import settings
+from bot.ingestion import group_ingestor
 from bot.handlers.telegram_handlers import (
     start, help_command, login, logout, markets, market_detail,
     mybets, claimable, refundable, resolved, profile, balance
@@ -29,6 +33,95 @@ COMMAND_MAP = {
     "hot": hot,
 }
 
+LIVE_COMMANDS = {"markets", "market"}
+MESSAGE_LIMIT = 4096
+REPLY_SEPARATOR = "\n\n"
+
+class ReplyCollector:
+    deferred = True
+    
+    def __init__(self, message):
+        self._message = message
+        self.replies = []
+    
+    def __getattr__(self, name):
+        return getattr(self._message, name)
+    
+    async def reply_text(self, text, parse_mode=None, reply_markup=None, **kwargs):
+        self.replies.append((text, parse_mode, reply_markup))
+
+class _UpdateView:
+    def __init__(self, update: Update, message: ReplyCollector):
+        self._update = update
+        self.message = message
+    
+    def __getattr__(self, name):
+        return getattr(self._update, name)
+
+class _ContextView:
+    def __init__(self, context: ContextTypes.DEFAULT_TYPE, args: list):
+        self._context = context
+        self.args = args
+    
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+def intent_commands(data: dict) -> list:
+    commands = data.get("commands") or []
+    if not commands and data.get("command"):
+        commands = [{"command": data.get("command"), "args": data.get("args", [])}]
+    seen = set()
+    unique = []
+    for item in commands:
+        command = item.get("command")
+        if command and command not in seen:
+            seen.add(command)
+            unique.append((command, item.get("args") or []))
+    return unique
+
+def merge_replies(replies: list):
+    parse_mode = next((mode for _, mode, _ in replies if mode), None)
+    texts = []
+    rows = []
+    seen = set()
+    for text, mode, markup in replies:
+        text = text.strip()
+        texts.append(escape_markdown(text) if parse_mode and not mode else text)
+        for row in (markup.inline_keyboard if markup else ()):
+            key = tuple((button.text, button.callback_data, button.url) for button in row)
+            if key not in seen:
+                seen.add(key)
+                rows.append(row)
+    return REPLY_SEPARATOR.join(texts), parse_mode, InlineKeyboardMarkup(rows) if rows else None
+
+async def run_commands(update: Update, context: ContextTypes.DEFAULT_TYPE, commands: list):
+    collectors = [None if command in LIVE_COMMANDS else ReplyCollector(update.message) for command, _ in commands]
+    with shared_bindings():
+        results = await asyncio.gather(
+            *(
+                COMMAND_MAP[command](
+                    update if collector is None else _UpdateView(update, collector),
+                    _ContextView(context, args)
+                )
+                for (command, args), collector in zip(commands, collectors)
+            ),
+            return_exceptions=True
+        )
+    
+    for (command, _), result in zip(commands, results):
+        if isinstance(result, Exception):
+            logger.error(f"Command {command} failed: {result}")
+    
+    replies = [reply for collector in collectors if collector is not None for reply in collector.replies]
+    if not replies:
+        return
+    text, parse_mode, reply_markup = merge_replies(replies)
+    if len(text) <= MESSAGE_LIMIT:
+        await update.message.reply_text(text, parse_mode=parse_mode, reply_markup=reply_markup)
+        return
+    for text, parse_mode, reply_markup in replies:
+        await update.message.reply_text(text, parse_mode=parse_mode, reply_markup=reply_markup)
+
 def is_group_chat(update: Update) -> bool:
     chat = update.effective_chat
     return chat.type in ["group", "supergroup"]
@@ -66,6 +159,16 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if update.message.text.startswith('/'):
         return
     
+    if settings.INGEST_ENABLED and is_group_chat(update):
+        user = update.effective_user
+        group_ingestor.add(
+            update.effective_chat.id,
+            update.message.message_id,
+            user.first_name if user else "",
+            update.message.text,
+            update.message.date.timestamp() if update.message.date else None
+        )
+    
     if not is_mentioned_or_reply(update, context):
         return
     
@@ -93,12 +196,17 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         has_intent = data.get("has_intent", False)
         command = data.get("command")
         args = data.get("args", [])
+        commands = intent_commands(data)
         confidence = data.get("confidence", 0)
         reply = data.get("reply")
         
-        logger.info(f"Intent result: has_intent={has_intent}, command={command}, confidence={confidence}")
+        logger.info(f"Intent result: has_intent={has_intent}, commands={[name for name, _ in commands]}, confidence={confidence}")
         
-        if has_intent and command and confidence > 0.6:
+        supported = [(name, name_args) for name, name_args in commands if name in COMMAND_MAP]
+        if has_intent and len(supported) > 1 and confidence > 0.6:
+            logger.info(f"Executing commands concurrently: {supported}")
+            await run_commands(update, context, supported)
+        elif has_intent and command and confidence > 0.6:
             if command in COMMAND_MAP:
                 context.args = args
                 logger.info(f"Executing command: {command} with args: {args}")
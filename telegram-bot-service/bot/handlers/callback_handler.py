@@ -1,6 +1,8 @@
+from datetime import datetime
 from telegram import Update
 from telegram.ext import ContextTypes
 from bot.clients import backend_client
+from bot.reminders import reminder_service
 from bot.handlers.telegram_handlers import market_detail, balance
 from bot.handlers.transaction_handlers import bet, claim, refund
 
@@ -67,6 +69,21 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         content_hash = data.split("_")[1]
         context.args = [content_hash]
         await refund(update, context)
+    elif data.startswith("remind_"):
+        content_hash = data.split("_")[1]
+        try:
+            result = await backend_client.get_market_by_hash(content_hash)
+            if not result.get("success"):
+                await query.message.reply_text("市场不存在。")
+                return
+            at = reminder_service.add(update.effective_user.id, result.get("data", {}))
+            if at is None:
+                await query.message.reply_text("无法设置提醒：议题已截止或提醒数量已达上限。")
+                return
+            remind_at = datetime.fromtimestamp(at).strftime('%Y-%m-%d %H:%M')
+            await query.message.reply_text(f"✅ 将在 {remind_at} 提醒你议题 #{content_hash[:10]} 即将截止。\n取消: /remind off <market_id>")
+        except Exception as e:
+            await query.message.reply_text(f"错误: {str(e)}")
     elif data == "create":
         from bot.handlers.transaction_handlers import create
         await create(update, context)
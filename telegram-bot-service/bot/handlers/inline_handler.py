@@ -0,0 +1,54 @@
+from telegram import (
+    Update, InlineKeyboardButton, InlineKeyboardMarkup,
+    InlineQueryResultArticle, InputTextMessageContent
+)
+from telegram.ext import ContextTypes
+from bot.market_index import inline_market_index
+from datetime import datetime
+
+INLINE_PAGE_SIZE = 10
+INLINE_CACHE_TIME = 30
+
+def _market_article(market: dict) -> InlineQueryResultArticle:
+    content_hash = market.get("content_hash", "")
+    yes_pool = float(market.get("total_yes_pool") or 0) / 1e18
+    no_pool = float(market.get("total_no_pool") or 0) / 1e18
+    total_pool = yes_pool + no_pool
+    yes_odds = (yes_pool / total_pool * 100) if total_pool > 0 else 50
+    
+    deadline = datetime.fromtimestamp(market.get("deadline") or 0)
+    deadline_str = deadline.strftime("%m-%d %H:%M")
+    title = market.get("title", "N/A")
+    
+    message = f"""
+📊 **市场 #{content_hash[:10]}**
+
+**{title}**
+
+💰 YES: {yes_pool:.4f} MON ({yes_odds:.1f}%)
+💰 NO: {no_pool:.4f} MON ({100 - yes_odds:.1f}%)
+⏰ 截止: {deadline_str}
+"""
+    keyboard = [
+        [InlineKeyboardButton("📊 查看详情", callback_data=f"market_{content_hash}")],
+    ]
+    
+    return InlineQueryResultArticle(
+        id=content_hash[:64],
+        title=title[:100],
+        description=f"YES {yes_odds:.1f}% | 奖池 {total_pool:.4f} MON | 截止 {deadline_str}",
+        input_message_content=InputTextMessageContent(message, parse_mode="Markdown"),
+        reply_markup=InlineKeyboardMarkup(keyboard)
+    )
+
+async def inline_query(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    query = update.inline_query
+    offset = int(query.offset) if query.offset.isdigit() else 0
+    
+    markets, next_offset = inline_market_index.search(query.query, offset, INLINE_PAGE_SIZE)
+    
+    await query.answer(
+        [_market_article(market) for market in markets],
+        cache_time=INLINE_CACHE_TIME,
+        next_offset=str(next_offset) if next_offset is not None else ""
+    )
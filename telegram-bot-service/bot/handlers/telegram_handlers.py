@@ -1,10 +1,24 @@
+import asyncio
+import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.constants import ChatMemberStatus
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes
-from bot.clients import backend_client
+from telegram.helpers import escape_markdown
+from bot.alerts import ABOVE, odds_alerts, yes_odds
+from bot.clients import ai_client, backend_client
 from bot.config import settings
+from bot.digests import group_digests
+from bot.ingestion import group_ingestor
+from bot.live_cards import live_cards
+from bot.market_catalog import market_catalog
+from bot.positions import recent_results, render_position
+from bot.reminders import reminder_service
 from datetime import datetime
 from urllib.parse import quote
 
+logger = logging.getLogger(__name__)
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     welcome_message = """
 🎰 **欢迎来到 MindBet!**
@@ -20,6 +34,7 @@ MindBet 是基于 Monad 链的去中心化预测市场平台，使用 MON 代币
 /help - 查看所有命令
 /markets - 查看活跃市场
 /market <id> - 查看市场详情
+/search <关键词> - 搜索市场
 /mybets - 查看我的下注
 /claimable - 查看可领奖议题
 /refundable - 查看可退款议题
@@ -31,6 +46,10 @@ MindBet 是基于 Monad 链的去中心化预测市场平台，使用 MON 代币
 /resolve <id> <yes/no> - 结算议题
 /cancel <id> - 取消议题
 /deposit - 领取押金
+/remind <id> - 截止前提醒
+/alert <id> <概率%> - 赔率提醒
+/digest on|off - 群组动态汇总
+/summary - 群聊讨论摘要与议题建议
 /profile - 查看我的战绩
 /balance - 查询钱包余额
 /login - 绑定钱包
@@ -97,6 +116,33 @@ async def logout(update: Update, context: ContextTypes.DEFAULT_TYPE):
     except Exception as e:
         await update.message.reply_text(f"错误: {str(e)}")
 
+STATUS_ICONS = {0: "🟢", 1: "🔴", 2: "✅", 3: "❌"}
+
+def render_market_list(markets_list: list, header: str = "📊 **活跃市场**"):
+    message = f"{header}\n\n"
+    keyboard = []
+    
+    for market in markets_list:
+        yes_pool = float(market.get("total_yes_pool") or 0) / 1e18
+        no_pool = float(market.get("total_no_pool") or 0) / 1e18
+        
+        deadline = datetime.fromtimestamp(market.get("deadline") or 0)
+        deadline_str = deadline.strftime("%m-%d %H:%M")
+        
+        content_hash = market.get('content_hash', '')[:10]
+        icon = STATUS_ICONS.get(market.get("status"), "🟢")
+        message += f"{icon} **#{content_hash}** {market.get('title', 'N/A')[:40]}\n"
+        message += f"   💰 YES: {yes_pool:.4f} | NO: {no_pool:.4f} MON\n"
+        message += f"   ⏰ 截止: {deadline_str}\n\n"
+        
+        keyboard.append([InlineKeyboardButton(
+            f"#{content_hash} {market.get('title', '')[:25]}...",
+            callback_data=f"market_{market.get('content_hash')}"
+        )])
+    
+    message += "\n点击下方按钮查看详情，或使用 /market <content_hash>"
+    return message, InlineKeyboardMarkup(keyboard)
+
 async def markets(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         result = await backend_client.get_markets(status="0")
@@ -112,74 +158,65 @@ async def markets(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await update.message.reply_text("暂无活跃的市场。")
             return
         
-        message = "📊 **活跃市场**\n\n"
-        keyboard = []
+        shown = markets_list[:5]
         
-        for market in markets_list[:5]:
-            yes_pool = float(market.get("total_yes_pool", 0)) / 1e18
-            no_pool = float(market.get("total_no_pool", 0)) / 1e18
-            total_pool = yes_pool + no_pool
-            
-            deadline = datetime.fromtimestamp(market.get("deadline", 0))
-            deadline_str = deadline.strftime("%m-%d %H:%M")
-            
-            content_hash = market.get('content_hash', '')[:10]
-            message += f"🟢 **#{content_hash}** {market.get('title', 'N/A')[:40]}\n"
-            message += f"   💰 YES: {yes_pool:.4f} | NO: {no_pool:.4f} MON\n"
-            message += f"   ⏰ 截止: {deadline_str}\n\n"
-            
-            keyboard.append([InlineKeyboardButton(
-                f"#{content_hash} {market.get('title', '')[:25]}...",
-                callback_data=f"market_{market.get('content_hash')}"
-            )])
+        def render():
+            return render_market_list([market_catalog.get(m.get("content_hash")) or m for m in shown])
         
-        message += "\n点击下方按钮查看详情，或使用 /market <content_hash>"
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await update.message.reply_text(message, parse_mode="Markdown", reply_markup=reply_markup)
+        message, reply_markup = render_market_list(shown)
+        sent = await update.message.reply_text(message, parse_mode="Markdown", reply_markup=reply_markup)
+        live_cards.track(sent, message, [m.get("content_hash") for m in shown], render)
         
     except Exception as e:
         await update.message.reply_text(f"错误: {str(e)}")
 
-async def market_detail(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    content_hash = None
-    
-    if context.args:
-        content_hash = context.args[0]
-    elif update.callback_query:
-        content_hash = update.callback_query.data.split("_")[1]
-    
-    if not content_hash:
-        await update.message.reply_text("请提供市场内容哈希。用法: /market <content_hash>")
+async def search(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    query = " ".join(context.args or []).strip()
+    if not query:
+        await update.message.reply_text("请提供搜索关键词。用法: /search <关键词>")
         return
     
     try:
-        result = await backend_client.get_market_by_hash(content_hash)
+        result = await ai_client.search_markets(query)
         
         if not result.get("success"):
-            await update.message.reply_text("市场不存在。")
+            await update.message.reply_text("搜索失败，请稍后重试。")
             return
         
-        market = result.get("data", {})
-        
-        status_map = {0: "🟢 进行中", 1: "🔴 已封盘", 2: "✅ 已结算", 3: "❌ 已取消"}
-        status = status_map.get(market.get("status"), "未知")
-        
-        yes_pool = float(market.get("total_yes_pool", 0)) / 1e18
-        no_pool = float(market.get("total_no_pool", 0)) / 1e18
-        total_pool = yes_pool + no_pool
-        
-        yes_odds = (yes_pool / total_pool * 100) if total_pool > 0 else 50
-        no_odds = 100 - yes_odds
+        markets_list = result.get("data", {}).get("list", [])
         
-        deadline = datetime.fromtimestamp(market.get("deadline", 0))
-        deadline_str = deadline.strftime("%Y-%m-%d %H:%M")
+        if not markets_list:
+            await update.message.reply_text(f"没有找到与「{query}」相关的市场。")
+            return
         
-        result_text = ""
-        if market.get("status") == 2:
-            result_text = f"\n**结果:** {'YES ✅' if market.get('result') ==1 else 'NO ❌'}"
+        message, reply_markup = render_market_list(markets_list, f"🔍 **搜索结果:** {escape_markdown(query)}")
+        await update.message.reply_text(message, parse_mode="Markdown", reply_markup=reply_markup)
         
-        hash_short = content_hash[:10]
-        message = f"""
+    except Exception as e:
+        await update.message.reply_text(f"错误: {str(e)}")
+
+POSITION_TIMEOUT = 3.0
+
+def render_market_card(market: dict, position: dict = None):
+    status_map = {0: "🟢 进行中", 1: "🔴 已封盘", 2: "✅ 已结算", 3: "❌ 已取消"}
+    status = status_map.get(market.get("status"), "未知")
+    
+    yes_pool = float(market.get("total_yes_pool", 0)) / 1e18
+    no_pool = float(market.get("total_no_pool", 0)) / 1e18
+    total_pool = yes_pool + no_pool
+    
+    yes_odds = (yes_pool / total_pool * 100) if total_pool > 0 else 50
+    no_odds = 100 - yes_odds
+    
+    deadline = datetime.fromtimestamp(market.get("deadline", 0))
+    deadline_str = deadline.strftime("%Y-%m-%d %H:%M")
+    
+    result_text = ""
+    if market.get("status") == 2:
+        result_text = f"\n**结果:** {'YES ✅' if market.get('result') ==1 else 'NO ❌'}"
+    
+    hash_short = market.get("content_hash", "")[:10]
+    message = f"""
 📊 **市场 #{hash_short}**
 
 **{market.get('title', 'N/A')}**
@@ -195,19 +232,74 @@ async def market_detail(update: Update, context: ContextTypes.DEFAULT_TYPE):
 • NO: {no_pool:.4f} MON ({no_odds:.1f}%)
 
 📍 创建者: `{market.get('creator_address', '')[:10]}...`
-"""
+{render_position(position, market)}"""
+    
+    keyboard = [
+        [InlineKeyboardButton("🎯 下注 YES", callback_data=f"bet_yes_{market.get('content_hash')}"),
+         InlineKeyboardButton("🎯 下注 NO", callback_data=f"bet_no_{market.get('content_hash')}")],
+        [InlineKeyboardButton("📊 查看所有市场", callback_data="markets")],
+    ]
+    reply_markup = InlineKeyboardMarkup(keyboard)
+    return message, reply_markup
+
+async def _load_market(content_hash: str):
+    market = market_catalog.get(content_hash)
+    if market is not None:
+        return market
+    result = await backend_client.get_market_by_hash(content_hash)
+    return result.get("data") if result.get("success") else None
+
+async def _viewer_position(telegram_id: int, content_hash: str):
+    async def lookup():
+        binding = await backend_client.get_binding(telegram_id)
+        if not binding.get("success"):
+            return None
+        wallet_address = binding.get("data", {}).get("wallet_address")
+        if not wallet_address:
+            return None
+        result = await backend_client.get_market_position(content_hash, wallet_address)
+        return result.get("data") if result.get("success") else None
+    
+    try:
+        return await asyncio.wait_for(lookup(), POSITION_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Position lookup for {content_hash} failed: {e}")
+        return None
+
+async def market_detail(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    content_hash = None
+    
+    if context.args:
+        content_hash = context.args[0]
+    elif update.callback_query:
+        content_hash = update.callback_query.data.split("_")[1]
+    
+    if not content_hash:
+        await update.message.reply_text("请提供市场内容哈希。用法: /market <content_hash>")
+        return
+    
+    try:
+        if update.effective_chat.type == "private":
+            market, position = await asyncio.gather(
+                _load_market(content_hash),
+                _viewer_position(update.effective_user.id, content_hash)
+            )
+        else:
+            market, position = await _load_market(content_hash), None
         
-        keyboard = [
-            [InlineKeyboardButton("🎯 下注 YES", callback_data=f"bet_yes_{content_hash}"),
-             InlineKeyboardButton("🎯 下注 NO", callback_data=f"bet_no_{content_hash}")],
-            [InlineKeyboardButton("📊 查看所有市场", callback_data="markets")],
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        if market is None:
+            await update.message.reply_text("市场不存在。")
+            return
         
+        def render():
+            return render_market_card(market_catalog.get(content_hash) or market, position)
+        
+        message, reply_markup = render_market_card(market, position)
         if update.callback_query:
-            await update.callback_query.edit_message_text(message, parse_mode="Markdown", reply_markup=reply_markup)
+            sent = await update.callback_query.edit_message_text(message, parse_mode="Markdown", reply_markup=reply_markup)
         else:
-            await update.message.reply_text(message, parse_mode="Markdown", reply_markup=reply_markup)
+            sent = await update.message.reply_text(message, parse_mode="Markdown", reply_markup=reply_markup)
+        live_cards.track(sent, message, [content_hash], render)
         
     except Exception as e:
         await update.message.reply_text(f"错误: {str(e)}")
@@ -362,27 +454,242 @@ async def resolved(update: Update, context: ContextTypes.DEFAULT_TYPE):
     except Exception as e:
         await update.message.reply_text(f"错误: {str(e)}")
 
-async def profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
+async def remind(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_id = update.effective_user.id
+    args = context.args or []
     
     try:
-        result = await backend_client.get_binding(telegram_id)
+        if not args:
+            reminders = reminder_service.reminders_for(telegram_id)
+            if not reminders:
+                await update.message.reply_text("暂无截止提醒。\n用法: /remind <market_id> [提前分钟数]")
+                return
+            
+            message = "⏰ **我的截止提醒**\n\n"
+            for at, item in reminders:
+                remind_at = datetime.fromtimestamp(at).strftime('%Y-%m-%d %H:%M')
+                message += f"🟢 #{item['content_hash'][:10]} {item.get('title', 'N/A')[:30]}\n"
+                message += f"   提醒时间: {remind_at}\n\n"
+            message += "取消提醒: /remind off <market_id>"
+            await update.message.reply_text(message, parse_mode="Markdown")
+            return
         
-        if not result.get("success"):
-            await update.message.reply_text("请先绑定钱包：/login")
+        if args[0] == "off":
+            if len(args) < 2:
+                await update.message.reply_text("用法: /remind off <market_id>")
+                return
+            if reminder_service.cancel(telegram_id, args[1]):
+                await update.message.reply_text("✅ 已取消截止提醒。")
+            else:
+                await update.message.reply_text("未找到该议题的截止提醒。")
             return
         
-        data = result.get("data", {})
-        wallet_address = data.get("wallet_address", "")
+        lead = None
+        if len(args) > 1:
+            try:
+                lead = float(args[1]) * 60
+            except ValueError:
+                await update.message.reply_text("提前分钟数必须是数字。")
+                return
         
-        result = await backend_client.get_user_profile(wallet_address)
+        market = await _load_market(args[0])
+        if market is None:
+            await update.message.reply_text("市场不存在。")
+            return
         
-        if not result.get("success"):
-            await update.message.reply_text("用户资料不存在。")
+        at = reminder_service.add(telegram_id, market, lead)
+        if at is None:
+            await update.message.reply_text("无法设置提醒：议题已截止或提醒数量已达上限。")
+            return
+        
+        remind_at = datetime.fromtimestamp(at).strftime('%Y-%m-%d %H:%M')
+        await update.message.reply_text(f"✅ 将在 {remind_at} 提醒你议题 #{args[0][:10]} 即将截止。")
+        
+    except Exception as e:
+        await update.message.reply_text(f"错误: {str(e)}")
+
+async def alert(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    telegram_id = update.effective_user.id
+    args = context.args or []
+    
+    try:
+        if not args:
+            alerts = odds_alerts.alerts_for(telegram_id)
+            if not alerts:
+                await update.message.reply_text("暂无赔率提醒。\n用法: /alert <market_id> <YES概率%> [yes/no]\n示例: /alert abc123... 70")
+                return
+            
+            message = "📈 **我的赔率提醒**\n\n"
+            for content_hash, direction, threshold in alerts:
+                market = market_catalog.get(content_hash) or {}
+                arrow = "升至" if direction == ABOVE else "降至"
+                message += f"🔔 #{content_hash[:10]} {market.get('title', 'N/A')[:30]}\n"
+                message += f"   YES 概率{arrow} {threshold:g}%\n\n"
+            message += "取消提醒: /alert off <market_id>"
+            await update.message.reply_text(message, parse_mode="Markdown")
+            return
+        
+        if args[0] == "off":
+            if len(args) < 2:
+                await update.message.reply_text("用法: /alert off <market_id>")
+                return
+            removed = odds_alerts.remove(telegram_id, args[1])
+            if removed:
+                await update.message.reply_text(f"✅ 已取消 {removed} 条赔率提醒。")
+            else:
+                await update.message.reply_text("未找到该议题的赔率提醒。")
             return
         
-        profile = result.get("data", {})
+        if len(args) < 2:
+            await update.message.reply_text("用法: /alert <market_id> <YES概率%> [yes/no]\n示例: /alert abc123... 70")
+            return
         
+        try:
+            threshold = float(args[1].rstrip("%"))
+        except ValueError:
+            await update.message.reply_text("概率阈值必须是数字。")
+            return
+        side = args[2].lower() if len(args) > 2 else "yes"
+        if side not in ["yes", "no"]:
+            await update.message.reply_text("方向必须是 yes 或 no")
+            return
+        if side == "no":
+            threshold = 100 - threshold
+        
+        market = await _load_market(args[0])
+        if market is None:
+            await update.message.reply_text("市场不存在。")
+            return
+        
+        direction = odds_alerts.add(telegram_id, market, threshold)
+        if direction is None:
+            await update.message.reply_text("无法设置提醒：议题不在交易中、阈值无效或提醒数量已达上限。")
+            return
+        
+        arrow = "升至" if direction == ABOVE else "降至"
+        await update.message.reply_text(
+            f"✅ 当 #{args[0][:10]} 的 YES 概率{arrow} {threshold:g}% 时提醒你 (当前 {yes_odds(market):.1f}%)。"
+        )
+        
+    except Exception as e:
+        await update.message.reply_text(f"错误: {str(e)}")
+
+async def digest(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    chat = update.effective_chat
+    args = context.args or []
+    
+    if chat.type not in ["group", "supergroup"]:
+        await update.message.reply_text("该命令仅可在群组中使用。")
+        return
+    
+    try:
+        if not args:
+            interval = group_digests.interval(chat.id)
+            if interval is None:
+                await update.message.reply_text("本群未订阅动态汇总。\n用法: /digest on [间隔分钟] | /digest off")
+            else:
+                await update.message.reply_text(f"📰 本群已订阅动态汇总，每 {interval / 60:g} 分钟推送一次。\n取消订阅: /digest off")
+            return
+        
+        member = await context.bot.get_chat_member(chat.id, update.effective_user.id)
+        if member.status not in [ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.OWNER]:
+            await update.message.reply_text("仅群管理员可以修改订阅。")
+            return
+        
+        if args[0] == "off":
+            if await group_digests.unsubscribe(chat.id):
+                await update.message.reply_text("✅ 已取消动态汇总订阅。")
+            else:
+                await update.message.reply_text("本群未订阅动态汇总。")
+            return
+        
+        if args[0] != "on":
+            await update.message.reply_text("用法: /digest on [间隔分钟] | /digest off")
+            return
+        
+        interval = None
+        if len(args) > 1:
+            try:
+                interval = float(args[1]) * 60
+            except ValueError:
+                await update.message.reply_text("间隔分钟数必须是数字。")
+                return
+        
+        interval = await group_digests.subscribe(chat.id, interval)
+        if interval is None:
+            await update.message.reply_text("订阅群组数量已达上限。")
+            return
+        
+        await update.message.reply_text(f"✅ 已订阅动态汇总：新议题与结算结果将每 {interval / 60:g} 分钟汇总推送一次。")
+        
+    except Exception as e:
+        await update.message.reply_text(f"错误: {str(e)}")
+
+MAX_SUMMARY_TOPICS = 5
+
+async def summary(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    chat = update.effective_chat
+    
+    if chat.type not in ["group", "supergroup"]:
+        await update.message.reply_text("该命令仅可在群组中使用。")
+        return
+    
+    buffer = group_ingestor.get(chat.id)
+    if buffer is None or (not buffer.summary and not buffer.topics):
+        await update.message.reply_text("本群暂无讨论摘要，稍后再试。")
+        return
+    
+    message = "🧠 群聊讨论摘要\n\n"
+    if buffer.summary:
+        message += f"{buffer.summary}\n"
+    if buffer.topics:
+        message += "\n💡 议题建议:\n"
+        for index, topic in enumerate(buffer.topics[:MAX_SUMMARY_TOPICS], 1):
+            message += f"{index}. {topic.get('question', 'N/A')}\n"
+            if topic.get("category"):
+                message += f"   分类: {topic['category']}\n"
+        message += "\n使用 /create 创建议题"
+    
+    await update.message.reply_text(message)
+
+PROFILE_RENDER_WAIT = 1.5
+PROFILE_PIECE_TIMEOUTS = {"profile": 5.0, "bets": 5.0, "feedback": 10.0}
+PROFILE_RECENT_BETS = 5
+PENDING = object()
+
+async def _piece(name: str, coro):
+    try:
+        result = await asyncio.wait_for(coro, PROFILE_PIECE_TIMEOUTS[name])
+    except Exception as e:
+        logger.warning(f"Profile piece {name} unavailable: {e}")
+        return None
+    return result.get("data") if result.get("success") else None
+
+async def _profile_feedback(wallet_address: str, profile_task: asyncio.Task, bets_task: asyncio.Task):
+    profile = await profile_task
+    if not profile:
+        return {"success": False}
+    bets = await bets_task
+    return await ai_client.get_emotional_feedback(
+        wallet_address,
+        int(profile.get("total_bets", 0)),
+        int(profile.get("win_bets", 0)),
+        int(profile.get("total_pnl", 0)),
+        recent_results((bets or {}).get("list", []))
+    )
+
+def render_profile(wallet_address: str, pieces: dict) -> str:
+    message = f"""
+👤 **用户资料**
+
+📍 钱包地址: `{wallet_address[:10]}...{wallet_address[-8:]}`
+"""
+    profile = pieces["profile"]
+    if profile is PENDING:
+        message += "\n📊 **统计数据:** ⏳ 加载中...\n"
+    elif profile is None:
+        message += "\n📊 **统计数据:** 用户资料不存在。\n"
+    else:
         win_rate = 0
         if profile.get("total_bets", 0) > 0:
             win_rate = profile.get("win_bets", 0) / profile.get("total_bets", 1) * 100
@@ -390,12 +697,7 @@ async def profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
         pnl = float(profile.get("total_pnl", 0)) / 1e18
         volume = float(profile.get("total_volume", 0)) / 1e18
         pnl_emoji = "📈" if pnl >= 0 else "📉"
-        
-        message = f"""
-👤 **用户资料**
-
-📍 钱包地址: `{wallet_address[:10]}...{wallet_address[-8:]}`
-
+        message += f"""
 📊 **统计数据:**
 • 总下注次数: {profile.get('total_bets', 0)}
 • 获胜次数: {profile.get('win_bets', 0)}
@@ -404,11 +706,84 @@ async def profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 {pnl_emoji} **盈亏:** {pnl:+.4f} MON
 """
+    
+    bets = pieces["bets"]
+    if bets is PENDING:
+        message += "\n🕑 **最近下注:** ⏳ 加载中...\n"
+    elif bets is None:
+        message += "\n🕑 **最近下注:** 暂不可用\n"
+    elif bets.get("list"):
+        message += "\n🕑 **最近下注:**\n"
+        tx_type_map = {1: "创建", 2: "下注", 3: "领奖", 4: "押金退款", 5: "退款"}
+        for bet in bets["list"][:PROFILE_RECENT_BETS]:
+            outcome = "YES" if bet.get("outcome") == 1 else "NO"
+            amount = float(bet.get("amount", 0)) / 1e18
+            tx_type = tx_type_map.get(bet.get("tx_type"), "其他")
+            message += f"📌 {tx_type}: {outcome} {amount:.4f} MON\n"
+    
+    feedback = pieces["feedback"]
+    if feedback is PENDING:
+        message += "\n💬 ⏳ 正在生成点评...\n"
+    elif feedback and feedback.get("feedback"):
+        message += f"\n💬 {escape_markdown(feedback['feedback'].strip())}\n"
+    return message
+
+async def _fill_profile(sent, wallet_address: str, pieces: dict, tasks: dict, reply_markup):
+    pending = {task: name for name, task in tasks.items() if not task.done()}
+    for future in asyncio.as_completed(pending):
+        await future
+        for name, task in tasks.items():
+            if task.done():
+                pieces[name] = task.result()
+        text = render_profile(wallet_address, pieces)
+        try:
+            await sent.edit_text(text, parse_mode="Markdown", reply_markup=reply_markup)
+        except BadRequest as e:
+            if "not modified" not in str(e):
+                logger.warning(f"Profile edit failed: {e}")
+
+async def profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    telegram_id = update.effective_user.id
+    
+    try:
+        result = await backend_client.get_binding(telegram_id)
+        
+        if not result.get("success"):
+            await update.message.reply_text("请先绑定钱包：/login")
+            return
+        
+        data = result.get("data", {})
+        wallet_address = data.get("wallet_address", "")
+        
+        profile_task = asyncio.create_task(_piece("profile", backend_client.get_user_profile(wallet_address)))
+        bets_task = asyncio.create_task(_piece(
+            "bets", backend_client.get_user_bets(wallet_address, page_size=PROFILE_RECENT_BETS * 2)
+        ))
+        feedback_task = asyncio.create_task(_piece(
+            "feedback", _profile_feedback(wallet_address, profile_task, bets_task)
+        ))
+        tasks = {"profile": profile_task, "bets": bets_task, "feedback": feedback_task}
+        deferred = getattr(update.message, "deferred", False)
+        await asyncio.wait(tasks.values(), timeout=None if deferred else PROFILE_RENDER_WAIT)
+        
+        pieces = {name: task.result() if task.done() else PENDING for name, task in tasks.items()}
+        if pieces["profile"] is None:
+            feedback_task.cancel()
+            await update.message.reply_text("用户资料不存在。")
+            return
+        
         keyboard = [
             [InlineKeyboardButton("📊 查看下注历史", callback_data=f"bets_{wallet_address}")],
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
-        await update.message.reply_text(message, parse_mode="Markdown", reply_markup=reply_markup)
+        sent = await update.message.reply_text(
+            render_profile(wallet_address, pieces), parse_mode="Markdown", reply_markup=reply_markup
+        )
+        if PENDING not in pieces.values():
+            return
+        context.application.create_task(
+            _fill_profile(sent, wallet_address, pieces, tasks, reply_markup), update=update
+        )
         
     except Exception as e:
         await update.message.reply_text(f"错误: {str(e)}")
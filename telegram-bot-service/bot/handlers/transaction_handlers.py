@@ -51,6 +51,8 @@ async def bet(update: Update, context: ContextTypes.DEFAULT_TYPE):
         keyboard = [
             [InlineKeyboardButton("🔐 点击确认下注", url=mini_app_url)],
         ]
+        if market.get("status") == 0:
+            keyboard.append([InlineKeyboardButton("⏰ 截止前提醒我", callback_data=f"remind_{market.get('content_hash', market_id)}")])
         reply_markup = InlineKeyboardMarkup(keyboard)
         await update.message.reply_text(message, parse_mode="Markdown", reply_markup=reply_markup)
         
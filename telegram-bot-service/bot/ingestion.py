@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+from bot.clients import ai_client
+from bot.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_NAME_CHARS = 32
+FLUSH_CONCURRENCY = 2
+
+class GroupMessage:
+    __slots__ = ("message_id", "user_name", "timestamp", "text")
+
+    def __init__(self, message_id: int, user_name: str, timestamp: float, text: str):
+        self.message_id = message_id
+        self.user_name = user_name
+        self.timestamp = timestamp
+        self.text = text
+
+    @property
+    def size(self) -> int:
+        return len(self.text) + len(self.user_name)
+
+    def render(self) -> str:
+        return f"{self.user_name}: {self.text}"
+
+class ChatBuffer:
+    __slots__ = ("chat_id", "messages", "pending", "chars", "last_flush", "summary", "topics")
+
+    def __init__(self, chat_id: int, capacity: int):
+        self.chat_id = chat_id
+        self.messages: deque = deque(maxlen=capacity)
+        self.pending = 0
+        self.chars = 0
+        self.last_flush = time.monotonic()
+        self.summary: Optional[str] = None
+        self.topics: List[Dict] = []
+
+    def append(self, record: GroupMessage) -> int:
+        evicted = 0
+        if len(self.messages) == self.messages.maxlen:
+            evicted = self.messages[0].size
+        self.messages.append(record)
+        self.pending = min(self.pending + 1, len(self.messages))
+        self.chars += record.size - evicted
+        return record.size - evicted
+
+    def delta(self) -> List[str]:
+        if not self.pending:
+            return []
+        return [record.render() for record in list(self.messages)[-self.pending:]]
+
+class GroupIngestor:
+    def __init__(
+        self,
+        buffer_size: int,
+        max_chats: int,
+        max_total_chars: int,
+        max_message_chars: int,
+        flush_interval: float,
+        min_batch: int,
+        max_delay: float
+    ):
+        self.buffer_size = buffer_size
+        self.max_chats = max_chats
+        self.max_total_chars = max_total_chars
+        self.max_message_chars = max_message_chars
+        self.flush_interval = flush_interval
+        self.min_batch = min_batch
+        self.max_delay = max_delay
+        self._buffers: "OrderedDict[int, ChatBuffer]" = OrderedDict()
+        self._chars = 0
+        self._task: Optional[asyncio.Task] = None
+        self.ingested = 0
+        self.evicted_chats = 0
+        self.flushed_batches = 0
+        self.failed_batches = 0
+
+    def add(self, chat_id: int, message_id: int, user_name: str, text: str, timestamp: Optional[float] = None):
+        text = text.strip()
+        if not text:
+            return
+
+        buffer = self._buffers.get(chat_id)
+        if buffer is None:
+            buffer = ChatBuffer(chat_id, self.buffer_size)
+            self._buffers[chat_id] = buffer
+        else:
+            self._buffers.move_to_end(chat_id)
+
+        record = GroupMessage(
+            message_id,
+            (user_name or "用户")[:MAX_NAME_CHARS],
+            timestamp or time.time(),
+            text[:self.max_message_chars]
+        )
+        self._chars += buffer.append(record)
+        self.ingested += 1
+        self._enforce_limits()
+
+    def _enforce_limits(self):
+        while len(self._buffers) > 1 and (
+            len(self._buffers) > self.max_chats or self._chars > self.max_total_chars
+        ):
+            _, buffer = self._buffers.popitem(last=False)
+            self._chars -= buffer.chars
+            self.evicted_chats += 1
+
+    def get(self, chat_id: int) -> Optional[ChatBuffer]:
+        return self._buffers.get(chat_id)
+
+    def _due(self, buffer: ChatBuffer, now: float) -> bool:
+        if buffer.pending >= self.min_batch:
+            return True
+        return buffer.pending > 0 and now - buffer.last_flush >= self.max_delay
+
+    async def flush(self):
+        now = time.monotonic()
+        due = [buffer for buffer in list(self._buffers.values()) if self._due(buffer, now)]
+        if not due:
+            return
+
+        semaphore = asyncio.Semaphore(FLUSH_CONCURRENCY)
+
+        async def flush_chat(buffer: ChatBuffer):
+            async with semaphore:
+                await self._flush_chat(buffer)
+
+        await asyncio.gather(*(flush_chat(buffer) for buffer in due))
+
+    async def _flush_chat(self, buffer: ChatBuffer):
+        pending = buffer.pending
+        discussions = buffer.delta()
+
+        try:
+            summary_result = await ai_client.summarize(discussions, chat_id=str(buffer.chat_id))
+            topics_result = await ai_client.generate_topics(discussions)
+        except Exception as e:
+            self.failed_batches += 1
+            logger.warning(f"Ingestion flush for chat {buffer.chat_id} failed: {e}")
+            return
+
+        if summary_result.get("success"):
+            buffer.summary = summary_result.get("data", {}).get("summary")
+        if topics_result.get("success"):
+            buffer.topics = topics_result.get("data", [])
+
+        buffer.pending = max(0, buffer.pending - pending)
+        buffer.last_flush = time.monotonic()
+        self.flushed_batches += 1
+        logger.info(
+            f"Ingested {len(discussions)} messages from chat {buffer.chat_id}, "
+            f"{len(buffer.topics)} topic suggestions"
+        )
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Ingestion flush failed: {e}")
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "chats": len(self._buffers),
+            "chars": self._chars,
+            "ingested": self.ingested,
+            "evicted_chats": self.evicted_chats,
+            "flushed_batches": self.flushed_batches,
+            "failed_batches": self.failed_batches
+        }
+
+group_ingestor = GroupIngestor(
+    buffer_size=settings.INGEST_BUFFER_SIZE,
+    max_chats=settings.INGEST_MAX_CHATS,
+    max_total_chars=settings.INGEST_MAX_TOTAL_CHARS,
+    max_message_chars=settings.INGEST_MAX_MESSAGE_CHARS,
+    flush_interval=settings.INGEST_FLUSH_INTERVAL,
+    min_batch=settings.INGEST_MIN_BATCH,
+    max_delay=settings.INGEST_MAX_DELAY
+)
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+from telegram import Bot, InlineKeyboardMarkup, Message
+from telegram.error import BadRequest
+from bot.config import settings
+from bot.market_catalog import market_catalog
+from bot.sender import sender
+
+logger = logging.getLogger(__name__)
+
+LIVE_FIELDS = ("total_yes_pool", "total_no_pool", "status", "result")
+
+CardKey = Tuple[int, int]
+CardRenderer = Callable[[], Tuple[str, Optional[InlineKeyboardMarkup]]]
+
+class _Card:
+    __slots__ = ("hashes", "render", "text", "expires")
+
+    def __init__(self, hashes: Set[str], render: CardRenderer, text: str, expires: float):
+        self.hashes = hashes
+        self.render = render
+        self.text = text
+        self.expires = expires
+
+class LiveCardRegistry:
+    def __init__(self, debounce: float, ttl: float, max_cards: int):
+        self.debounce = debounce
+        self.ttl = ttl
+        self.max_cards = max_cards
+        self._cards: "OrderedDict[CardKey, _Card]" = OrderedDict()
+        self._by_market: Dict[str, Set[CardKey]] = {}
+        self._due: Dict[CardKey, float] = {}
+        self._wakeup = asyncio.Event()
+        self._bot: Optional[Bot] = None
+        self._task: Optional[asyncio.Task] = None
+        self.changes = 0
+        self.edits = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def track(self, message: Optional[Message], text: str, hashes: Iterable[str], render: CardRenderer):
+        if message is None or not isinstance(message, Message):
+            return
+        key = (message.chat_id, message.message_id)
+        self.untrack(key)
+        card = _Card(set(hashes), render, text, time.monotonic() + self.ttl)
+        self._cards[key] = card
+        for content_hash in card.hashes:
+            self._by_market.setdefault(content_hash, set()).add(key)
+        while len(self._cards) > self.max_cards:
+            self.untrack(next(iter(self._cards)))
+
+    def untrack(self, key: CardKey):
+        card = self._cards.pop(key, None)
+        if card is None:
+            return
+        self._due.pop(key, None)
+        for content_hash in card.hashes:
+            keys = self._by_market.get(content_hash)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_market[content_hash]
+
+    def on_market(self, market: Dict, previous: Optional[Dict] = None):
+        if previous is None or all(market.get(f) == previous.get(f) for f in LIVE_FIELDS):
+            return
+        keys = self._by_market.get(market.get("content_hash"))
+        if not keys:
+            return
+        self.changes += 1
+        due = time.monotonic() + self.debounce
+        for key in keys:
+            self._due.setdefault(key, due)
+        self._wakeup.set()
+
+    async def _edit(self, key: CardKey, text: str, reply_markup: Optional[InlineKeyboardMarkup]):
+        try:
+            await self._bot.edit_message_text(
+                text,
+                chat_id=key[0],
+                message_id=key[1],
+                parse_mode="Markdown",
+                reply_markup=reply_markup
+            )
+            self.edits += 1
+        except BadRequest as e:
+            if "not modified" not in str(e):
+                self.dropped += 1
+                self.untrack(key)
+
+    def _flush(self, now: float):
+        for key in [key for key, due in self._due.items() if due <= now]:
+            del self._due[key]
+            card = self._cards.get(key)
+            if card is None:
+                continue
+            if card.expires <= now:
+                self.untrack(key)
+                continue
+            try:
+                text, reply_markup = card.render()
+            except Exception as e:
+                logger.warning(f"Live card render failed for {key}: {e}")
+                continue
+            if text == card.text:
+                continue
+            card.text = text
+            sender.submit(
+                key[0],
+                lambda key=key, text=text, reply_markup=reply_markup: self._edit(key, text, reply_markup),
+                key=("card", key)
+            )
+
+    async def _run(self):
+        while True:
+            now = time.monotonic()
+            self._flush(now)
+            self._wakeup.clear()
+            timeout = min(self._due.values()) - now if self._due else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self, bot: Bot):
+        self._bot = bot
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict:
+        return {
+            "cards": len(self._cards),
+            "markets": len(self._by_market),
+            "pending": len(self._due),
+            "changes": self.changes,
+            "edits": self.edits,
+            "dropped": self.dropped
+        }
+
+live_cards = LiveCardRegistry(
+    debounce=settings.LIVE_CARD_DEBOUNCE,
+    ttl=settings.LIVE_CARD_TTL,
+    max_cards=settings.LIVE_CARD_MAX_MESSAGES
+)
+market_catalog.subscribe(live_cards.on_market)
@@ -1,17 +1,30 @@
 import logging
 import sys
-from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, filters
+from telegram.ext import (
+    Application, CommandHandler, CallbackQueryHandler, InlineQueryHandler, MessageHandler, filters
+)
 from telegram.request import HTTPXRequest
 
 from bot.handlers.telegram_handlers import (
-    start, help_command, login, logout, markets, market_detail,
-    mybets, claimable, refundable, resolved, profile, balance
+    start, help_command, login, logout, markets, market_detail, search,
+    mybets, claimable, refundable, resolved, remind, alert, digest, summary, profile, balance
 )
 from bot.handlers.transaction_handlers import (
     bet, claim, refund, create, resolve, cancel, deposit, hot, create_guide
 )
+from bot.handlers.admin_handlers import broadcast
 from bot.handlers.callback_handler import callback_handler
 from bot.handlers.ai_handler import handle_message
+from bot.handlers.inline_handler import inline_query
+from bot.alerts import odds_alerts
+from bot.broadcast import broadcast_engine
+from bot.digests import group_digests
+from bot.ingestion import group_ingestor
+from bot.live_cards import live_cards
+from bot.market_catalog import market_catalog
+from bot.reminders import reminder_service
+from bot.resolution_watcher import resolution_watcher
+from bot.sender import sender
 from bot.config import settings
 
 logging.basicConfig(
@@ -20,6 +33,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def post_init(application: Application):
+    await sender.start()
+    await market_catalog.start()
+    await live_cards.start(application.bot)
+    await reminder_service.start(application.bot)
+    await odds_alerts.start(application.bot)
+    await group_digests.start(application.bot)
+    await broadcast_engine.start(application.bot)
+    if settings.RESOLUTION_WATCH_ENABLED:
+        await resolution_watcher.start(application.bot)
+    if settings.INGEST_ENABLED:
+        await group_ingestor.start()
+
+async def post_stop(application: Application):
+    await broadcast_engine.stop()
+    await group_ingestor.stop()
+    await resolution_watcher.stop()
+    await reminder_service.stop()
+    await odds_alerts.stop()
+    await group_digests.stop()
+    await live_cards.stop()
+    await market_catalog.stop()
+    await sender.stop()
+
 def main():
     if not settings.TELEGRAM_BOT_TOKEN:
         logger.error("TELEGRAM_BOT_TOKEN is not set!")
@@ -38,7 +75,7 @@ def main():
     
     application = Application.builder().token(
         settings.TELEGRAM_BOT_TOKEN
-    ).request(request).build()
+    ).request(request).post_init(post_init).post_stop(post_stop).build()
     
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", help_command))
@@ -46,10 +83,16 @@ def main():
     application.add_handler(CommandHandler("logout", logout))
     application.add_handler(CommandHandler("markets", markets))
     application.add_handler(CommandHandler("market", market_detail))
+    application.add_handler(CommandHandler("search", search))
     application.add_handler(CommandHandler("mybets", mybets))
     application.add_handler(CommandHandler("claimable", claimable))
     application.add_handler(CommandHandler("refundable", refundable))
     application.add_handler(CommandHandler("resolved", resolved))
+    application.add_handler(CommandHandler("remind", remind))
+    application.add_handler(CommandHandler("alert", alert))
+    application.add_handler(CommandHandler("digest", digest))
+    application.add_handler(CommandHandler("summary", summary))
+    application.add_handler(CommandHandler("broadcast", broadcast))
     application.add_handler(CommandHandler("bet", bet))
     application.add_handler(CommandHandler("claim", claim))
     application.add_handler(CommandHandler("refund", refund))
@@ -62,12 +105,13 @@ def main():
     application.add_handler(CommandHandler("hot", hot))
     
     application.add_handler(CallbackQueryHandler(callback_handler))
+    application.add_handler(InlineQueryHandler(inline_query))
     
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
     
     logger.info("Starting Telegram bot...")
     application.run_polling(
-        allowed_updates=['message', 'callback_query'],
+        allowed_updates=['message', 'callback_query', 'inline_query'],
         drop_pending_updates=True,
         poll_interval=1.0,
         timeout=30
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+import httpx
+from bot.config import settings
+from bot.market_feed import MarketFeed
+
+logger = logging.getLogger(__name__)
+
+CATALOG_PAGE_SIZE = 200
+
+MarketListener = Callable[[Dict, Optional[Dict]], None]
+
+class MarketCatalog:
+    def __init__(self, refresh_interval: float, page_size: int = CATALOG_PAGE_SIZE):
+        self.refresh_interval = refresh_interval
+        self.page_size = page_size
+        self.markets: Dict[str, Dict] = {}
+        self._listeners: List[MarketListener] = []
+        self._feed = MarketFeed(page_size)
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.last_refresh: Optional[float] = None
+
+    def subscribe(self, listener: MarketListener):
+        self._listeners.append(listener)
+        for market in self.markets.values():
+            listener(market, None)
+
+    def get(self, content_hash: str) -> Optional[Dict]:
+        return self.markets.get(content_hash)
+
+    def apply(self, market: Dict):
+        content_hash = market.get("content_hash")
+        if not content_hash:
+            return
+        previous = self.markets.get(content_hash)
+        self.markets[content_hash] = market
+        for listener in self._listeners:
+            try:
+                listener(market, previous)
+            except Exception as e:
+                logger.warning(f"Market listener failed for {content_hash}: {e}")
+
+    async def refresh(self) -> int:
+        async with self._lock:
+            async with httpx.AsyncClient() as client:
+                changed = await self._feed.poll(client, settings.BACKEND_API_URL, self.apply)
+            self.refreshes += 1
+            self.last_refresh = time.time()
+            return changed
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"Market catalog refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict:
+        return {
+            "markets": len(self.markets),
+            "cursor": self._feed.cursor,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "last_refresh": self.last_refresh
+        }
+
+market_catalog = MarketCatalog(refresh_interval=settings.MARKET_REFRESH_INTERVAL)
@@ -0,0 +1,36 @@
+from typing import Callable, Dict, Tuple
+import httpx
+
+FEED_EPOCH = "1970-01-01T00:00:00Z"
+
+class MarketFeed:
+    def __init__(self, page_size: int):
+        self.page_size = page_size
+        self.updated_after = FEED_EPOCH
+        self.after_id = 0
+
+    @property
+    def cursor(self) -> Tuple[str, int]:
+        return self.updated_after, self.after_id
+
+    async def poll(self, client: httpx.AsyncClient, base_url: str, apply: Callable[[Dict], None]) -> int:
+        changed = 0
+        while True:
+            response = await client.get(
+                f"{base_url.rstrip('/')}/api/v1/markets",
+                params={
+                    "page_size": self.page_size,
+                    "updated_after": self.updated_after,
+                    "after_id": self.after_id
+                }
+            )
+            response.raise_for_status()
+            items = (response.json().get("data") or {}).get("list") or []
+            for market in items:
+                apply(market)
+            changed += len(items)
+            if items:
+                self.updated_after = items[-1]["updated_at"]
+                self.after_id = items[-1]["id"]
+            if len(items) < self.page_size:
+                return changed
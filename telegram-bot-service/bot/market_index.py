@@ -0,0 +1,224 @@
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from bot.market_catalog import market_catalog
+
+ACTIVE_STATUS = 0
+QUERY_CACHE_SIZE = 1024
+MAX_QUERY_CHARS = 64
+INDEXED_FIELDS = ("title", "category", "status", "total_yes_pool", "total_no_pool", "deadline")
+
+_RUN_RE = re.compile(
+    "([\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\U00020000-\U0002fa1f]+)|([a-z0-9]+)"
+)
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower().strip()[:MAX_QUERY_CHARS]
+
+def query_runs(text: str) -> List[Tuple[str, bool]]:
+    return [(wide or word, bool(wide)) for wide, word in _RUN_RE.findall(text)]
+
+def _bigrams(run: str) -> Set[str]:
+    return {run[i:i + 2] for i in range(len(run) - 1)}
+
+def pool_total(market: Dict) -> int:
+    return int(market.get("total_yes_pool") or 0) + int(market.get("total_no_pool") or 0)
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: Set[str] = set()
+
+class _Entry:
+    __slots__ = ("market", "text", "words", "chars", "bigrams")
+
+    def __init__(self, market: Dict):
+        self.market = market
+        self.text = normalize(f"{market.get('title') or ''} {market.get('category') or ''}")
+        runs = query_runs(self.text)
+        self.words = {run for run, wide in runs if not wide}
+        self.chars = {char for run, wide in runs if wide for char in run}
+        self.bigrams = set().union(*(_bigrams(run) for run, wide in runs if wide))
+
+    def matches(self, runs: Iterable[Tuple[str, bool]]) -> bool:
+        for run, wide in runs:
+            if wide:
+                if run not in self.text:
+                    return False
+            elif not any(word.startswith(run) for word in self.words):
+                return False
+        return True
+
+class InlineMarketIndex:
+    def __init__(self, cache_size: int = QUERY_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._entries: Dict[str, _Entry] = {}
+        self._trie = _TrieNode()
+        self._chars: Dict[str, Set[str]] = {}
+        self._bigrams: Dict[str, Set[str]] = {}
+        self._cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._cached_keys: Dict[str, Set[str]] = {}
+        self._ranked: Optional[List[str]] = None
+        self.queries = 0
+        self.cache_hits = 0
+        self.prefix_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def on_market(self, market: Dict, previous: Optional[Dict] = None):
+        content_hash = market.get("content_hash")
+        if not content_hash:
+            return
+        if previous is not None and all(market.get(f) == previous.get(f) for f in INDEXED_FIELDS):
+            return
+        if market.get("status") == ACTIVE_STATUS:
+            self.upsert(market)
+        else:
+            self.remove(content_hash)
+
+    def upsert(self, market: Dict):
+        content_hash = market["content_hash"]
+        previous = self._unindex(content_hash)
+        entry = _Entry(market)
+        self._entries[content_hash] = entry
+
+        for word in entry.words:
+            node = self._trie
+            for char in word:
+                node = node.children.setdefault(char, _TrieNode())
+                node.ids.add(content_hash)
+        for char in entry.chars:
+            self._chars.setdefault(char, set()).add(content_hash)
+        for bigram in entry.bigrams:
+            self._bigrams.setdefault(bigram, set()).add(content_hash)
+        self._invalidate(content_hash, entry if previous is None or previous.text != entry.text else None)
+
+    def remove(self, content_hash: str):
+        if self._unindex(content_hash) is not None:
+            self._invalidate(content_hash)
+
+    def _unindex(self, content_hash: str) -> Optional[_Entry]:
+        entry = self._entries.pop(content_hash, None)
+        if entry is None:
+            return None
+
+        for word in entry.words:
+            path = [self._trie]
+            for char in word:
+                node = path[-1].children.get(char)
+                if node is None:
+                    break
+                node.ids.discard(content_hash)
+                path.append(node)
+            for parent, char in zip(reversed(path[:-1]), reversed(word[:len(path) - 1])):
+                child = parent.children[char]
+                if child.ids or child.children:
+                    break
+                del parent.children[char]
+        for postings, keys in ((self._chars, entry.chars), (self._bigrams, entry.bigrams)):
+            for key in keys:
+                ids = postings.get(key)
+                if ids is not None:
+                    ids.discard(content_hash)
+                    if not ids:
+                        del postings[key]
+        return entry
+
+    def _invalidate(self, content_hash: str, added: Optional[_Entry] = None):
+        self._ranked = None
+        stale = set(self._cached_keys.get(content_hash, ()))
+        if added is not None:
+            stale.update(key for key in self._cache if added.matches(query_runs(key)))
+        for key in stale:
+            self._drop(key)
+
+    def _store(self, key: str, ids: List[str]):
+        self._cache[key] = ids
+        for content_hash in ids:
+            self._cached_keys.setdefault(content_hash, set()).add(key)
+        if len(self._cache) > self.cache_size:
+            self._drop(next(iter(self._cache)))
+
+    def _drop(self, key: str):
+        for content_hash in self._cache.pop(key, ()):
+            keys = self._cached_keys[content_hash]
+            keys.discard(key)
+            if not keys:
+                del self._cached_keys[content_hash]
+
+    def _prefix(self, word: str) -> Set[str]:
+        node = self._trie
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return set()
+        return node.ids
+
+    def _run_candidates(self, run: str, wide: bool) -> Set[str]:
+        if not wide:
+            return self._prefix(run)
+        if len(run) == 1:
+            return self._chars.get(run, set())
+        sets = sorted((self._bigrams.get(bigram, set()) for bigram in _bigrams(run)), key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def _rank(self, ids: Iterable[str]) -> List[str]:
+        return sorted(ids, key=lambda content_hash: -pool_total(self._entries[content_hash].market))
+
+    def _all_ranked(self) -> List[str]:
+        if self._ranked is None:
+            self._ranked = self._rank(self._entries)
+        return self._ranked
+
+    def _lookup(self, key: str) -> List[str]:
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+
+        runs = query_runs(key)
+        if not runs:
+            return self._all_ranked()
+
+        for end in range(len(key) - 1, 0, -1):
+            base = self._cache.get(key[:end])
+            if base is not None:
+                self.prefix_hits += 1
+                ids = [
+                    content_hash for content_hash in base
+                    if self._entries[content_hash].matches(runs)
+                ]
+                break
+        else:
+            sets = sorted((self._run_candidates(run, wide) for run, wide in runs), key=len)
+            ids = self._rank(
+                content_hash for content_hash in sets[0].intersection(*sets[1:])
+                if self._entries[content_hash].matches(runs)
+            )
+
+        self._store(key, ids)
+        return ids
+
+    def search(self, query: str, offset: int = 0, limit: int = 10) -> Tuple[List[Dict], Optional[int]]:
+        self.queries += 1
+        ids = self._lookup(normalize(query))
+        page = [self._entries[content_hash].market for content_hash in ids[offset:offset + limit]]
+        next_offset = offset + limit if offset + limit < len(ids) else None
+        return page, next_offset
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "markets": len(self._entries),
+            "cached_queries": len(self._cache),
+            "queries": self.queries,
+            "cache_hits": self.cache_hits,
+            "prefix_hits": self.prefix_hits
+        }
+
+inline_market_index = InlineMarketIndex()
+market_catalog.subscribe(inline_market_index.on_market)
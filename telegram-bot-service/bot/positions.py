@@ -0,0 +1,78 @@
+from typing import Dict, List, Optional, Tuple
+from bot.market_catalog import market_catalog
+
+TX_TYPE_BET = 2
+TX_TYPE_CLAIM = 3
+MARKET_RESOLVED = 2
+MARKET_CANCELLED = 3
+RESULT_YES = 1
+RESULT_NO = 2
+TOTAL_FEE_BPS = 500
+
+def bet_result(bet: Dict, market: Optional[Dict]) -> Optional[str]:
+    if bet.get("tx_type") == TX_TYPE_CLAIM:
+        return "win"
+    if bet.get("tx_type") != TX_TYPE_BET:
+        return None
+    status = market.get("status") if market else bet.get("market_status")
+    result = market.get("result") if market else bet.get("market_result")
+    if status != MARKET_RESOLVED or result not in (RESULT_YES, RESULT_NO):
+        return None
+    won = (bet.get("outcome") == 1) == (result == RESULT_YES)
+    return "win" if won else "lose"
+
+def recent_results(bets: List[Dict]) -> List[str]:
+    results = []
+    seen = set()
+    for bet in bets:
+        content_hash = bet.get("content_hash")
+        if content_hash in seen:
+            continue
+        result = bet_result(bet, market_catalog.get(content_hash))
+        if result is not None:
+            seen.add(content_hash)
+            results.append(result)
+    return list(reversed(results))
+
+def estimated_payout(amount: int, bet_yes: bool, market: Dict) -> int:
+    yes_pool = int(market.get("total_yes_pool") or 0)
+    no_pool = int(market.get("total_no_pool") or 0)
+    winning_pool = yes_pool if bet_yes else no_pool
+    if winning_pool <= 0:
+        return 0
+    total_pool = yes_pool + no_pool
+    distributable = total_pool - total_pool * TOTAL_FEE_BPS // 10000
+    return amount * distributable // winning_pool
+
+def position_sides(position: Optional[Dict]) -> List[Tuple[bool, int, int]]:
+    if not position:
+        return []
+    sides = [
+        (True, int(position.get("yes_amount") or 0), int(position.get("yes_count") or 0)),
+        (False, int(position.get("no_amount") or 0), int(position.get("no_count") or 0))
+    ]
+    return [side for side in sides if side[1] > 0]
+
+def render_position(position: Optional[Dict], market: Dict) -> str:
+    sides = position_sides(position)
+    if not sides:
+        return ""
+    holdings = " / ".join(
+        f"{'YES' if bet_yes else 'NO'} {amount / 1e18:.4f} MON ({count} 笔)" for bet_yes, amount, count in sides
+    )
+    message = f"\n🎯 **我的持仓:** {holdings}\n"
+    status = market.get("status")
+    if status == MARKET_CANCELLED:
+        refund = sum(amount for _, amount, _ in sides)
+        return message + f"↩️ 市场已取消，可退款 {refund / 1e18:.4f} MON\n"
+    if status == MARKET_RESOLVED:
+        yes_won = market.get("result") == RESULT_YES
+        won = sum(amount for bet_yes, amount, _ in sides if bet_yes == yes_won)
+        if won:
+            return message + f"🏆 已获胜，奖金 {estimated_payout(won, yes_won, market) / 1e18:.4f} MON\n"
+        return message + "❌ 未猜中\n"
+    return message + "".join(
+        f"💵 预计回报: {estimated_payout(amount, bet_yes, market) / 1e18:.4f} MON "
+        f"(若 {'YES' if bet_yes else 'NO'} 获胜，按当前奖池)\n"
+        for bet_yes, amount, _ in sides
+    )
@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+from bot.config import settings
+from bot.market_catalog import market_catalog
+from bot.scheduler import TimingWheel
+from bot.sender import sender
+from bot.storage import load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+MARKET_ACTIVE = 0
+STORE_VERSION = 1
+MAX_NOTICE_MARKETS = 10
+
+def _remaining(seconds: float) -> str:
+    minutes = max(1, int(seconds // 60))
+    if minutes < 60:
+        return f"{minutes} 分钟"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} 小时 {minutes} 分钟" if minutes else f"{hours} 小时"
+
+def render_reminder(items: List[Dict], now: float) -> Tuple[str, InlineKeyboardMarkup]:
+    message = "⏰ **议题即将截止**\n\n"
+    keyboard = []
+
+    for item in sorted(items, key=lambda item: item["deadline"])[:MAX_NOTICE_MARKETS]:
+        content_hash = item["content_hash"][:10]
+        message += f"🟢 #{content_hash} {item.get('title', 'N/A')[:30]}\n"
+        message += f"   剩余: {_remaining(item['deadline'] - now)}\n\n"
+        keyboard.append([InlineKeyboardButton(f"#{content_hash}", callback_data=f"market_{item['content_hash']}")])
+
+    if len(items) > MAX_NOTICE_MARKETS:
+        message += f"…另有 {len(items) - MAX_NOTICE_MARKETS} 个议题即将截止\n"
+
+    return message, InlineKeyboardMarkup(keyboard)
+
+class ReminderService:
+    def __init__(self, lead: float, tick: float, path: str, save_interval: float, max_per_user: int):
+        self.lead = lead
+        self.path = path
+        self.save_interval = save_interval
+        self.max_per_user = max_per_user
+        self.wheel = TimingWheel(tick)
+        self._by_market: Dict[str, Set[int]] = {}
+        self._by_user: Dict[int, Set[str]] = {}
+        self._dirty = False
+        self._saved_at = 0.0
+        self._wakeup = asyncio.Event()
+        self._bot: Optional[Bot] = None
+        self._task: Optional[asyncio.Task] = None
+        self.fired = 0
+        self.batches = 0
+        self.skipped = 0
+
+    def __len__(self) -> int:
+        return len(self.wheel)
+
+    def _index(self, telegram_id: int, content_hash: str):
+        self._by_market.setdefault(content_hash, set()).add(telegram_id)
+        self._by_user.setdefault(telegram_id, set()).add(content_hash)
+
+    def _unindex(self, telegram_id: int, content_hash: str):
+        for index, outer, inner in ((self._by_market, content_hash, telegram_id), (self._by_user, telegram_id, content_hash)):
+            keys = index.get(outer)
+            if keys is not None:
+                keys.discard(inner)
+                if not keys:
+                    del index[outer]
+
+    def _schedule(self, telegram_id: int, item: Dict, at: float):
+        self.wheel.add((telegram_id, item["content_hash"]), at, item)
+        self._index(telegram_id, item["content_hash"])
+        self._dirty = True
+
+    def add(self, telegram_id: int, market: Dict, lead: Optional[float] = None) -> Optional[float]:
+        content_hash = market.get("content_hash")
+        deadline = int(market.get("deadline") or 0)
+        now = time.time()
+        if not content_hash or market.get("status") != MARKET_ACTIVE or deadline <= now:
+            return None
+        user_markets = self._by_user.get(telegram_id, ())
+        if content_hash not in user_markets and len(user_markets) >= self.max_per_user:
+            return None
+        at = max(now, deadline - (self.lead if lead is None else lead))
+        self._schedule(telegram_id, {"content_hash": content_hash, "title": market.get("title", ""), "deadline": deadline}, at)
+        self._wakeup.set()
+        return at
+
+    def cancel(self, telegram_id: int, content_hash: str) -> bool:
+        if not self.wheel.cancel((telegram_id, content_hash)):
+            return False
+        self._unindex(telegram_id, content_hash)
+        self._dirty = True
+        return True
+
+    def reminders_for(self, telegram_id: int) -> List[Tuple[float, Dict]]:
+        entries = [self.wheel.get((telegram_id, content_hash)) for content_hash in self._by_user.get(telegram_id, ())]
+        return sorted(((at, item) for _, at, item in filter(None, entries)), key=lambda entry: entry[0])
+
+    def on_market(self, market: Dict, previous: Optional[Dict] = None):
+        if market.get("status") == MARKET_ACTIVE:
+            return
+        content_hash = market.get("content_hash")
+        for telegram_id in list(self._by_market.get(content_hash, ())):
+            self.cancel(telegram_id, content_hash)
+
+    def fire(self, now: float) -> int:
+        due: Dict[int, List[Dict]] = {}
+        for (telegram_id, content_hash), _, item in self.wheel.advance(now):
+            self._unindex(telegram_id, content_hash)
+            self._dirty = True
+            market = market_catalog.get(content_hash)
+            if item["deadline"] <= now or (market is not None and market.get("status") != MARKET_ACTIVE):
+                self.skipped += 1
+                continue
+            due.setdefault(telegram_id, []).append(item)
+
+        for telegram_id, items in due.items():
+            message, reply_markup = render_reminder(items, now)
+            sender.submit(
+                telegram_id,
+                lambda telegram_id=telegram_id, message=message, reply_markup=reply_markup: self._bot.send_message(
+                    telegram_id, message, parse_mode="Markdown", reply_markup=reply_markup
+                )
+            )
+            self.fired += len(items)
+        if due:
+            self.batches += 1
+        return len(due)
+
+    def load(self) -> int:
+        data = load_json(self.path)
+        if not isinstance(data, dict) or data.get("version") != STORE_VERSION:
+            return 0
+
+        now = time.time()
+        loaded = 0
+        for telegram_id, at, item in data.get("reminders", []):
+            if item.get("deadline", 0) <= now:
+                continue
+            self._schedule(int(telegram_id), item, at)
+            loaded += 1
+        self._dirty = False
+        return loaded
+
+    def _payload(self) -> Dict:
+        return {
+            "version": STORE_VERSION,
+            "reminders": [[telegram_id, at, item] for (telegram_id, _), at, item in self.wheel.entries()]
+        }
+
+    async def save(self):
+        payload = self._payload()
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        if not await save_json(self.path, payload):
+            self._dirty = True
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                self.fire(time.time())
+                if self._dirty and time.monotonic() - self._saved_at >= self.save_interval:
+                    await self.save()
+            except Exception as e:
+                logger.warning(f"Reminder tick failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.wheel.tick)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self, bot: Bot):
+        self._bot = bot
+        if self._task is None:
+            loaded = self.load()
+            if loaded:
+                logger.info(f"Loaded {loaded} reminders from {self.path}")
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._dirty:
+            await self.save()
+
+    def snapshot(self) -> Dict:
+        return {
+            "reminders": len(self.wheel),
+            "users": len(self._by_user),
+            "markets": len(self._by_market),
+            "fired": self.fired,
+            "batches": self.batches,
+            "skipped": self.skipped
+        }
+
+reminder_service = ReminderService(
+    lead=settings.REMINDER_LEAD,
+    tick=settings.REMINDER_TICK,
+    path=os.path.join(settings.DATA_DIR, "reminders.json"),
+    save_interval=settings.REMINDER_SAVE_INTERVAL,
+    max_per_user=settings.REMINDER_MAX_PER_USER
+)
+market_catalog.subscribe(reminder_service.on_market)
@@ -0,0 +1,177 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+from bot.clients import backend_client
+from bot.config import settings
+from bot.market_catalog import market_catalog
+from bot.positions import MARKET_CANCELLED, MARKET_RESOLVED, RESULT_YES, estimated_payout
+from bot.sender import sender
+
+logger = logging.getLogger(__name__)
+
+WATCH_PAGE_SIZE = 50
+RECIPIENT_PAGE_SIZE = 500
+MAX_SEEN_MARKETS = 10000
+MAX_NOTICE_MARKETS = 10
+
+WATCHED_STATUSES = {"resolved": MARKET_RESOLVED, "cancelled": MARKET_CANCELLED}
+
+Notice = Tuple[Dict, Dict]
+
+def render_notice(notices: List[Notice]) -> Tuple[str, InlineKeyboardMarkup]:
+    message = "🔔 **议题结果通知**\n\n"
+    keyboard = []
+
+    for market, recipient in notices[:MAX_NOTICE_MARKETS]:
+        full_hash = market.get('content_hash', '')
+        content_hash = full_hash[:10]
+        title = market.get('title', 'N/A')[:30]
+
+        if market.get('status') == MARKET_CANCELLED:
+            amount = int(recipient.get('bet_amount') or 0) + int(recipient.get('deposit_amount') or 0)
+            message += f"🔴 #{content_hash} {title}\n"
+            message += f"   议题已取消，可退款 {amount / 1e18:.4f} MON\n\n"
+            keyboard.append([InlineKeyboardButton(f"💰 #{content_hash} 退款", callback_data=f"refund_{full_hash}")])
+        else:
+            amount = int(recipient.get('bet_amount') or 0)
+            payout = estimated_payout(amount, recipient.get('bet_outcome') == RESULT_YES, market) / 1e18
+            result_emoji = "YES ✅" if market.get('result') == RESULT_YES else "NO ❌"
+            message += f"🟢 #{content_hash} {title}\n"
+            message += f"   结果: {result_emoji}，可领取约 {payout:.4f} MON\n\n"
+            keyboard.append([InlineKeyboardButton(f"💰 #{content_hash} 领取", callback_data=f"claim_{full_hash}")])
+
+    if len(notices) > MAX_NOTICE_MARKETS:
+        message += f"…另有 {len(notices) - MAX_NOTICE_MARKETS} 个议题，使用 /claimable 或 /refundable 查看\n"
+
+    return message, InlineKeyboardMarkup(keyboard)
+
+class ResolutionWatcher:
+    def __init__(self, interval: float, page_size: int = WATCH_PAGE_SIZE):
+        self.interval = interval
+        self.page_size = page_size
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._seeded: set = set()
+        self._retry: Dict[str, Dict] = {}
+        self._wakeup = asyncio.Event()
+        self._bot: Optional[Bot] = None
+        self._task: Optional[asyncio.Task] = None
+        self.polls = 0
+        self.markets = 0
+        self.notified = 0
+        self.failures = 0
+
+    def _remember(self, content_hash: str):
+        self._seen[content_hash] = None
+        self._seen.move_to_end(content_hash)
+        while len(self._seen) > MAX_SEEN_MARKETS:
+            self._seen.popitem(last=False)
+
+    def on_market(self, market: Dict, previous: Optional[Dict] = None):
+        if previous is None or market.get("status") == previous.get("status"):
+            return
+        if market.get("status") in WATCHED_STATUSES.values():
+            self._wakeup.set()
+
+    async def _new_markets(self, status: str) -> List[Dict]:
+        fresh = []
+        page = 1
+        while True:
+            result = await backend_client.get_resolved_markets(page=page, page_size=self.page_size, status=status)
+            items = (result.get("data") or {}).get("list") or []
+            if status not in self._seeded:
+                for market in items:
+                    self._remember(market.get("content_hash"))
+                self._seeded.add(status)
+                return []
+            unseen = [market for market in items if market.get("content_hash") not in self._seen]
+            fresh.extend(unseen)
+            if not unseen or len(items) < self.page_size:
+                return fresh
+            page += 1
+
+    async def _recipients(self, content_hash: str) -> List[Dict]:
+        recipients = []
+        page = 1
+        while True:
+            result = await backend_client.get_market_recipients(content_hash, page=page, page_size=RECIPIENT_PAGE_SIZE)
+            data = result.get("data") or {}
+            items = data.get("list") or []
+            recipients.extend(items)
+            if len(items) < RECIPIENT_PAGE_SIZE or page * RECIPIENT_PAGE_SIZE >= data.get("total", 0):
+                return recipients
+            page += 1
+
+    async def poll(self) -> int:
+        markets = dict(self._retry)
+        for status in WATCHED_STATUSES:
+            for market in await self._new_markets(status):
+                markets.setdefault(market.get("content_hash"), market)
+        self._retry.clear()
+
+        notices: Dict[int, List[Notice]] = {}
+        for content_hash, market in markets.items():
+            try:
+                recipients = await self._recipients(content_hash)
+            except Exception as e:
+                self.failures += 1
+                self._retry[content_hash] = market
+                logger.warning(f"Recipient lookup for {content_hash} failed: {e}")
+                continue
+            self._remember(content_hash)
+            self.markets += 1
+            for recipient in recipients:
+                notices.setdefault(recipient.get("telegram_id"), []).append((market, recipient))
+
+        for telegram_id, items in notices.items():
+            message, reply_markup = render_notice(items)
+            sender.submit(
+                telegram_id,
+                lambda telegram_id=telegram_id, message=message, reply_markup=reply_markup: self._bot.send_message(
+                    telegram_id, message, parse_mode="Markdown", reply_markup=reply_markup
+                )
+            )
+        self.notified += len(notices)
+        self.polls += 1
+        return len(notices)
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.poll()
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"Resolution watcher poll failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self, bot: Bot):
+        self._bot = bot
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict:
+        return {
+            "seen": len(self._seen),
+            "retry": len(self._retry),
+            "polls": self.polls,
+            "markets": self.markets,
+            "notified": self.notified,
+            "failures": self.failures
+        }
+
+resolution_watcher = ResolutionWatcher(interval=settings.RESOLUTION_WATCH_INTERVAL)
+market_catalog.subscribe(resolution_watcher.on_market)
@@ -0,0 +1,72 @@
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+Entry = Tuple[Hashable, float, Any]
+
+class TimingWheel:
+    def __init__(self, tick: float):
+        self.tick = tick
+        self._slots: Dict[int, Dict[Hashable, Tuple[float, Any]]] = {}
+        self._index: Dict[Hashable, int] = {}
+        self._cursor: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._index
+
+    def _slot(self, at: float) -> int:
+        return int(at // self.tick)
+
+    def add(self, key: Hashable, at: float, item: Any = None):
+        self.cancel(key)
+        slot = self._slot(at)
+        if self._cursor is not None and slot < self._cursor:
+            slot = self._cursor
+        self._slots.setdefault(slot, {})[key] = (at, item)
+        self._index[key] = slot
+
+    def cancel(self, key: Hashable) -> bool:
+        slot = self._index.pop(key, None)
+        if slot is None:
+            return False
+        bucket = self._slots[slot]
+        del bucket[key]
+        if not bucket:
+            del self._slots[slot]
+        return True
+
+    def get(self, key: Hashable) -> Optional[Entry]:
+        slot = self._index.get(key)
+        if slot is None:
+            return None
+        at, item = self._slots[slot][key]
+        return key, at, item
+
+    def entries(self) -> Iterable[Entry]:
+        for bucket in self._slots.values():
+            for key, (at, item) in bucket.items():
+                yield key, at, item
+
+    def advance(self, now: float) -> List[Entry]:
+        target = self._slot(now)
+        if self._cursor is None:
+            self._cursor = min(min(self._slots, default=target), target)
+        if target < self._cursor:
+            return []
+
+        if target - self._cursor > len(self._slots):
+            slots: Iterable[int] = sorted(slot for slot in self._slots if slot <= target)
+        else:
+            slots = range(self._cursor, target + 1)
+
+        fired = []
+        for slot in slots:
+            bucket = self._slots.pop(slot, None)
+            if not bucket:
+                continue
+            for key, (at, item) in bucket.items():
+                del self._index[key]
+                fired.append((key, at, item))
+        self._cursor = target + 1
+        return fired
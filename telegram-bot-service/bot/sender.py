@@ -0,0 +1,165 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from telegram.error import RetryAfter
+from bot.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_TRACKED_CHATS = 10000
+
+SendFactory = Callable[[], Awaitable[Any]]
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def pause(self, seconds: float):
+        self._refill(time.monotonic())
+        self._tokens = min(self._tokens, -seconds * self.rate)
+
+    async def acquire(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+class _Job:
+    __slots__ = ("chat_id", "send")
+
+    def __init__(self, chat_id: int, send: SendFactory):
+        self.chat_id = chat_id
+        self.send = send
+
+class RateLimitedSender:
+    def __init__(self, rate: float, chat_interval: float, group_interval: float, workers: int):
+        self.rate = rate
+        self.chat_interval = chat_interval
+        self.group_interval = group_interval
+        self.workers = workers
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._jobs: Dict[Hashable, _Job] = {}
+        self._chat_next: Dict[int, float] = {}
+        self.bucket = TokenBucket(rate, burst=1.0)
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.coalesced = 0
+
+    def _interval(self, chat_id: int) -> float:
+        return self.group_interval if chat_id < 0 else self.chat_interval
+
+    def _schedule(self, key: Hashable, job: _Job, not_before: float = 0.0):
+        now = time.monotonic()
+        if len(self._chat_next) > MAX_TRACKED_CHATS:
+            self._chat_next = {chat: at for chat, at in self._chat_next.items() if at > now}
+        ready = max(now, not_before, self._chat_next.get(job.chat_id, 0.0))
+        self._chat_next[job.chat_id] = ready + self._interval(job.chat_id)
+        self._jobs[key] = job
+        heapq.heappush(self._heap, (ready, next(self._seq), key))
+        self._wakeup.set()
+
+    def submit(self, chat_id: int, send: SendFactory, key: Optional[Hashable] = None):
+        if key is not None and key in self._jobs:
+            self._jobs[key].send = send
+            self.coalesced += 1
+            return
+        self._schedule(key if key is not None else ("job", next(self._seq)), _Job(chat_id, send))
+
+    def pending(self) -> int:
+        return len(self._jobs) + len(self._inflight)
+
+    async def _send(self, key: Hashable, job: _Job):
+        try:
+            await job.send()
+            self.sent += 1
+        except RetryAfter as e:
+            self.retried += 1
+            if key not in self._jobs:
+                self._schedule(key, job, time.monotonic() + float(e.retry_after))
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Send to chat {job.chat_id} failed: {e}")
+        finally:
+            self._slots.release()
+
+    async def _run(self):
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            ready, _, key = self._heap[0]
+            now = time.monotonic()
+            if ready > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=ready - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            job = self._jobs.pop(key, None)
+            if job is None:
+                continue
+
+            await self.bucket.acquire()
+            await self._slots.acquire()
+            task = asyncio.create_task(self._send(key, job))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def start(self):
+        if self._task is None:
+            self._slots = asyncio.Semaphore(self.workers)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    def snapshot(self) -> Dict:
+        return {
+            "pending": self.pending(),
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "coalesced": self.coalesced
+        }
+
+sender = RateLimitedSender(
+    rate=settings.SEND_RATE_PER_SECOND,
+    chat_interval=settings.SEND_CHAT_INTERVAL,
+    group_interval=settings.SEND_GROUP_INTERVAL,
+    workers=settings.SEND_WORKERS
+)
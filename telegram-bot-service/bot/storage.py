@@ -0,0 +1,38 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+def load_json(path: str) -> Optional[Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to load {path}: {e}")
+        return None
+
+def write_json(path: str, payload: Any):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+async def save_json(path: str, payload: Any) -> bool:
+    try:
+        await asyncio.to_thread(write_json, path, payload)
+        return True
+    except OSError as e:
+        logger.warning(f"Failed to save {path}: {e}")
+        return False
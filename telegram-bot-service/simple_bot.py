@@ -1,14 +1,33 @@
 import asyncio
 import os
 import httpx
+import math
+import re
 import sys
+import time
 import traceback
 import json
+import unicodedata
+from datetime import datetime
 from dotenv import load_dotenv
+from bot.market_feed import MarketFeed
 
 load_dotenv()
 
 AI_SERVICE_URL = os.environ.get("AI_SERVICE_URL", "http://localhost:8003")
+AI_DEADLINE_HEADER = "X-Request-Timeout"
+AI_INTENT_TIMEOUT = 10.0
+AI_CHAT_TIMEOUT = 30.0
+
+MARKET_REFRESH_INTERVAL = 30.0
+MARKET_PAGE_SIZE = 200
+MARKET_CONTEXT_TOP_K = 3
+MARKET_CONTEXT_TOKENS = 300
+MARKET_MIN_RELEVANCE = 0.3
+
+_TERM_RE = re.compile(
+    "([\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\U00020000-\U0002fa1f]+)|([a-z0-9]+)"
+)
 
 INTENT_KEYWORDS = {
     "login": ["登录", "绑定钱包", "连接钱包", "我要登录", "login", "绑定"],
@@ -59,7 +78,8 @@ async def recognize_intent_with_ai(client, message: str) -> dict:
         resp = await client.post(
             f"{AI_SERVICE_URL}/api/v1/ai/intent",
             json={"message": message},
-            timeout=10.0
+            headers={AI_DEADLINE_HEADER: f"{AI_INTENT_TIMEOUT:g}"},
+            timeout=AI_INTENT_TIMEOUT
         )
         result = resp.json()
         if result.get("success"):
@@ -69,7 +89,133 @@ async def recognize_intent_with_ai(client, message: str) -> dict:
     
     return {"has_intent": False, "command": None, "args": [], "confidence": 0.0}
 
-async def chat_with_ai(client, message: str, username: str = "") -> str:
+def market_terms(text: str) -> set:
+    terms = set()
+    for wide, word in _TERM_RE.findall(unicodedata.normalize("NFKC", text).lower()):
+        if word:
+            terms.add(word)
+        else:
+            terms.update(wide)
+            terms.update(wide[i:i + 2] for i in range(len(wide) - 1))
+    return terms
+
+def estimate_tokens(text: str) -> int:
+    wide = sum(1 for char in text if ord(char) > 0x2e80)
+    return wide + math.ceil((len(text) - wide) / 4)
+
+class MarketRetriever:
+    def __init__(self):
+        self.markets = {}
+        self.terms = {}
+        self.postings = {}
+        self.feed = MarketFeed(MARKET_PAGE_SIZE)
+    
+    def upsert(self, market: dict):
+        content_hash = market.get("content_hash")
+        if not content_hash:
+            return
+        self.remove(content_hash)
+        if market.get("status") != 0:
+            return
+        
+        terms = market_terms(f"{market.get('title') or ''} {market.get('category') or ''}")
+        self.markets[content_hash] = market
+        self.terms[content_hash] = terms
+        for term in terms:
+            self.postings.setdefault(term, set()).add(content_hash)
+    
+    def remove(self, content_hash: str):
+        self.markets.pop(content_hash, None)
+        for term in self.terms.pop(content_hash, ()):
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.discard(content_hash)
+                if not postings:
+                    del self.postings[term]
+    
+    def retrieve(self, question: str, k: int = MARKET_CONTEXT_TOP_K) -> list:
+        count = len(self.markets)
+        if not count:
+            return []
+        
+        scores = {}
+        anchored = set()
+        query_weight = 0.0
+        for term in market_terms(question):
+            postings = self.postings.get(term)
+            idf = math.log(1 + count / len(postings)) if postings else math.log(1 + count)
+            query_weight += idf
+            if not postings:
+                continue
+            for content_hash in postings:
+                scores[content_hash] = scores.get(content_hash, 0.0) + idf
+            if len(term) > 1:
+                anchored.update(postings)
+        
+        ranked = sorted(
+            (
+                (scores[content_hash] / query_weight, content_hash)
+                for content_hash in anchored
+            ),
+            reverse=True
+        )
+        return [
+            self.markets[content_hash] for relevance, content_hash in ranked[:k]
+            if relevance >= MARKET_MIN_RELEVANCE
+        ]
+    
+    async def refresh(self, client, backend_url: str) -> int:
+        return await self.feed.poll(client, backend_url, self.upsert)
+
+market_retriever = MarketRetriever()
+
+async def refresh_markets_loop(client, backend_url: str):
+    while True:
+        try:
+            changed = await market_retriever.refresh(client, backend_url)
+            if changed:
+                print(f"Market index refreshed: {changed} changed, {len(market_retriever.markets)} active", flush=True)
+        except Exception as e:
+            print(f"Market index refresh failed: {e}", flush=True)
+        await asyncio.sleep(MARKET_REFRESH_INTERVAL)
+
+def pool_split(market: dict):
+    yes_pool = float(market.get("total_yes_pool") or 0) / 1e18
+    no_pool = float(market.get("total_no_pool") or 0) / 1e18
+    total = yes_pool + no_pool
+    yes_pct = (yes_pool / total * 100) if total > 0 else 50
+    return yes_pool, no_pool, yes_pct
+
+def build_market_context(markets: list, budget: int = MARKET_CONTEXT_TOKENS) -> str:
+    header = "MindBet 上的相关市场（当前资金分布）："
+    lines = [header]
+    used = estimate_tokens(header)
+    for m in markets:
+        yes_pool, no_pool, yes_pct = pool_split(m)
+        deadline = datetime.fromtimestamp(m.get("deadline") or 0).strftime("%m-%d")
+        line = (
+            f"- {m.get('title', '')[:60]} | YES {yes_pct:.0f}% / NO {100 - yes_pct:.0f}% | "
+            f"奖池 {yes_pool + no_pool:.2f} MON | 截止 {deadline}"
+        )
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(lines) if len(lines) > 1 else ""
+
+def market_keyboard(markets: list) -> dict:
+    return {
+        "inline_keyboard": [
+            [{
+                "text": f"📊 {m.get('title', '')[:25]} (YES {pool_split(m)[2]:.0f}%)",
+                "callback_data": f"market_{m.get('id')}"
+            }]
+            for m in markets if m.get("id")
+        ]
+    }
+
+async def chat_with_ai(client, message: str, username: str = "", markets: list = None) -> str:
     try:
         system_prompt = """你是 MindBet 预测市场的 AI 助手，一个敢于预测的分析师。
 
@@ -99,6 +245,13 @@ async def chat_with_ai(client, message: str, username: str = "") -> str:
 
 注意：你的预测只是参考，不构成投资建议。"""
 
+        market_context = build_market_context(markets or [])
+        if market_context:
+            system_prompt += f"""
+
+{market_context}
+如果这些市场与用户的问题相关，请结合其 YES/NO 资金分布给出判断，并引导用户在对应市场参与预测。"""
+
         resp = await client.post(
             f"{AI_SERVICE_URL}/api/v1/ai/chat",
             json={
@@ -109,7 +262,8 @@ async def chat_with_ai(client, message: str, username: str = "") -> str:
                 "temperature": 0.7,
                 "max_tokens": 300
             },
-            timeout=30.0
+            headers={AI_DEADLINE_HEADER: f"{AI_CHAT_TIMEOUT:g}"},
+            timeout=AI_CHAT_TIMEOUT
         )
         result = resp.json()
         if result.get("success"):
@@ -149,6 +303,7 @@ async def poll_bot():
             print(f"Bot username: @{bot_username}", flush=True)
             
             offset = 0
+            refresh_task = asyncio.create_task(refresh_markets_loop(backend_client, backend_url))
             
             while True:
                 try:
@@ -161,6 +316,12 @@ async def poll_bot():
                         if updates:
                             for update in updates:
                                 offset = update["update_id"] + 1
+                                
+                                callback = update.get("callback_query")
+                                if callback:
+                                    await handle_callback(callback, telegram_client, backend_client, backend_url, mini_app_url, token)
+                                    continue
+                                
                                 message = update.get("message", {})
                                 text = message.get("text", "")
                                 chat = message.get("chat", {})
@@ -180,8 +341,11 @@ async def poll_bot():
                                 try:
                                     reply = await handle_command(processed_text, user_id, chat_id, username, backend_client, backend_url, mini_app_url, token)
                                     
+                                    reply_markup = None
+                                    if isinstance(reply, tuple):
+                                        reply, reply_markup = reply
                                     if reply:
-                                        await send_message(telegram_client, token, chat_id, reply)
+                                        await send_message(telegram_client, token, chat_id, reply, reply_markup)
                                 except Exception as e:
                                     print(f"Handle error: {e}", flush=True)
                                     traceback.print_exc()
@@ -192,6 +356,27 @@ async def poll_bot():
                     traceback.print_exc()
                     await asyncio.sleep(5)
 
+async def handle_callback(callback, telegram_client, backend_client, backend_url, mini_app_url, token):
+    data = callback.get("data", "")
+    message = callback.get("message") or {}
+    chat_id = message.get("chat", {}).get("id")
+    user = callback.get("from", {})
+    
+    try:
+        await telegram_client.post(
+            f"https://api.telegram.org/bot{token}/answerCallbackQuery",
+            json={"callback_query_id": callback.get("id")}
+        )
+        if data.startswith("market_") and chat_id:
+            reply = await handle_slash_command(
+                "/market", [data.split("_", 1)[1]], user.get("id"), chat_id,
+                user.get("username", ""), backend_client, backend_url, mini_app_url, token
+            )
+            await send_message(telegram_client, token, chat_id, reply)
+    except Exception as e:
+        print(f"Callback error: {e}", flush=True)
+        traceback.print_exc()
+
 def process_message(text: str, chat_type: str, bot_username: str) -> str:
     if not text:
         return None
@@ -250,9 +435,14 @@ async def handle_natural_language(text, user_id, chat_id, username, client, back
         return await handle_slash_command(f"/{command}", args, user_id, chat_id, username, client, backend_url, mini_app_url, token)
     else:
         print(f"No intent found, calling AI chat...", flush=True)
-        ai_reply = await chat_with_ai(client, text, username)
+        started = time.perf_counter()
+        related_markets = market_retriever.retrieve(text)
+        print(f"Retrieved {len(related_markets)} markets in {(time.perf_counter() - started) * 1000:.2f}ms", flush=True)
+        ai_reply = await chat_with_ai(client, text, username, related_markets)
         
         if ai_reply:
+            if related_markets:
+                return ai_reply, market_keyboard(related_markets)
             return ai_reply
         else:
             return f"""你好 {username}！我是 MindBet 预测市场助手。
@@ -672,21 +862,17 @@ MindBet 是基于 Monad 链的去中心化预测市场平台，使用 MON 代币
     else:
         return f"未知命令: {cmd}\n\n使用 /help 查看可用命令。"
 
-async def send_message(client, token, chat_id, text):
+async def send_message(client, token, chat_id, text, reply_markup=None):
     url = f"https://api.telegram.org/bot{token}/sendMessage"
+    payload = {"chat_id": chat_id, "text": text}
+    if reply_markup:
+        payload["reply_markup"] = reply_markup
     try:
-        response = await client.post(url, json={
-            "chat_id": chat_id,
-            "text": text,
-            "parse_mode": "Markdown"
-        })
+        response = await client.post(url, json={**payload, "parse_mode": "Markdown"})
         result = response.json()
         if not result.get("ok"):
             print(f"Markdown failed: {result}, trying plain text...", flush=True)
-            response = await client.post(url, json={
-                "chat_id": chat_id,
-                "text": text
-            })
+            response = await client.post(url, json=payload)
             result = response.json()
         print(f"Sent reply: {result.get('ok')}", flush=True)
     except Exception as e:
@@ -0,0 +1,63 @@
+import asyncio
+from bot import broadcast
+from bot.broadcast import STATUS_CANCELLED, STATUS_DONE, STATUS_RUNNING, BroadcastEngine
+from bot.sender import TokenBucket
+from bot.storage import load_json
+
+USERS = [{"id": index, "telegram_id": 1000 + index} for index in range(1, 41)]
+
+class FakeBot:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        await asyncio.sleep(0.01)
+        self.sent.append((chat_id, text))
+        return type("Sent", (), {"message_id": 1})()
+
+    async def edit_message_text(self, *args, **kwargs):
+        pass
+
+class FakeBackend:
+    async def list_telegram_users(self, after_id=0, limit=100):
+        page = [user for user in USERS if user["id"] > after_id][:limit]
+        return {"data": {"list": page, "total": len(USERS)}}
+
+def make_engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(broadcast, "backend_client", FakeBackend())
+    return BroadcastEngine(str(tmp_path / "broadcast.json"), 10, 2, 60.0, TokenBucket(1000.0, 1000.0))
+
+def test_cancel_then_begin_runs_new_job(tmp_path, monkeypatch):
+    engine = make_engine(tmp_path, monkeypatch)
+    bot = FakeBot()
+
+    async def scenario():
+        await engine.start(bot)
+        first = await engine.begin("first", 1)
+        await asyncio.sleep(0.05)
+        assert await engine.cancel()
+        second = await engine.begin("second", 1)
+        assert second is not None and second["id"] != first["id"]
+        assert engine.running and engine._task is not None
+        await asyncio.wait_for(engine._task, timeout=5)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first["status"] == STATUS_CANCELLED
+    assert second["status"] == STATUS_DONE
+    assert second["processed"] == len(USERS)
+    assert sum(text == "second" for _, text in bot.sent) == len(USERS)
+    assert load_json(str(tmp_path / "broadcast.json"))["job"]["id"] == second["id"]
+
+def test_begin_refused_while_running(tmp_path, monkeypatch):
+    engine = make_engine(tmp_path, monkeypatch)
+
+    async def scenario():
+        await engine.start(FakeBot())
+        await engine.begin("first", 1)
+        refused = await engine.begin("second", 1)
+        assert engine.job["status"] == STATUS_RUNNING
+        await engine.stop()
+        return refused
+
+    assert asyncio.run(scenario()) is None
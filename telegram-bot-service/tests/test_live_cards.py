@@ -0,0 +1,32 @@
+import time
+from datetime import datetime
+from telegram import Chat, Message
+from bot.live_cards import LiveCardRegistry
+from bot.sender import sender
+
+def sent_message(text):
+    return Message(message_id=7, date=datetime.now(), chat=Chat(id=42, type="private"), text=text)
+
+def refresh(registry, content_hash):
+    registry.on_market({"content_hash": content_hash, "total_yes_pool": 2}, {"content_hash": content_hash, "total_yes_pool": 1})
+    registry._flush(time.monotonic() + 1)
+
+def test_unchanged_render_does_not_edit():
+    registry = LiveCardRegistry(debounce=0.0, ttl=60.0, max_cards=10)
+    rendered = "**市场** YES `50%`"
+    registry.track(sent_message("市场 YES 50%"), rendered, ["0xa"], lambda: (rendered, None))
+
+    refresh(registry, "0xa")
+
+    assert ("card", (42, 7)) not in sender._jobs
+    assert len(registry) == 1
+
+def test_changed_render_edits():
+    registry = LiveCardRegistry(debounce=0.0, ttl=60.0, max_cards=10)
+    registry.track(sent_message("市场 YES 50%"), "**市场** YES `50%`", ["0xb"], lambda: ("**市场** YES `60%`", None))
+
+    refresh(registry, "0xb")
+
+    assert ("card", (42, 7)) in sender._jobs
+    sender._jobs.clear()
+    sender._heap.clear()
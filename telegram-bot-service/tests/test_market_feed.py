@@ -0,0 +1,58 @@
+import asyncio
+from bot.market_feed import MarketFeed
+
+class FakeResponse:
+    def __init__(self, items):
+        self.items = items
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"data": {"list": self.items}}
+
+class FakeMarketsAPI:
+    def __init__(self, count):
+        self.markets = [
+            {"id": index, "content_hash": f"0x{index}", "updated_at": f"2026-01-01T00:00:{index:02d}Z"}
+            for index in range(1, count + 1)
+        ]
+        self.requests = 0
+        self.on_request = None
+
+    def touch(self, market_id, updated_at):
+        for market in self.markets:
+            if market["id"] == market_id:
+                market["updated_at"] = updated_at
+
+    async def get(self, url, params):
+        self.requests += 1
+        if self.on_request:
+            self.on_request(self.requests)
+        cursor = (params["updated_after"], params["after_id"])
+        ordered = sorted(self.markets, key=lambda market: (market["updated_at"], market["id"]))
+        page = [market for market in ordered if (market["updated_at"], market["id"]) > cursor]
+        return FakeResponse([dict(market) for market in page[:params["page_size"]]])
+
+def test_market_moved_mid_scan_is_not_skipped():
+    api = FakeMarketsAPI(6)
+    api.on_request = lambda count: count == 2 and api.touch(1, "2026-01-01T00:01:00Z")
+    feed = MarketFeed(page_size=2)
+    seen = {}
+
+    changed = asyncio.run(feed.poll(api, "http://backend", lambda market: seen.update({market["id"]: market})))
+
+    assert set(seen) == {1, 2, 3, 4, 5, 6}
+    assert seen[1]["updated_at"] == "2026-01-01T00:01:00Z"
+    assert changed == 7
+
+def test_poll_resumes_from_cursor():
+    api = FakeMarketsAPI(3)
+    feed = MarketFeed(page_size=2)
+    asyncio.run(feed.poll(api, "http://backend", lambda market: None))
+    assert feed.cursor == ("2026-01-01T00:00:03Z", 3)
+
+    api.touch(2, "2026-01-01T00:02:00Z")
+    seen = []
+    assert asyncio.run(feed.poll(api, "http://backend", lambda market: seen.append(market["id"]))) == 1
+    assert seen == [2]
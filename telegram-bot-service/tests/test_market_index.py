@@ -0,0 +1,58 @@
+from bot.market_index import InlineMarketIndex
+
+def market(content_hash, title, yes_pool=0, status=0):
+    return {
+        "content_hash": content_hash,
+        "title": title,
+        "category": "crypto",
+        "status": status,
+        "total_yes_pool": yes_pool,
+        "total_no_pool": 0,
+        "deadline": 0
+    }
+
+def hashes(index, query):
+    page, _ = index.search(query, limit=50)
+    return [m["content_hash"] for m in page]
+
+def build():
+    index = InlineMarketIndex()
+    index.on_market(market("0xa", "比特币 突破 10万", 10))
+    index.on_market(market("0xb", "以太坊 ETF 通过", 20))
+    index.on_market(market("0xc", "比特币 ETF 净流入", 30))
+    return index
+
+def test_pool_update_only_drops_queries_containing_market():
+    index = build()
+    assert hashes(index, "比特币") == ["0xc", "0xa"]
+    assert hashes(index, "以太坊") == ["0xb"]
+
+    previous = index._entries["0xa"].market
+    index.on_market(market("0xa", "比特币 突破 10万", 50), previous)
+
+    assert "比特币" not in index._cache
+    assert "以太坊" in index._cache
+    assert hashes(index, "比特币") == ["0xa", "0xc"]
+
+def test_new_market_reaches_cached_queries_it_matches():
+    index = build()
+    assert hashes(index, "etf") == ["0xc", "0xb"]
+    assert hashes(index, "以太坊") == ["0xb"]
+
+    index.on_market(market("0xd", "以太坊 ETF 质押", 5))
+
+    assert hashes(index, "etf") == ["0xc", "0xb", "0xd"]
+    assert hashes(index, "以太坊") == ["0xb", "0xd"]
+    assert "比特币" not in index._cache or "0xd" not in index._cache["比特币"]
+
+def test_closed_market_leaves_cached_results():
+    index = build()
+    assert hashes(index, "etf") == ["0xc", "0xb"]
+    assert hashes(index, "以太坊") == ["0xb"]
+
+    previous = index._entries["0xc"].market
+    index.on_market(market("0xc", "比特币 ETF 净流入", 30, status=1), previous)
+
+    assert hashes(index, "etf") == ["0xb"]
+    assert "以太坊" in index._cache
+    assert "0xc" not in index._cached_keys
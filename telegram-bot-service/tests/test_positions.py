@@ -0,0 +1,21 @@
+from bot.positions import MARKET_RESOLVED, RESULT_NO, render_position
+
+MON = 10 ** 18
+
+def test_both_sides_are_summed_separately():
+    position = {"yes_amount": 3 * MON, "yes_count": 2, "no_amount": 1 * MON, "no_count": 1, "bet_type": False}
+    market = {"status": 0, "total_yes_pool": 10 * MON, "total_no_pool": 10 * MON}
+
+    text = render_position(position, market)
+
+    assert "YES 3.0000 MON (2 笔) / NO 1.0000 MON (1 笔)" in text
+    assert "若 YES 获胜" in text and "若 NO 获胜" in text
+
+def test_resolved_pays_only_the_winning_side():
+    position = {"yes_amount": 3 * MON, "yes_count": 2, "no_amount": 1 * MON, "no_count": 1}
+    market = {"status": MARKET_RESOLVED, "result": RESULT_NO, "total_yes_pool": 10 * MON, "total_no_pool": 10 * MON}
+
+    assert "🏆 已获胜，奖金 1.9000 MON" in render_position(position, market)
+
+def test_no_position_renders_nothing():
+    assert render_position({"total_amount": 0, "bet_count": 0}, {"status": 0}) == ""